@@ -0,0 +1,281 @@
+"""
+Scanner-result caching and parameter sweeps shared by the daily backtesters.
+
+A backtester mixes in ScanCacheMixin for its per-day scanner results and
+ParameterSweepMixin for run_parameter_grid(). Each mixin documents the
+attributes and hooks it expects the backtester to provide.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields
+from datetime import datetime
+from itertools import product
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+
+import numpy as np
+
+from scanner.long.daily_breakout_scanner import DailyBreakoutCandidate
+from backtest._calendar import epoch
+
+
+class ScanCacheMixin:
+    """
+    Scanner results per day, kept in memory and saved as one JSON file per day.
+
+    Expects self.scanner, self.scan_cache_dir (a Path) and self._scan_cache
+    (date ordinal -> candidates). Files are grouped by scanner version, so
+    saved scans are only reused by the settings that produced them.
+    """
+
+    def _scanner_version(self) -> str:
+        """Short hash of the scanner's screening settings and universe."""
+        settings = {
+            name: value for name, value in vars(self.scanner).items()
+            if isinstance(value, (bool, int, float, str, list))
+        }
+        return hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:12]
+
+    def _scan(self, date: datetime) -> List[DailyBreakoutCandidate]:
+        """Scanner results for a day, scanning only on a cache miss."""
+        key = date.toordinal()
+        if key not in self._scan_cache:
+            candidates = self.scanner.scan(date)
+            self._scan_cache[key] = candidates
+
+            # Only persist settled days - a scan of today may still change
+            if date.date() < datetime.now().date():
+                self._write_scan_file(date, candidates)
+
+        return self._scan_cache[key]
+
+    def _scan_file(self, date: datetime) -> Path:
+        """JSON file holding a day's scanner results."""
+        return self._scan_dir / f"{date.strftime('%Y-%m-%d')}.json"
+
+    def _load_scan_cache(self, dates: List[datetime]):
+        """Preload saved scanner results for the given days (call before _scan)."""
+        self._scan_dir = self.scan_cache_dir / self._scanner_version()
+
+        for date in dates:
+            scan_file = self._scan_file(date)
+            if date.toordinal() in self._scan_cache or not scan_file.exists():
+                continue
+
+            try:
+                with open(scan_file, 'r') as f:
+                    records = json.load(f)
+                self._scan_cache[date.toordinal()] = [
+                    DailyBreakoutCandidate(**{**record, 'date': datetime.fromisoformat(record['date'])})
+                    for record in records
+                ]
+            except Exception:
+                # Cache corrupted, delete and re-scan (another sweep worker may have already)
+                scan_file.unlink(missing_ok=True)
+
+    def _write_scan_file(self, date: datetime, candidates: List[DailyBreakoutCandidate]):
+        """Save a day's scanner results."""
+        try:
+            self._scan_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._scan_file(date), 'w') as f:
+                json.dump([asdict(c) for c in candidates], f, default=datetime.isoformat)
+        except Exception:
+            # Failed to cache, but we still have the candidates
+            pass
+
+
+# Market data kept by each sweep worker process between backtests:
+# (backtester class name, start, end, *SHARED_CACHE_KEY values) -> {attribute name: cache}
+_worker_caches: Dict[tuple, Dict[str, Any]] = {}
+
+# Bars the sweep's parent process put in shared memory, attached once per worker:
+# (block, float64 table with one row per bar field, symbol -> (start, stop) columns)
+_shared_bars: Optional[Tuple[shared_memory.SharedMemory, np.ndarray, Dict[str, Tuple[int, int]]]] = None
+
+
+def _attach_shared_bars(name: str, shape: Tuple[int, int], columns: Dict[str, Tuple[int, int]]):
+    """Worker initializer: map the parent's bar table into this process without copying it."""
+    global _shared_bars
+    block = shared_memory.SharedMemory(name=name)
+    _shared_bars = (block, np.ndarray(shape, dtype=np.float64, buffer=block.buf), columns)
+
+
+def _run_one(args) -> Dict[str, Any]:
+    """
+    Run one backtest of a parameter sweep (in a worker process).
+
+    Backtests after the first one in a worker reuse its market data, so the
+    loading cost is paid once per process rather than once per backtest.
+
+    Returns the results as a plain dict so only simple data is pickled
+    back to the parent.
+    """
+    cls, api_key, secret_key, starting_capital, params, start_date, end_date, run_options = args
+
+    backtester = cls(api_key, secret_key, starting_capital=starting_capital)
+    for name, value in params.items():
+        setattr(backtester, name, value)
+
+    key = (cls.__name__, start_date, end_date) + tuple(getattr(backtester, name) for name in cls.SHARED_CACHE_KEY)
+    shared = _worker_caches.get(key)
+    if shared is None:
+        # First backtest of these settings in this worker: take the bars from shared
+        # memory, from where its own fetch would start (indicators may depend on
+        # how much history they see)
+        if _shared_bars is not None:
+            _, table, columns = _shared_bars
+            first = epoch(backtester._history_start(start_date))
+            for symbol, (start, stop) in columns.items():
+                start += int(np.searchsorted(table[0, start:stop], first))
+                backtester._store_bars(symbol, *table[:, start:stop])
+        _worker_caches[key] = {name: getattr(backtester, name) for name in cls.SHARED_CACHES}
+    else:
+        for name, cache in shared.items():
+            setattr(backtester, name, cache)
+
+    results = backtester.run(start_date, end_date, **run_options)
+    if hasattr(results, '_asdict'):
+        return results._asdict()
+    return {f.name: getattr(results, f.name) for f in fields(results)}
+
+
+class ParameterSweepMixin:
+    """
+    Run one backtest per combination of settings in a process pool.
+
+    The backtester class lists the settings a sweep may vary in
+    TUNABLE_PARAMETERS, the attributes holding market data that a worker's
+    backtests share in SHARED_CACHES, and the settings that market data
+    depends on in SHARED_CACHE_KEY. It also provides:
+
+        _history_start(start_date): earliest bar time its fetch asks for
+        _check_settings(): raise ValueError for an invalid combination (optional)
+        _store_bars(symbol, *rows): keep one symbol's bars (rows of _bar_rows)
+        _bar_rows(): symbol -> equal-length float64 rows, bar times first
+        _prefetch_bars(symbols), _get_trading_days(start, end), run(start, end)
+
+    plus the scan cache of ScanCacheMixin.
+    """
+
+    TUNABLE_PARAMETERS: Tuple[str, ...] = ()
+    SHARED_CACHES: Tuple[str, ...] = ()
+    SHARED_CACHE_KEY: Tuple[str, ...] = ()
+
+    @classmethod
+    def run_parameter_grid(
+        cls,
+        api_key: str,
+        secret_key: str,
+        param_grid: Dict[str, List[Any]],
+        start_date: datetime,
+        end_date: datetime,
+        starting_capital: float = 100000,
+        max_workers: Optional[int] = None,
+        **run_options
+    ) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Backtest every combination of parameters, one process per backtest.
+
+        Each combination is an independent backtest, so they run side by side
+        in a process pool. Bars for every symbol the sweep may trade are loaded
+        once here and handed to the workers through shared memory.
+
+        Args:
+            api_key: Alpaca API key
+            secret_key: Alpaca secret key
+            param_grid: Values to try per setting, e.g.
+                        {'stop_loss_percent': [0.06, 0.08], 'max_positions': [2, 3]}
+            start_date: Start of backtest
+            end_date: End of backtest
+            starting_capital: Starting capital for every run
+            max_workers: Worker processes (default: one per CPU)
+            **run_options: Passed on to every run() call, e.g.
+                           include_trade_list=False where run() takes it
+
+        Returns:
+            List of (params, results) pairs in grid order, where results is
+            the run() results as a dict
+
+        Raises:
+            ValueError: If param_grid names a setting not in TUNABLE_PARAMETERS,
+                        or a combination fails _check_settings()
+        """
+        unknown = set(param_grid) - set(cls.TUNABLE_PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+
+        names = list(param_grid)
+        combos = [dict(zip(names, values)) for values in product(*param_grid.values())]
+
+        jobs = [
+            (cls, api_key, secret_key, starting_capital, params, start_date, end_date, run_options)
+            for params in combos
+        ]
+
+        # Reject invalid combinations before any worker starts
+        sharer = cls(api_key, secret_key, starting_capital=starting_capital)
+        for params in combos:
+            for name, value in params.items():
+                setattr(sharer, name, value)
+            sharer._check_settings()
+
+        # Share bars from the earliest point any combination's own fetch would start
+        def history_start(params):
+            for name, value in params.items():
+                setattr(sharer, name, value)
+            return sharer._history_start(start_date)
+
+        for name, value in min(combos, key=history_start).items():
+            setattr(sharer, name, value)
+
+        block, shape, columns = sharer._share_bars(start_date, end_date)
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach_shared_bars,
+                                     initargs=(block.name, shape, columns)) as executor:
+                results = list(executor.map(_run_one, jobs))
+        finally:
+            block.close()
+            block.unlink()
+
+        return list(zip(combos, results))
+
+    def _check_settings(self):
+        """Raise ValueError if the current settings can't be backtested (none by default)."""
+
+    def _sweep_symbols(self, trading_days: List[datetime]) -> List[str]:
+        """Symbols a sweep over these days may need bars for: everything scanned."""
+        return sorted({c.symbol for day in trading_days for c in self._scan(day)})
+
+    def _share_bars(self, start_date: datetime, end_date: datetime):
+        """
+        Load bars for every symbol the sweep may trade into one shared memory table.
+
+        Returns:
+            (block, shape, columns) - the shared memory block, the shape of its
+            float64 table (one row per _bar_rows() field) and each symbol's
+            (start, stop) columns. The caller closes and unlinks the block.
+        """
+        self._backtest_start = start_date
+        self._backtest_end = end_date
+
+        trading_days = self._get_trading_days(start_date, end_date)
+        self._load_scan_cache(trading_days)
+        self._prefetch_bars(self._sweep_symbols(trading_days))
+
+        bar_rows = self._bar_rows()
+        columns = {}
+        start = 0
+        for symbol, rows in bar_rows.items():
+            columns[symbol] = (start, start + len(rows[0]))
+            start += len(rows[0])
+
+        shape = (len(next(iter(bar_rows.values()), ())), start)
+        block = shared_memory.SharedMemory(create=True, size=max(1, shape[0] * start * 8))
+        table = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+        for symbol, (start, stop) in columns.items():
+            table[:, start:stop] = bar_rows[symbol]
+
+        return block, shape, columns
@@ -0,0 +1,65 @@
+"""
+NYSE trading calendar and timestamp helpers for the daily backtesters.
+
+Built on pandas' holiday rules so trading days come from one vectorized
+date-range call and skip full-day market holidays, not just weekends.
+One-off closures (e.g. national days of mourning) are not included.
+"""
+
+from datetime import datetime, timezone
+from typing import List
+
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar,
+    GoodFriday,
+    Holiday,
+    USLaborDay,
+    USMartinLutherKingJr,
+    USMemorialDay,
+    USPresidentsDay,
+    USThanksgivingDay,
+    nearest_workday,
+    sunday_to_monday,
+)
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """Full-day NYSE holidays."""
+    rules = [
+        # A Saturday New Year's Day is not observed on the Friday before
+        Holiday('New Year\'s Day', month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date='2022-06-19', observance=nearest_workday),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday),
+    ]
+
+
+_NYSE_TRADING_DAY = pd.offsets.CustomBusinessDay(calendar=NYSEHolidayCalendar())
+
+
+def trading_days(start: datetime, end: datetime) -> List[datetime]:
+    """
+    NYSE trading days from start to end (inclusive).
+
+    Days keep the time of day of `start`, like stepping from it a day at a time.
+    """
+    return list(pd.date_range(start, end, freq=_NYSE_TRADING_DAY).to_pydatetime())
+
+
+def calendar_span(days: int) -> int:
+    """Calendar days usually spanned by `days` trading days (5 in every 7, holidays aside)."""
+    return (days * 7 + 2) // 5
+
+
+def epoch(ts: datetime) -> float:
+    """Seconds since epoch; naive datetimes are treated as UTC (as Alpaca does)."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
@@ -0,0 +1,22 @@
+"""
+Small helpers that backport newer Python features for the backtesters.
+
+The backend still supports Python 3.9.
+"""
+
+from dataclasses import fields
+
+
+def with_slots(cls):
+    """
+    Rebuild a dataclass with __slots__ instead of a per-instance __dict__.
+
+    Same as @dataclass(slots=True), which needs Python 3.10.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {
+        key: value for key, value in cls.__dict__.items()
+        if key not in names and key not in ('__dict__', '__weakref__')
+    }
+    namespace['__slots__'] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
@@ -0,0 +1,230 @@
+"""
+Numeric kernels shared by the daily backtesters.
+
+Each kernel works on flat numpy arrays (one entry per open position, or per
+bar for the indicator helpers) so the per-day hot path stays out of Python
+object code.
+"""
+
+import numpy as np
+
+# Exit reason codes returned by scan_exits, scaled_exit_signals and smart_exit_signals
+EXIT_HOLD = 0
+EXIT_STOP = 1
+EXIT_TARGET = 2
+EXIT_TIME = 3
+EXIT_TRAIL = 4
+EXIT_MA_BREAK = 5
+EXIT_LOWER_CLOSE = 6
+
+
+def scan_exits(prices, stops, targets, entry_days, today, max_hold):
+    """
+    Exit reason for every open position.
+
+    Args:
+        prices: Today's close per position (NaN when there is no price)
+        stops: Stop loss per position
+        targets: Profit target per position
+        entry_days: Entry date per position as datetime64
+        today: Current date as datetime64
+        max_hold: Max calendar days to hold
+
+    Returns:
+        int8 array of EXIT_* codes. Stop beats target beats time stop, and a
+        position without a price always holds.
+    """
+    held_days = (today - entry_days) // np.timedelta64(1, 'D')
+
+    return np.select(
+        [
+            prices <= stops,
+            prices >= targets,
+            ~np.isnan(prices) & (held_days >= max_hold),
+        ],
+        [EXIT_STOP, EXIT_TARGET, EXIT_TIME],
+        default=EXIT_HOLD
+    ).astype(np.int8)
+
+
+def scaled_exit_signals(close, low, atr, sma_5, entry_price, hard_stop, highest_close,
+                        trailing_stop, scaled, hold_days, scale_levels, max_hold):
+    """
+    One day of scale-out and exit rules for every open scaled position.
+
+    Args:
+        close, low: Today's close and low per position
+        atr: ATR per position (trail width)
+        sma_5: 5-day average close per position (trend break)
+        entry_price, hard_stop: Entry price and hard stop per position
+        highest_close, trailing_stop: Trail state carried from yesterday
+        scaled: bool array (positions x levels), scale-outs already taken
+        hold_days: Calendar days held per position
+        scale_levels: Profit % of each scale-out level, ascending
+        max_hold: Time stop in days
+
+    Returns:
+        (profit_pct, sells, highest_close, trailing_stop, reasons) where
+        sells marks the scale-out levels to take today (every level the
+        profit has reached that was not taken yet), and reasons holds one EXIT_*
+        code per position. Hard stop beats trailing stop beats MA break
+        beats time stop. The trail is only raised on a new highest close.
+    """
+    profit_pct = ((close - entry_price) / entry_price) * 100
+
+    # Number of levels at or below today's profit; every level under that
+    # count not taken yet is sold today (its lower levels are all reached too)
+    reached = np.searchsorted(np.asarray(scale_levels), profit_pct, side='right')
+    sells = ~scaled & (np.arange(scaled.shape[1]) < reached[:, None])
+    scaled_once = scaled[:, 0] | sells[:, 0]
+
+    new_high = close > highest_close
+    highest_close = np.where(new_high, close, highest_close)
+    trailing_stop = np.where(new_high, trailing_stop_level(highest_close, atr, profit_pct), trailing_stop)
+
+    reasons = np.select(
+        [
+            low <= hard_stop,
+            scaled_once & (highest_close > entry_price * 1.08) & (close < trailing_stop),
+            scaled_once & (close < sma_5),
+            hold_days >= max_hold,
+        ],
+        [EXIT_STOP, EXIT_TRAIL, EXIT_MA_BREAK, EXIT_TIME],
+        default=EXIT_HOLD
+    ).astype(np.int8)
+
+    return profit_pct, sells, highest_close, trailing_stop, reasons
+
+
+def smart_exit_signals(close, low, atr, sma_5, entry_price, hard_stop, highest_close,
+                       trailing_stop, prev_close, hold_days, atr_multiplier, max_hold):
+    """
+    One day of price-action exit rules for every open smart-exit position.
+
+    Args:
+        close, low: Today's close and low per position
+        atr: ATR per position (trail width)
+        sma_5: 5-day average close per position (trend break)
+        entry_price, hard_stop: Entry price and hard stop per position
+        highest_close, trailing_stop: Trail state carried from yesterday
+        prev_close: Yesterday's close per position (0 when unknown)
+        hold_days: Calendar days held per position
+        atr_multiplier: Trail width in ATRs below +10%
+        max_hold: Time stop in days
+
+    Returns:
+        (highest_close, trailing_stop, reasons) with one EXIT_* code per
+        position. Hard stop beats trailing stop beats MA break beats lower
+        close beats time stop. The trail is only raised on a new highest close,
+        and tightens from atr_multiplier x ATR to 1x ATR at +10% and 5% under
+        the high at +15%.
+    """
+    new_high = close > highest_close
+    highest_close = np.where(new_high, close, highest_close)
+    peak_profit_pct = ((highest_close - entry_price) / entry_price) * 100
+    trail = trailing_stop_level(highest_close, atr, peak_profit_pct,
+                                tiers=(15, 10), atr_multiplier=atr_multiplier)
+    trailing_stop = np.where(new_high, trail, trailing_stop)
+
+    # Trail and lower-close exits only once the position has been 5% up
+    ran_up = highest_close > entry_price * 1.05
+    profit_pct = ((close - entry_price) / entry_price) * 100
+
+    reasons = np.select(
+        [
+            low <= hard_stop,
+            ran_up & (close < trailing_stop),
+            (profit_pct < 3.0) & (close < sma_5),
+            ran_up & (prev_close > 0) & (close < prev_close),
+            hold_days >= max_hold,
+        ],
+        [EXIT_STOP, EXIT_TRAIL, EXIT_MA_BREAK, EXIT_LOWER_CLOSE, EXIT_TIME],
+        default=EXIT_HOLD
+    ).astype(np.int8)
+
+    return highest_close, trailing_stop, reasons
+
+
+def rolling_mean(values, window):
+    """
+    Mean of every full window of values (len(values) - window + 1 entries).
+
+    Each window is summed left to right, so results match sum(window) / window
+    exactly rather than a convolution's rounding.
+    """
+    count = len(values) - window + 1
+    if count <= 0:
+        return np.empty(0)
+
+    total = values[:count].copy()
+    for k in range(1, window):
+        total += values[k:count + k]
+    return total / window
+
+
+def kaufman_adaptive_mean(values, period, fast=2, slow=30):
+    """
+    Kaufman adaptive moving average ending at every value (NaN before index period - 1).
+
+    The smoothing constant follows the efficiency ratio (net change over the
+    sum of absolute changes across period values): close to the fast EMA in
+    a clean trend, close to the slow EMA in chop. Starts from the value at
+    index period - 1.
+    """
+    kama = np.full(len(values), np.nan)
+    if len(values) <= period:
+        return kama
+
+    change = np.abs(values[period:] - values[:-period])
+    volatility = rolling_mean(np.abs(np.diff(values)), period) * period
+    efficiency = np.divide(change, volatility, out=np.zeros_like(change), where=volatility > 0)
+
+    fast_sc = 2.0 / (fast + 1)
+    slow_sc = 2.0 / (slow + 1)
+    smoothing = (efficiency * (fast_sc - slow_sc) + slow_sc) ** 2
+
+    # Each value builds on the previous one, so this part stays a loop
+    level = float(values[period - 1])
+    kama[period - 1] = level
+    for i, (value, sc) in enumerate(zip(values[period:].tolist(), smoothing.tolist()), period):
+        level += sc * (value - level)
+        kama[i] = level
+    return kama
+
+
+def trailing_stop_level(highest_close, atr, profit_pct, tiers=(30, 20), atr_multiplier=2.0):
+    """
+    Trailing stop under the highest close for every position.
+
+    The trail tightens as profit grows: atr_multiplier x ATR, then 1x ATR
+    from the lower tier (+20% by default), then 5% under the high from the
+    upper tier (+30%). The tier is picked with one np.select over all
+    positions rather than a branch per position.
+    """
+    upper, lower = tiers
+    return np.select(
+        [profit_pct >= upper, profit_pct >= lower],
+        [highest_close * 0.95, highest_close - (atr * 1.0)],
+        default=highest_close - (atr * atr_multiplier)
+    )
+
+
+def average_true_range(high, low, close, period):
+    """
+    Average True Range ending at every bar (NaN until period true ranges exist).
+
+    Element i averages the true ranges of bars i - period + 1 .. i, each
+    measured against the previous bar's close.
+    """
+    atr = np.full(len(close), np.nan)
+    if len(close) < period + 1:
+        return atr
+
+    prev_close = close[:-1]
+    true_range = np.maximum(
+        np.maximum(high[1:] - low[1:], np.abs(high[1:] - prev_close)),
+        np.abs(low[1:] - prev_close)
+    )
+
+    atr[period:] = rolling_mean(true_range, period)
+    return atr
@@ -11,9 +11,14 @@ This will show:
 4. Whether NVDA/PLTR were actually captured
 """
 
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime
 import sys
 from pathlib import Path
+import hashlib
+import io
+import json
 import logging
 
 backend_dir = Path(__file__).parent.parent
@@ -21,303 +26,408 @@ sys.path.insert(0, str(backend_dir))
 
 from backtest.daily_momentum_smart_exits import SmartExitBacktester
 import os
+import pandas as pd
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Finished backtests, one JSON file per (account, period, capital, strategy version)
+BACKTEST_CACHE_DIR = Path("./data/cache/backtests")
+
+# Bump when SmartExitBacktester's logic changes in a way its settings don't show
+STRATEGY_VERSION = 1
+
+# All tested periods, built once at import
+PERIODS = (
+    ("Q1 2024", datetime(2024, 1, 2), datetime(2024, 3, 31)),
+    ("Q2 2024", datetime(2024, 5, 1), datetime(2024, 7, 31)),
+    ("Q3 2024", datetime(2024, 8, 1), datetime(2024, 10, 31)),
+    ("Q4 2024", datetime(2024, 11, 1), datetime(2025, 1, 31)),
+    ("Q2 2025", datetime(2025, 5, 1), datetime(2025, 7, 31)),
+    ("Q3 2025", datetime(2025, 8, 1), datetime(2025, 10, 31)),
+)
+
+# One row of the detailed trade log, filled from a trade dict
+TRADE_ROW = (
+    "{symbol:<8} {entry_date:<12} {exit_date:<12} "
+    "{hold_days:<6} ${pnl:>+8,.0f}  {pnl_pct:>+6.1f}%  {exit_reason:<15}\n"
+)
+
+
+def _strategy_version(backtester):
+    """Short hash of the strategy version, its tunable settings and the scanner's."""
+    settings = {name: getattr(backtester, name) for name in backtester.TUNABLE_PARAMETERS}
+    settings['strategy'] = f"{type(backtester).__name__}/{STRATEGY_VERSION}"
+    settings['scanner'] = backtester._scanner_version()
+    return hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def _run_backtest(start, end, api_key, secret_key, starting_capital=100000):
+    """
+    Run SmartExitBacktester for one period, memoized on disk.
+
+    A backtest is a pure function of the account, period, starting capital
+    and strategy, so periods that have already ended are saved and reused
+    on the next run instead of re-fetching bars and re-simulating. The
+    strategy enters the key through _strategy_version(), so changing a
+    setting (or bumping STRATEGY_VERSION) starts a fresh cache entry. The
+    cache file name is a hash of the inputs - the keys themselves are never
+    written.
+
+    Returns:
+        dict with 'trades', 'total_return_percent' and 'total_trades'
+    """
+    backtester = SmartExitBacktester(api_key, secret_key, starting_capital=starting_capital)
+
+    key = (
+        f"{api_key}|{secret_key}|{start.isoformat()}|{end.isoformat()}|{starting_capital}"
+        f"|{_strategy_version(backtester)}"
+    )
+    cache_file = BACKTEST_CACHE_DIR / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    if cache_file.exists():
+        try:
+            with open(cache_file) as f:
+                return json.load(f)
+        except Exception:
+            # Cache corrupted, delete and re-run
+            cache_file.unlink(missing_ok=True)
 
-def analyze_period_trades(name, start, end, api_key, secret_key):
-    """Analyze trades for a single period in detail."""
-    print(f"\n{'='*80}")
-    print(f"ANALYZING: {name}")
-    print(f"{'='*80}\n")
-
-    backtester = SmartExitBacktester(api_key, secret_key, starting_capital=100000)
     results = backtester.run(start, end)
 
-    print(f"\n📊 {name} SUMMARY:")
-    print(f"   Return: {results.total_return_percent:+.2f}%")
-    print(f"   Trades: {results.total_trades}")
-    print()
-
-    # Analyze trades by symbol
-    symbol_stats = {}
-
-    for trade in results.trades:
-        symbol = trade['symbol']
-        pnl = trade['pnl']
-
-        if symbol not in symbol_stats:
-            symbol_stats[symbol] = {
-                'trades': 0,
-                'total_pnl': 0,
-                'wins': 0,
-                'losses': 0,
-                'trade_list': []
-            }
-
-        symbol_stats[symbol]['trades'] += 1
-        symbol_stats[symbol]['total_pnl'] += pnl
-
-        if pnl > 0:
-            symbol_stats[symbol]['wins'] += 1
-        else:
-            symbol_stats[symbol]['losses'] += 1
+    result = {
+        'trades': results.trades,
+        'total_return_percent': results.total_return_percent,
+        'total_trades': results.total_trades,
+    }
 
-        symbol_stats[symbol]['trade_list'].append(trade)
+    # Only cache periods that are over - later days may still change
+    if end.date() < datetime.now().date():
+        try:
+            BACKTEST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump(result, f)
+        except Exception:
+            # Failed to cache, but we still have the results
+            pass
 
-    # Sort by total P&L contribution
-    sorted_symbols = sorted(symbol_stats.items(), key=lambda x: x[1]['total_pnl'], reverse=True)
+    return result
 
-    print(f"TRADES BY SYMBOL:")
-    print("-" * 80)
-    print(f"{'Symbol':<8} {'Trades':<8} {'Total P&L':<15} {'Win%':<8} {'Contribution':<15}")
-    print("-" * 80)
 
-    total_pnl = sum(stats['total_pnl'] for _, stats in sorted_symbols)
+def analyze_period_trades(name, start, end, api_key, secret_key):
+    """Analyze trades for a single period in detail."""
+    report = io.StringIO()
+    print(f"\n{'='*80}", file=report)
+    print(f"ANALYZING: {name}", file=report)
+    print(f"{'='*80}\n", file=report)
+
+    results = _run_backtest(start, end, api_key, secret_key, starting_capital=100000)
+
+    print(f"\n📊 {name} SUMMARY:", file=report)
+    print(f"   Return: {results['total_return_percent']:+.2f}%", file=report)
+    print(f"   Trades: {results['total_trades']}", file=report)
+    print(file=report)
+
+    # Analyze trades by symbol - one groupby instead of a dict per trade
+    trades_df = pd.DataFrame(results['trades'], columns=['symbol', 'pnl']).assign(period=name)
+    is_win = trades_df['pnl'] > 0
+
+    symbol_agg = (
+        trades_df.assign(win=is_win, loss=~is_win)
+        .groupby('symbol', sort=False)
+        .agg(
+            trades=('pnl', 'size'),
+            total_pnl=('pnl', 'sum'),
+            wins=('win', 'sum'),
+            losses=('loss', 'sum'),
+        )
+        # Stable sort keeps first-traded order for ties
+        .sort_values('total_pnl', ascending=False, kind='stable')
+    )
+    symbol_stats = symbol_agg.to_dict('index')
+    sorted_symbols = list(symbol_stats.items())
+
+    print(f"TRADES BY SYMBOL:", file=report)
+    print("-" * 80, file=report)
+    print(f"{'Symbol':<8} {'Trades':<8} {'Total P&L':<15} {'Win%':<8} {'Contribution':<15}", file=report)
+    print("-" * 80, file=report)
+
+    # Contribution scale computed once; every grouped symbol has >= 1 trade
+    total_pnl = trades_df['pnl'].sum()
+    pct_of_total = 100.0 / total_pnl if total_pnl != 0 else 0.0
 
     for symbol, stats in sorted_symbols:
-        win_rate = (stats['wins'] / stats['trades'] * 100) if stats['trades'] > 0 else 0
-        contribution = (stats['total_pnl'] / total_pnl * 100) if total_pnl != 0 else 0
+        win_rate = stats['wins'] / stats['trades'] * 100
+        contribution = stats['total_pnl'] * pct_of_total
 
-        print(f"{symbol:<8} {stats['trades']:<8} ${stats['total_pnl']:>+10,.0f}   {win_rate:>5.1f}%  {contribution:>+6.1f}%")
+        print(f"{symbol:<8} {stats['trades']:<8} ${stats['total_pnl']:>+10,.0f}   {win_rate:>5.1f}%  {contribution:>+6.1f}%", file=report)
 
-    print("-" * 80)
-    print(f"{'TOTAL':<8} {len(results.trades):<8} ${total_pnl:>+10,.0f}")
-    print()
+    print("-" * 80, file=report)
+    print(f"{'TOTAL':<8} {len(results['trades']):<8} ${total_pnl:>+10,.0f}", file=report)
+    print(file=report)
 
     # Detailed trade list
-    print(f"\nDETAILED TRADE LOG:")
-    print("-" * 80)
-    print(f"{'Symbol':<8} {'Entry':<12} {'Exit':<12} {'Days':<6} {'P&L':<12} {'%':<8} {'Reason':<15}")
-    print("-" * 80)
+    print(f"\nDETAILED TRADE LOG:", file=report)
+    print("-" * 80, file=report)
+    print(f"{'Symbol':<8} {'Entry':<12} {'Exit':<12} {'Days':<6} {'P&L':<12} {'%':<8} {'Reason':<15}", file=report)
+    print("-" * 80, file=report)
 
-    for trade in results.trades:
-        pnl_pct = trade['pnl_pct']
-        print(f"{trade['symbol']:<8} {trade['entry_date']:<12} {trade['exit_date']:<12} "
-              f"{trade['hold_days']:<6} ${trade['pnl']:>+8,.0f}  {pnl_pct:>+6.1f}%  {trade['exit_reason']:<15}")
+    report.writelines(TRADE_ROW.format_map(trade) for trade in results['trades'])
 
-    print()
+    print(file=report)
 
     # Check if NVDA/PLTR were traded
-    print("="*80)
-    print("KEY MOMENTUM STOCKS ANALYSIS")
-    print("="*80 + "\n")
+    print("="*80, file=report)
+    print("KEY MOMENTUM STOCKS ANALYSIS", file=report)
+    print("="*80 + "\n", file=report)
 
     key_stocks = ['NVDA', 'PLTR']
 
     for symbol in key_stocks:
         if symbol in symbol_stats:
             stats = symbol_stats[symbol]
-            print(f"✅ {symbol} WAS TRADED:")
-            print(f"   Trades: {stats['trades']}")
-            print(f"   Total P&L: ${stats['total_pnl']:+,.0f}")
-            print(f"   Win rate: {stats['wins']/stats['trades']*100:.1f}%")
-            print(f"   Contribution to returns: {stats['total_pnl']/total_pnl*100:+.1f}%")
-            print()
+            print(f"✅ {symbol} WAS TRADED:", file=report)
+            print(f"   Trades: {stats['trades']}", file=report)
+            print(f"   Total P&L: ${stats['total_pnl']:+,.0f}", file=report)
+            print(f"   Win rate: {stats['wins']/stats['trades']*100:.1f}%", file=report)
+            print(f"   Contribution to returns: {stats['total_pnl'] * pct_of_total:+.1f}%", file=report)
+            print(file=report)
 
             # Show individual trades
-            print(f"   Individual {symbol} trades:")
-            for trade in stats['trade_list']:
+            print(f"   Individual {symbol} trades:", file=report)
+            for trade in (t for t in results['trades'] if t['symbol'] == symbol):
                 print(f"      {trade['entry_date']} → {trade['exit_date']}: "
-                      f"${trade['pnl']:+,.0f} ({trade['pnl_pct']:+.1f}%) - {trade['exit_reason']}")
-            print()
+                      f"${trade['pnl']:+,.0f} ({trade['pnl_pct']:+.1f}%) - {trade['exit_reason']}", file=report)
+            print(file=report)
         else:
-            print(f"❌ {symbol} WAS NOT TRADED")
-            print(f"   The scanner did not pick up {symbol} during this period")
-            print(f"   This means {symbol} didn't meet our entry criteria:")
-            print(f"      - Price > SMA20 > SMA50")
-            print(f"      - Volume 1.2x+ average")
-            print(f"      - Consolidation base with <12% volatility")
-            print(f"      - Breaking above base high")
-            print()
+            print(f"❌ {symbol} WAS NOT TRADED", file=report)
+            print(f"   The scanner did not pick up {symbol} during this period", file=report)
+            print(f"   This means {symbol} didn't meet our entry criteria:", file=report)
+            print(f"      - Price > SMA20 > SMA50", file=report)
+            print(f"      - Volume 1.2x+ average", file=report)
+            print(f"      - Consolidation base with <12% volatility", file=report)
+            print(f"      - Breaking above base high", file=report)
+            print(file=report)
+
+    sys.stdout.write(report.getvalue())
 
     return {
         'period': name,
         'total_pnl': total_pnl,
         'symbol_stats': symbol_stats,
-        'trades': results.trades,
+        'trades': results['trades'],
+        'trades_df': trades_df,
     }
 
 
+def _analyze_period_buffered(name, start, end, api_key, secret_key):
+    """
+    Run analyze_period_trades in a worker process.
+
+    The period's report is captured instead of printed so main() can print
+    the reports in period order no matter which worker finishes first.
+
+    Returns:
+        (report_text, period_result)
+    """
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        result = analyze_period_trades(name, start, end, api_key, secret_key)
+    return buffer.getvalue(), result
+
+
+def _configure_logging():
+    """
+    Set up logging once per process (main and each pool worker).
+
+    The HTTP client loggers used for Alpaca requests are pinned to WARNING
+    so their debug records are dropped before any formatting happens.
+    """
+    logging.basicConfig(level=logging.WARNING)
+    for name in ("urllib3", "requests", "alpaca"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
 def main():
     """Analyze which stocks contributed to returns across all periods."""
 
-    logging.basicConfig(level=logging.WARNING)
+    _configure_logging()
 
     api_key = os.getenv('ALPACA_API_KEY')
     secret_key = os.getenv('ALPACA_SECRET_KEY')
 
-    print("\n" + "="*80)
-    print("TRADE BREAKDOWN ANALYSIS")
-    print("="*80)
-    print("\nQuestion: Did we capture NVDA/PLTR gains?")
-    print("Let's analyze which stocks contributed to our returns...")
-    print("="*80)
-
-    # All tested periods
-    periods = [
-        ("Q1 2024", datetime(2024, 1, 2), datetime(2024, 3, 31)),
-        ("Q2 2024", datetime(2024, 5, 1), datetime(2024, 7, 31)),
-        ("Q3 2024", datetime(2024, 8, 1), datetime(2024, 10, 31)),
-        ("Q4 2024", datetime(2024, 11, 1), datetime(2025, 1, 31)),
-        ("Q2 2025", datetime(2025, 5, 1), datetime(2025, 7, 31)),
-        ("Q3 2025", datetime(2025, 8, 1), datetime(2025, 10, 31)),
-    ]
+    report = io.StringIO()
+    print("\n" + "="*80, file=report)
+    print("TRADE BREAKDOWN ANALYSIS", file=report)
+    print("="*80, file=report)
+    print("\nQuestion: Did we capture NVDA/PLTR gains?", file=report)
+    print("Let's analyze which stocks contributed to our returns...", file=report)
+    print("="*80, file=report)
+    sys.stdout.write(report.getvalue())
 
     all_period_results = []
 
-    for name, start, end in periods:
-        result = analyze_period_trades(name, start, end, api_key, secret_key)
-        all_period_results.append(result)
+    # Periods are independent backtests - run them side by side
+    with ProcessPoolExecutor(
+        max_workers=min(len(PERIODS), os.cpu_count() or 1),
+        initializer=_configure_logging
+    ) as executor:
+        futures = [
+            executor.submit(_analyze_period_buffered, name, start, end, api_key, secret_key)
+            for name, start, end in PERIODS
+        ]
+
+        for future in futures:
+            period_report, result = future.result()
+            sys.stdout.write(period_report)
+            all_period_results.append(result)
 
     # Overall summary
-    print("\n\n" + "="*80)
-    print("OVERALL SUMMARY - ALL PERIODS")
-    print("="*80 + "\n")
-
-    # Aggregate by symbol across all periods
-    overall_symbol_stats = {}
-    total_trades = 0
-    total_pnl = 0
-
-    for period_result in all_period_results:
-        for symbol, stats in period_result['symbol_stats'].items():
-            if symbol not in overall_symbol_stats:
-                overall_symbol_stats[symbol] = {
-                    'trades': 0,
-                    'total_pnl': 0,
-                    'wins': 0,
-                    'losses': 0,
-                    'periods_traded': set()
-                }
-
-            overall_symbol_stats[symbol]['trades'] += stats['trades']
-            overall_symbol_stats[symbol]['total_pnl'] += stats['total_pnl']
-            overall_symbol_stats[symbol]['wins'] += stats['wins']
-            overall_symbol_stats[symbol]['losses'] += stats['losses']
-            overall_symbol_stats[symbol]['periods_traded'].add(period_result['period'])
-
-        total_trades += len(period_result['trades'])
-        total_pnl += period_result['total_pnl']
-
-    # Sort by contribution
-    sorted_overall = sorted(overall_symbol_stats.items(), key=lambda x: x[1]['total_pnl'], reverse=True)
-
-    print("TOP CONTRIBUTORS TO RETURNS:")
-    print("-" * 80)
-    print(f"{'Symbol':<8} {'Trades':<8} {'Total P&L':<15} {'Win%':<8} {'Contribution':<12} {'Periods':<10}")
-    print("-" * 80)
+    report = io.StringIO()
+    print("\n\n" + "="*80, file=report)
+    print("OVERALL SUMMARY - ALL PERIODS", file=report)
+    print("="*80 + "\n", file=report)
+
+    # Aggregate by symbol across all periods - one groupby over every trade
+    all_trades = pd.concat([r['trades_df'] for r in all_period_results], ignore_index=True)
+    is_win = all_trades['pnl'] > 0
+
+    overall_agg = (
+        all_trades.assign(win=is_win, loss=~is_win)
+        .groupby('symbol', sort=False)
+        .agg(
+            trades=('pnl', 'size'),
+            total_pnl=('pnl', 'sum'),
+            wins=('win', 'sum'),
+            losses=('loss', 'sum'),
+            periods_traded=('period', 'unique'),
+        )
+        .sort_values('total_pnl', ascending=False, kind='stable')
+    )
+    overall_symbol_stats = overall_agg.to_dict('index')
+    sorted_overall = list(overall_symbol_stats.items())
+
+    total_trades = len(all_trades)
+    total_pnl = all_trades['pnl'].sum()
+
+    print("TOP CONTRIBUTORS TO RETURNS:", file=report)
+    print("-" * 80, file=report)
+    print(f"{'Symbol':<8} {'Trades':<8} {'Total P&L':<15} {'Win%':<8} {'Contribution':<12} {'Periods':<10}", file=report)
+    print("-" * 80, file=report)
+
+    pct_of_total = 100.0 / total_pnl if total_pnl != 0 else 0.0
 
     for symbol, stats in sorted_overall[:15]:  # Top 15
-        win_rate = (stats['wins'] / stats['trades'] * 100) if stats['trades'] > 0 else 0
-        contribution = (stats['total_pnl'] / total_pnl * 100) if total_pnl != 0 else 0
+        win_rate = stats['wins'] / stats['trades'] * 100
+        contribution = stats['total_pnl'] * pct_of_total
         periods = len(stats['periods_traded'])
 
         print(f"{symbol:<8} {stats['trades']:<8} ${stats['total_pnl']:>+10,.0f}   {win_rate:>5.1f}%  "
-              f"{contribution:>+6.1f}%    {periods}/6")
+              f"{contribution:>+6.1f}%    {periods}/{len(PERIODS)}", file=report)
 
-    print("-" * 80)
-    print(f"{'TOTAL':<8} {total_trades:<8} ${total_pnl:>+10,.0f}")
-    print()
+    print("-" * 80, file=report)
+    print(f"{'TOTAL':<8} {total_trades:<8} ${total_pnl:>+10,.0f}", file=report)
+    print(file=report)
 
     # NVDA/PLTR specific analysis
-    print("="*80)
-    print("NVDA AND PLTR - DID WE CAPTURE THE BIG MOVES?")
-    print("="*80 + "\n")
+    print("="*80, file=report)
+    print("NVDA AND PLTR - DID WE CAPTURE THE BIG MOVES?", file=report)
+    print("="*80 + "\n", file=report)
 
     key_stocks = ['NVDA', 'PLTR']
 
     for symbol in key_stocks:
-        print(f"\n{symbol} ANALYSIS:")
-        print("-" * 80)
+        print(f"\n{symbol} ANALYSIS:", file=report)
+        print("-" * 80, file=report)
 
         if symbol in overall_symbol_stats:
             stats = overall_symbol_stats[symbol]
 
-            print(f"✅ {symbol} WAS TRADED")
-            print(f"   Total trades: {stats['trades']}")
-            print(f"   Total P&L: ${stats['total_pnl']:+,.0f}")
-            print(f"   Win rate: {stats['wins']/stats['trades']*100:.1f}%")
-            print(f"   Contribution to total returns: {stats['total_pnl']/total_pnl*100:+.1f}%")
-            print(f"   Periods traded: {len(stats['periods_traded'])}/6")
-            print(f"   Periods: {', '.join(sorted(stats['periods_traded']))}")
-            print()
+            print(f"✅ {symbol} WAS TRADED", file=report)
+            print(f"   Total trades: {stats['trades']}", file=report)
+            print(f"   Total P&L: ${stats['total_pnl']:+,.0f}", file=report)
+            print(f"   Win rate: {stats['wins']/stats['trades']*100:.1f}%", file=report)
+            print(f"   Contribution to total returns: {stats['total_pnl'] * pct_of_total:+.1f}%", file=report)
+            print(f"   Periods traded: {len(stats['periods_traded'])}/{len(PERIODS)}", file=report)
+            print(f"   Periods: {', '.join(sorted(stats['periods_traded']))}", file=report)
+            print(file=report)
 
             # Show which periods it was traded
-            print(f"   {symbol} trades by period:")
+            print(f"   {symbol} trades by period:", file=report)
             for period_result in all_period_results:
                 if symbol in period_result['symbol_stats']:
                     period_stats = period_result['symbol_stats'][symbol]
                     print(f"      {period_result['period']}: {period_stats['trades']} trades, "
-                          f"${period_stats['total_pnl']:+,.0f}")
+                          f"${period_stats['total_pnl']:+,.0f}", file=report)
 
             if stats['total_pnl'] > 1000:
-                print(f"\n   🎯 GOOD: We captured {symbol} and it contributed meaningfully!")
+                print(f"\n   🎯 GOOD: We captured {symbol} and it contributed meaningfully!", file=report)
             elif stats['total_pnl'] > 0:
-                print(f"\n   ⚠️  MODEST: We captured {symbol} but gains were small")
+                print(f"\n   ⚠️  MODEST: We captured {symbol} but gains were small", file=report)
             else:
-                print(f"\n   ❌ BAD: We traded {symbol} but lost money")
+                print(f"\n   ❌ BAD: We traded {symbol} but lost money", file=report)
 
         else:
-            print(f"❌ {symbol} WAS NEVER TRADED")
-            print(f"   The scanner never picked up {symbol} across all 6 periods!")
-            print(f"   This is a MAJOR ISSUE - {symbol} had huge moves in 2024-2025")
-            print()
-            print(f"   Why wasn't {symbol} captured?")
-            print(f"      1. Too strict entry criteria")
-            print(f"      2. Missed the consolidation patterns")
-            print(f"      3. Volume requirements too high")
-            print(f"      4. Not in watchlist (check scanner watchlist)")
-
-    print()
-    print("="*80)
-    print("CONCLUSION")
-    print("="*80 + "\n")
+            print(f"❌ {symbol} WAS NEVER TRADED", file=report)
+            print(f"   The scanner never picked up {symbol} across all {len(PERIODS)} periods!", file=report)
+            print(f"   This is a MAJOR ISSUE - {symbol} had huge moves in 2024-2025", file=report)
+            print(file=report)
+            print(f"   Why wasn't {symbol} captured?", file=report)
+            print(f"      1. Too strict entry criteria", file=report)
+            print(f"      2. Missed the consolidation patterns", file=report)
+            print(f"      3. Volume requirements too high", file=report)
+            print(f"      4. Not in watchlist (check scanner watchlist)", file=report)
+
+    print(file=report)
+    print("="*80, file=report)
+    print("CONCLUSION", file=report)
+    print("="*80 + "\n", file=report)
 
     nvda_captured = 'NVDA' in overall_symbol_stats
     pltr_captured = 'PLTR' in overall_symbol_stats
 
-    nvda_contribution = (overall_symbol_stats['NVDA']['total_pnl'] / total_pnl * 100) if nvda_captured else 0
-    pltr_contribution = (overall_symbol_stats['PLTR']['total_pnl'] / total_pnl * 100) if pltr_captured else 0
+    nvda_contribution = overall_symbol_stats['NVDA']['total_pnl'] * pct_of_total if nvda_captured else 0
+    pltr_contribution = overall_symbol_stats['PLTR']['total_pnl'] * pct_of_total if pltr_captured else 0
 
-    print(f"NVDA captured: {'YES' if nvda_captured else 'NO'}")
+    print(f"NVDA captured: {'YES' if nvda_captured else 'NO'}", file=report)
     if nvda_captured:
-        print(f"   Contribution: {nvda_contribution:+.1f}% of total returns")
+        print(f"   Contribution: {nvda_contribution:+.1f}% of total returns", file=report)
 
-    print(f"\nPLTR captured: {'YES' if pltr_captured else 'NO'}")
+    print(f"\nPLTR captured: {'YES' if pltr_captured else 'NO'}", file=report)
     if pltr_captured:
-        print(f"   Contribution: {pltr_contribution:+.1f}% of total returns")
+        print(f"   Contribution: {pltr_contribution:+.1f}% of total returns", file=report)
 
-    print()
+    print(file=report)
 
     if nvda_captured and pltr_captured:
         total_key_contribution = nvda_contribution + pltr_contribution
-        print(f"✅ GOOD: Both NVDA and PLTR were captured")
-        print(f"   Combined contribution: {total_key_contribution:+.1f}% of total returns")
+        print(f"✅ GOOD: Both NVDA and PLTR were captured", file=report)
+        print(f"   Combined contribution: {total_key_contribution:+.1f}% of total returns", file=report)
 
         if total_key_contribution > 50:
-            print(f"\n   💡 INSIGHT: Strategy is HEAVILY dependent on NVDA/PLTR")
-            print(f"   {total_key_contribution:.0f}% of returns came from just 2 stocks!")
-            print(f"   Risk: If these stocks stop trending, strategy may struggle")
+            print(f"\n   💡 INSIGHT: Strategy is HEAVILY dependent on NVDA/PLTR", file=report)
+            print(f"   {total_key_contribution:.0f}% of returns came from just 2 stocks!", file=report)
+            print(f"   Risk: If these stocks stop trending, strategy may struggle", file=report)
         elif total_key_contribution > 25:
-            print(f"\n   💡 INSIGHT: NVDA/PLTR are important but not dominant")
-            print(f"   Strategy is reasonably diversified")
+            print(f"\n   💡 INSIGHT: NVDA/PLTR are important but not dominant", file=report)
+            print(f"   Strategy is reasonably diversified", file=report)
         else:
-            print(f"\n   💡 INSIGHT: Returns are well-diversified")
-            print(f"   NVDA/PLTR contributed only {total_key_contribution:.0f}%")
-            print(f"   Strategy found momentum in other stocks too")
+            print(f"\n   💡 INSIGHT: Returns are well-diversified", file=report)
+            print(f"   NVDA/PLTR contributed only {total_key_contribution:.0f}%", file=report)
+            print(f"   Strategy found momentum in other stocks too", file=report)
 
     elif nvda_captured or pltr_captured:
-        print(f"⚠️  MIXED: Only one of the two key stocks was captured")
-        print(f"   Need to investigate why the other was missed")
+        print(f"⚠️  MIXED: Only one of the two key stocks was captured", file=report)
+        print(f"   Need to investigate why the other was missed", file=report)
     else:
-        print(f"❌ PROBLEM: Neither NVDA nor PLTR were captured!")
-        print(f"   Returns came from other stocks entirely")
-        print(f"   This means our optimization FAILED to achieve its goal")
-        print(f"   The strategy changes didn't help us catch the big winners")
+        print(f"❌ PROBLEM: Neither NVDA nor PLTR were captured!", file=report)
+        print(f"   Returns came from other stocks entirely", file=report)
+        print(f"   This means our optimization FAILED to achieve its goal", file=report)
+        print(f"   The strategy changes didn't help us catch the big winners", file=report)
+
+    print("\n" + "="*80 + "\n", file=report)
 
-    print("\n" + "="*80 + "\n")
+    sys.stdout.write(report.getvalue())
 
 
 if __name__ == "__main__":
@@ -7,9 +7,17 @@ Takes the quarterly results from our validated strategy and projects:
 3. Best/worst case scenarios based on observed volatility
 """
 
+import io
 import json
+import sys
 from pathlib import Path
 
+import numpy as np
+
+# Resolved once at import, not on every run
+OUTPUT_FILE = Path(__file__).resolve().parents[2] / "annualized_returns.json"
+
+
 def calculate_compound_annual_return(quarterly_returns):
     """
     Calculate compound annual growth rate (CAGR) from quarterly returns.
@@ -21,13 +29,8 @@ def calculate_compound_annual_return(quarterly_returns):
     - Annualize by raising to (4 quarters / number of quarters tested)
     """
 
-    # Convert percentages to multipliers (5% = 1.05)
-    multipliers = [1 + (r / 100) for r in quarterly_returns]
-
-    # Compound the returns
-    compound_multiplier = 1.0
-    for m in multipliers:
-        compound_multiplier *= m
+    # Convert percentages to multipliers (5% = 1.05) and compound them
+    compound_multiplier = calculate_return_stats(quarterly_returns)[0]
 
     # Number of quarters tested
     num_quarters = len(quarterly_returns)
@@ -40,10 +43,31 @@ def calculate_compound_annual_return(quarterly_returns):
     return annual_return_pct, compound_multiplier
 
 
+def calculate_return_stats(quarterly_returns):
+    """
+    Compound multiplier and summary statistics of quarterly returns.
+
+    Works on one numpy array so repeated calls (parameter sweeps,
+    bootstrap resampling) don't pay for a Python loop per return.
+
+    Returns:
+        (compound_multiplier, mean, std_dev, worst, best) - std_dev is the
+        population standard deviation, all values in percent except the multiplier
+    """
+    returns = np.asarray(quarterly_returns, dtype=np.float64)
+
+    compound_multiplier = np.prod(1.0 + returns / 100.0)
+
+    return compound_multiplier, returns.mean(), returns.std(), returns.min(), returns.max()
+
+
 def main():
-    print("\n" + "="*80)
-    print("ANNUALIZED RETURN CALCULATION - VALIDATED STRATEGY")
-    print("="*80 + "\n")
+    # Build the whole report in memory and write it out once
+    report = io.StringIO()
+
+    print("\n" + "="*80, file=report)
+    print("ANNUALIZED RETURN CALCULATION - VALIDATED STRATEGY", file=report)
+    print("="*80 + "\n", file=report)
 
     # All tested periods (seen + unseen)
     all_results = {
@@ -55,99 +79,97 @@ def main():
         'Q3 2025': +6.50,
     }
 
-    print("Quarterly Returns:")
-    print("-" * 80)
+    print("Quarterly Returns:", file=report)
+    print("-" * 80, file=report)
     for period, ret in all_results.items():
-        print(f"  {period}: {ret:>+8.2f}%")
+        print(f"  {period}: {ret:>+8.2f}%", file=report)
 
-    quarterly_returns = list(all_results.values())
-    avg_quarterly = sum(quarterly_returns) / len(quarterly_returns)
+    quarterly_returns = np.fromiter(all_results.values(), dtype=np.float64, count=len(all_results))
+    _, avg_quarterly, std_dev, worst_quarter, best_quarter = calculate_return_stats(quarterly_returns)
 
-    print("-" * 80)
-    print(f"  Average per quarter: {avg_quarterly:>+8.2f}%")
-    print()
+    print("-" * 80, file=report)
+    print(f"  Average per quarter: {avg_quarterly:>+8.2f}%", file=report)
+    print(file=report)
 
     # Calculate compound annual return
     annual_return, compound_multiplier = calculate_compound_annual_return(quarterly_returns)
 
-    print("="*80)
-    print("ANNUALIZED PERFORMANCE")
-    print("="*80 + "\n")
+    print("="*80, file=report)
+    print("ANNUALIZED PERFORMANCE", file=report)
+    print("="*80 + "\n", file=report)
 
-    print(f"Compound Annual Growth Rate (CAGR): {annual_return:+.2f}%")
-    print()
+    print(f"Compound Annual Growth Rate (CAGR): {annual_return:+.2f}%", file=report)
+    print(file=report)
 
     # Calculate $10k projections
     starting_capital = 10000
 
-    print("$10,000 Investment Projections:")
-    print("-" * 80)
+    print("$10,000 Investment Projections:", file=report)
+    print("-" * 80, file=report)
 
     # Year 1
     year1_value = starting_capital * (1 + annual_return / 100)
     year1_profit = year1_value - starting_capital
-    print(f"After 1 year:  ${year1_value:>10,.2f} (profit: ${year1_profit:>+8,.2f})")
+    print(f"After 1 year:  ${year1_value:>10,.2f} (profit: ${year1_profit:>+8,.2f})", file=report)
 
     # Year 2
     year2_value = year1_value * (1 + annual_return / 100)
     year2_profit = year2_value - starting_capital
-    print(f"After 2 years: ${year2_value:>10,.2f} (profit: ${year2_profit:>+8,.2f})")
+    print(f"After 2 years: ${year2_value:>10,.2f} (profit: ${year2_profit:>+8,.2f})", file=report)
 
     # Year 3
     year3_value = year2_value * (1 + annual_return / 100)
     year3_profit = year3_value - starting_capital
-    print(f"After 3 years: ${year3_value:>10,.2f} (profit: ${year3_profit:>+8,.2f})")
+    print(f"After 3 years: ${year3_value:>10,.2f} (profit: ${year3_profit:>+8,.2f})", file=report)
 
-    print()
+    print(file=report)
 
     # Quarterly breakdown
-    print("="*80)
-    print("QUARTERLY COMPOUNDING EXAMPLE (Starting with $10,000)")
-    print("="*80 + "\n")
+    print("="*80, file=report)
+    print("QUARTERLY COMPOUNDING EXAMPLE (Starting with $10,000)", file=report)
+    print("="*80 + "\n", file=report)
 
     capital = starting_capital
-    print(f"Starting capital: ${capital:,.2f}\n")
+    print(f"Starting capital: ${capital:,.2f}\n", file=report)
 
     for period, ret in all_results.items():
         profit = capital * (ret / 100)
         capital += profit
-        print(f"{period}: {ret:>+6.2f}% → ${capital:>10,.2f} (quarter profit: ${profit:>+8,.2f})")
+        print(f"{period}: {ret:>+6.2f}% → ${capital:>10,.2f} (quarter profit: ${profit:>+8,.2f})", file=report)
 
     total_profit = capital - starting_capital
     total_return_pct = ((capital - starting_capital) / starting_capital) * 100
 
-    print("-" * 80)
-    print(f"Final value: ${capital:,.2f}")
-    print(f"Total profit: ${total_profit:>+,.2f}")
-    print(f"Total return: {total_return_pct:>+.2f}% over {len(all_results)} quarters")
-    print()
+    print("-" * 80, file=report)
+    print(f"Final value: ${capital:,.2f}", file=report)
+    print(f"Total profit: ${total_profit:>+,.2f}", file=report)
+    print(f"Total return: {total_return_pct:>+.2f}% over {len(all_results)} quarters", file=report)
+    print(file=report)
 
     # Volatility analysis
-    print("="*80)
-    print("RISK ANALYSIS")
-    print("="*80 + "\n")
-
-    # Calculate standard deviation of quarterly returns
-    mean_return = sum(quarterly_returns) / len(quarterly_returns)
-    variance = sum((r - mean_return) ** 2 for r in quarterly_returns) / len(quarterly_returns)
-    std_dev = variance ** 0.5
-
-    print(f"Quarterly Return Statistics:")
-    print(f"  Mean: {mean_return:>+.2f}%")
-    print(f"  Std Dev: {std_dev:>.2f}%")
-    print(f"  Best quarter: {max(quarterly_returns):>+.2f}%")
-    print(f"  Worst quarter: {min(quarterly_returns):>+.2f}%")
-    print()
+    print("="*80, file=report)
+    print("RISK ANALYSIS", file=report)
+    print("="*80 + "\n", file=report)
+
+    # Mean and standard deviation come from calculate_return_stats above
+    mean_return = avg_quarterly
+
+    print(f"Quarterly Return Statistics:", file=report)
+    print(f"  Mean: {mean_return:>+.2f}%", file=report)
+    print(f"  Std Dev: {std_dev:>.2f}%", file=report)
+    print(f"  Best quarter: {best_quarter:>+.2f}%", file=report)
+    print(f"  Worst quarter: {worst_quarter:>+.2f}%", file=report)
+    print(file=report)
 
     # Sharpe-like ratio (assuming 0% risk-free rate for simplicity)
     sharpe_like = mean_return / std_dev if std_dev > 0 else 0
-    print(f"Return/Risk Ratio: {sharpe_like:.2f}")
-    print()
+    print(f"Return/Risk Ratio: {sharpe_like:.2f}", file=report)
+    print(file=report)
 
     # Scenario analysis
-    print("="*80)
-    print("SCENARIO ANALYSIS (1 Year / 4 Quarters)")
-    print("="*80 + "\n")
+    print("="*80, file=report)
+    print("SCENARIO ANALYSIS (1 Year / 4 Quarters)", file=report)
+    print("="*80 + "\n", file=report)
 
     # Best case: Average + 1 std dev
     best_case_quarterly = mean_return + std_dev
@@ -163,56 +185,57 @@ def main():
     worst_case_annual = ((1 + worst_case_quarterly/100) ** 4 - 1) * 100
     worst_case_value = starting_capital * (1 + worst_case_annual / 100)
 
-    print(f"Best Case (Mean + 1σ):     {best_case_annual:>+7.2f}% → ${best_case_value:>10,.2f}")
-    print(f"Expected Case (Mean):      {expected_annual:>+7.2f}% → ${expected_value:>10,.2f}")
-    print(f"Worst Case (Mean - 1σ):    {worst_case_annual:>+7.2f}% → ${worst_case_value:>10,.2f}")
-    print()
+    print(f"Best Case (Mean + 1σ):     {best_case_annual:>+7.2f}% → ${best_case_value:>10,.2f}", file=report)
+    print(f"Expected Case (Mean):      {expected_annual:>+7.2f}% → ${expected_value:>10,.2f}", file=report)
+    print(f"Worst Case (Mean - 1σ):    {worst_case_annual:>+7.2f}% → ${worst_case_value:>10,.2f}", file=report)
+    print(file=report)
 
-    # Win/loss analysis
-    positive_quarters = sum(1 for r in quarterly_returns if r > 0)
+    # Win/loss analysis - one boolean mask per side instead of a scan per statistic
+    positive_mask = quarterly_returns > 0
+    positive_quarters = int(positive_mask.sum())
     negative_quarters = len(quarterly_returns) - positive_quarters
 
-    print("="*80)
-    print("WIN/LOSS STATISTICS")
-    print("="*80 + "\n")
+    print("="*80, file=report)
+    print("WIN/LOSS STATISTICS", file=report)
+    print("="*80 + "\n", file=report)
 
-    print(f"Positive quarters: {positive_quarters}/{len(quarterly_returns)} ({positive_quarters/len(quarterly_returns)*100:.0f}%)")
-    print(f"Negative quarters: {negative_quarters}/{len(quarterly_returns)} ({negative_quarters/len(quarterly_returns)*100:.0f}%)")
-    print()
+    print(f"Positive quarters: {positive_quarters}/{len(quarterly_returns)} ({positive_quarters/len(quarterly_returns)*100:.0f}%)", file=report)
+    print(f"Negative quarters: {negative_quarters}/{len(quarterly_returns)} ({negative_quarters/len(quarterly_returns)*100:.0f}%)", file=report)
+    print(file=report)
 
-    avg_positive = sum(r for r in quarterly_returns if r > 0) / positive_quarters if positive_quarters > 0 else 0
-    avg_negative = sum(r for r in quarterly_returns if r < 0) / negative_quarters if negative_quarters > 0 else 0
+    avg_positive = quarterly_returns[positive_mask].sum() / positive_quarters if positive_quarters > 0 else 0
+    avg_negative = quarterly_returns[quarterly_returns < 0].sum() / negative_quarters if negative_quarters > 0 else 0
+    profit_factor = abs(avg_positive / avg_negative) if avg_negative != 0 else 0.0
 
-    print(f"Average winning quarter: {avg_positive:>+.2f}%")
-    print(f"Average losing quarter: {avg_negative:>+.2f}%")
+    print(f"Average winning quarter: {avg_positive:>+.2f}%", file=report)
+    print(f"Average losing quarter: {avg_negative:>+.2f}%", file=report)
 
     if avg_negative != 0:
-        profit_factor = abs(avg_positive / avg_negative)
-        print(f"Profit factor (win/loss ratio): {profit_factor:.2f}x")
+        print(f"Profit factor (win/loss ratio): {profit_factor:.2f}x", file=report)
 
-    print()
+    print(file=report)
 
     # Comparison to benchmarks
-    print("="*80)
-    print("BENCHMARK COMPARISON")
-    print("="*80 + "\n")
+    print("="*80, file=report)
+    print("BENCHMARK COMPARISON", file=report)
+    print("="*80 + "\n", file=report)
 
     # Typical market returns
     spy_annual = 10.0  # S&P 500 historical average
     spy_value = starting_capital * (1 + spy_annual / 100)
 
-    print("Investment performance comparison (1 year on $10k):")
-    print(f"  This Strategy:  {annual_return:>+7.2f}% → ${year1_value:>10,.2f}")
-    print(f"  S&P 500 (avg):  {spy_annual:>+7.2f}% → ${spy_value:>10,.2f}")
-    print()
+    print("Investment performance comparison (1 year on $10k):", file=report)
+    print(f"  This Strategy:  {annual_return:>+7.2f}% → ${year1_value:>10,.2f}", file=report)
+    print(f"  S&P 500 (avg):  {spy_annual:>+7.2f}% → ${spy_value:>10,.2f}", file=report)
+    print(file=report)
 
     outperformance = annual_return - spy_annual
     if outperformance > 0:
-        print(f"✅ Strategy outperforms S&P 500 by {outperformance:+.2f}% annually")
+        print(f"✅ Strategy outperforms S&P 500 by {outperformance:+.2f}% annually", file=report)
     else:
-        print(f"❌ Strategy underperforms S&P 500 by {abs(outperformance):.2f}% annually")
+        print(f"❌ Strategy underperforms S&P 500 by {abs(outperformance):.2f}% annually", file=report)
 
-    print()
+    print(file=report)
 
     # Save results
     output = {
@@ -231,36 +254,37 @@ def main():
         'outperformance_vs_spy': outperformance,
     }
 
-    output_file = Path(__file__).parent.parent.parent / "annualized_returns.json"
-    with open(output_file, 'w') as f:
-        json.dump(output, f, indent=2)
+    # Serialize in one call and write the file in one go
+    OUTPUT_FILE.write_text(json.dumps(output, indent=2))
 
-    print(f"📊 Results saved to: {output_file}")
-    print("\n" + "="*80 + "\n")
+    print(f"📊 Results saved to: {OUTPUT_FILE}", file=report)
+    print("\n" + "="*80 + "\n", file=report)
 
     # Final summary
-    print("="*80)
-    print("EXECUTIVE SUMMARY")
-    print("="*80 + "\n")
-
-    print(f"Starting with $10,000:")
-    print(f"  • Expected return after 1 year: ${year1_value:,.2f} ({annual_return:+.2f}%)")
-    print(f"  • Quarterly volatility: {std_dev:.2f}%")
-    print(f"  • Positive quarters: {positive_quarters}/{len(quarterly_returns)} ({positive_quarters/len(quarterly_returns)*100:.0f}%)")
-    print(f"  • Profit factor: {profit_factor:.2f}x")
-    print(f"  • Outperformance vs S&P 500: {outperformance:+.2f}%")
-    print()
+    print("="*80, file=report)
+    print("EXECUTIVE SUMMARY", file=report)
+    print("="*80 + "\n", file=report)
+
+    print(f"Starting with $10,000:", file=report)
+    print(f"  • Expected return after 1 year: ${year1_value:,.2f} ({annual_return:+.2f}%)", file=report)
+    print(f"  • Quarterly volatility: {std_dev:.2f}%", file=report)
+    print(f"  • Positive quarters: {positive_quarters}/{len(quarterly_returns)} ({positive_quarters/len(quarterly_returns)*100:.0f}%)", file=report)
+    print(f"  • Profit factor: {profit_factor:.2f}x", file=report)
+    print(f"  • Outperformance vs S&P 500: {outperformance:+.2f}%", file=report)
+    print(file=report)
 
     if annual_return > 15:
-        print("✅ EXCELLENT: Strategy shows strong returns with acceptable risk")
+        print("✅ EXCELLENT: Strategy shows strong returns with acceptable risk", file=report)
     elif annual_return > 10:
-        print("✅ GOOD: Strategy beats market averages")
+        print("✅ GOOD: Strategy beats market averages", file=report)
     elif annual_return > 5:
-        print("⚠️  MODEST: Strategy shows positive but modest returns")
+        print("⚠️  MODEST: Strategy shows positive but modest returns", file=report)
     else:
-        print("⚠️  WEAK: Strategy needs further optimization")
+        print("⚠️  WEAK: Strategy needs further optimization", file=report)
+
+    print(file=report)
 
-    print()
+    sys.stdout.write(report.getvalue())
 
 
 if __name__ == "__main__":
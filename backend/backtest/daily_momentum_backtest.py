@@ -12,18 +12,32 @@ This is the Minervini/O'Neil approach that actually works.
 Author: Claude AI + Tanam Bam Sinha
 """
 
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from typing import List, Dict, Optional, Set, Tuple
 from dataclasses import dataclass, field
+import heapq
 import logging
+import os
 import sys
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
 # Add backend directory to path
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
 from scanner.long.daily_breakout_scanner import DailyBreakoutScanner, DailyBreakoutCandidate
+from backtest._backtester import ParameterSweepMixin, ScanCacheMixin
+from backtest._calendar import epoch as _epoch, trading_days
+from backtest._compat import with_slots
+from backtest._kernels import EXIT_HOLD, EXIT_STOP, EXIT_TARGET, EXIT_TIME, scan_exits
 from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame
@@ -31,6 +45,7 @@ from alpaca.data.timeframe import TimeFrame
 logger = logging.getLogger(__name__)
 
 
+@with_slots
 @dataclass
 class DailyPosition:
     """A swing trade position held for multiple days."""
@@ -66,6 +81,7 @@ class DailyPosition:
         return (end_date - self.entry_date).days
 
 
+@with_slots
 @dataclass
 class DailyBacktestResults:
     """Results from daily momentum backtest."""
@@ -88,8 +104,11 @@ class DailyBacktestResults:
     equity_curve: List[float] = field(default_factory=list)
     daily_pnl: List[Dict] = field(default_factory=list)
 
+    # Same trades as one column per field (set by backtesters that build it)
+    trades_frame: Optional[pd.DataFrame] = None
+
 
-class DailyMomentumBacktester:
+class DailyMomentumBacktester(ScanCacheMixin, ParameterSweepMixin):
     """
     Backtester for daily breakout strategy.
 
@@ -101,10 +120,22 @@ class DailyMomentumBacktester:
     - Max 3 positions at once
     """
 
-    def __init__(self, api_key: str, secret_key: str, starting_capital: float = 100000):
+    def __init__(
+        self,
+        api_key: str,
+        secret_key: str,
+        starting_capital: float = 100000,
+        bar_cache_dir: str = "./data/cache/bars",
+        scan_cache_dir: str = "./data/cache/scans"
+    ):
         self.scanner = DailyBreakoutScanner(api_key, secret_key)
         self.data_client = StockHistoricalDataClient(api_key, secret_key)
 
+        # Daily bars persisted across runs, one parquet file per symbol
+        self.bar_cache_dir = Path(bar_cache_dir)
+        # Scanner results persisted across runs, one JSON file per day
+        self.scan_cache_dir = Path(scan_cache_dir)
+
         # Capital
         self.starting_capital = starting_capital
         self.capital = starting_capital
@@ -119,16 +150,51 @@ class DailyMomentumBacktester:
         # Tracking
         self.positions: List[DailyPosition] = []
         self.closed_trades: List[DailyPosition] = []
-        self.equity_curve = [starting_capital]
+
+        # Exit levels of open positions as arrays (same order as self.positions)
+        # so the daily exit check is a few vectorized comparisons
+        self._pos_stop = np.empty(0, dtype=np.float64)
+        self._pos_target = np.empty(0, dtype=np.float64)
+        self._pos_entry = np.empty(0, dtype='datetime64[us]')
+        # Symbols of open positions, kept in step with self.positions
+        self._held_symbols: Set[str] = set()
+
+        # Daily equity, written in place; sized for the trading days once run() knows them
+        self._equity_buf = np.full(1, starting_capital, dtype=np.float64)
+        self._equity_idx = 1
         self.peak_capital = starting_capital
 
-    def run(self, start_date: datetime, end_date: datetime) -> DailyBacktestResults:
+        # Daily bar history per symbol, fetched once per backtest:
+        # symbol -> (bar timestamps as epoch seconds, closes), both sorted by time
+        self._bar_cache: Dict[str, Tuple[List[float], List[float]]] = {}
+        # Resolved closes, (symbol, date) -> price; historical prices never change
+        self._price_cache: Dict[Tuple[str, datetime], Optional[float]] = {}
+        # Scanner results per day, date ordinal -> candidates (scans are deterministic per date)
+        self._scan_cache: Dict[int, List[DailyBreakoutCandidate]] = {}
+        self._scan_dir: Optional[Path] = None
+        self._backtest_start: Optional[datetime] = None
+        self._backtest_end: Optional[datetime] = None
+
+    # Settings a parameter sweep may override
+    TUNABLE_PARAMETERS = (
+        'stop_loss_percent',
+        'profit_target_percent',
+        'max_hold_days',
+        'max_positions',
+        'position_size_percent',
+    )
+    # Market data shared by the backtests of a sweep worker (none of it depends on the settings)
+    SHARED_CACHES = ('_bar_cache', '_price_cache', '_scan_cache')
+
+    def run(self, start_date: datetime, end_date: datetime, include_trade_list: bool = True) -> DailyBacktestResults:
         """
         Run backtest over date range.
 
         Args:
             start_date: Start of backtest
             end_date: End of backtest
+            include_trade_list: Build the per-trade list in the results (skip it
+                                when only the summary statistics are needed)
 
         Returns:
             DailyBacktestResults with all metrics
@@ -141,11 +207,22 @@ class DailyMomentumBacktester:
         logger.info(f"Strategy: Daily breakouts, 8% stops, 20% targets")
         logger.info(f"{'='*80}\n")
 
+        self._backtest_start = start_date
+        self._backtest_end = end_date
+
         # Get all trading days
         trading_days = self._get_trading_days(start_date, end_date)
 
         logger.info(f"Found {len(trading_days)} trading days to test\n")
 
+        # Starting capital plus one equity point per trading day
+        self._equity_buf = np.empty(len(trading_days) + 1, dtype=np.float64)
+        self._equity_buf[0] = self.starting_capital
+        self._equity_idx = 1
+
+        # Scans saved by earlier runs over the same days
+        self._load_scan_cache(trading_days)
+
         # Run day by day
         for current_date in trading_days:
             self._process_trading_day(current_date)
@@ -157,91 +234,131 @@ class DailyMomentumBacktester:
                 self._close_position(pos, end_date, "END_OF_TEST")
 
         # Calculate results
-        return self._calculate_results()
+        return self._calculate_results(include_trade_list)
+
+    @property
+    def equity_curve(self) -> np.ndarray:
+        """Equity recorded so far (a view of the preallocated buffer)."""
+        return self._equity_buf[:self._equity_idx]
 
     def _process_trading_day(self, date: datetime):
         """Process a single trading day."""
-        logger.info(f"\n{'='*80}")
-        logger.info(f"DAY: {date.strftime('%Y-%m-%d (%A)')}")
-        logger.info(f"Capital: ${self.capital:,.2f} | Positions: {len(self.positions)}")
-        logger.info(f"{'='*80}")
+        # Per-day logging is only formatted when INFO is on (sweeps run at WARNING)
+        log_info = logger.isEnabledFor(logging.INFO)
+
+        if log_info:
+            logger.info(f"\n{'='*80}")
+            logger.info(f"DAY: {date.strftime('%Y-%m-%d (%A)')}")
+            logger.info(f"Capital: ${self.capital:,.2f} | Positions: {len(self.positions)}")
+            logger.info(f"{'='*80}")
+
+        # Today's close per held symbol, shared by the exit check, equity and summary
+        day_prices = {p.symbol: self._get_current_price(p.symbol, date) for p in self.positions}
 
         # 1. Check existing positions for exits
-        self._check_exits(date)
+        self._check_exits(date, day_prices)
 
         # 2. Scan for new opportunities
         if len(self.positions) < self.max_positions:
             self._scan_and_enter(date)
+            for pos in self.positions:
+                if pos.symbol not in day_prices:
+                    day_prices[pos.symbol] = self._get_current_price(pos.symbol, date)
 
         # 3. Update equity curve
-        current_equity = self._calculate_current_equity(date)
-        self.equity_curve.append(current_equity)
+        current_equity = self._calculate_current_equity(date, day_prices)
+        self._equity_buf[self._equity_idx] = current_equity
+        self._equity_idx += 1
 
         # Log daily summary
-        day_pnl = current_equity - self.equity_curve[-2] if len(self.equity_curve) > 1 else 0
-        logger.info(f"\nDay Summary:")
-        logger.info(f"  Equity: ${current_equity:,.2f} ({day_pnl:+,.2f})")
-        logger.info(f"  Positions: {len(self.positions)}")
-        if self.positions:
+        if log_info:
+            day_pnl = current_equity - self._equity_buf[self._equity_idx - 2]
+            logger.info(f"\nDay Summary:")
+            logger.info(f"  Equity: ${current_equity:,.2f} ({day_pnl:+,.2f})")
+            logger.info(f"  Positions: {len(self.positions)}")
             for pos in self.positions:
-                unrealized = pos.unrealized_pnl(self._get_current_price(pos.symbol, date))
+                unrealized = pos.unrealized_pnl(day_prices[pos.symbol])
                 logger.info(f"    {pos.symbol}: ${pos.entry_price:.2f} → {unrealized:+,.0f} ({pos.hold_days(date)} days)")
 
-    def _check_exits(self, date: datetime):
-        """Check if any positions should be closed."""
-        for position in list(self.positions):
-            # Get current price
-            current_price = self._get_current_price(position.symbol, date)
-            if current_price is None:
-                continue
+    def _check_exits(self, date: datetime, day_prices: Dict[str, Optional[float]]):
+        """Check if any positions should be closed at today's prices."""
+        if not self.positions:
+            return
 
-            # Check stop loss
-            if current_price <= position.stop_loss:
-                logger.info(f"  🛑 {position.symbol}: Stop hit at ${current_price:.2f} (stop: ${position.stop_loss:.2f})")
-                self._close_position(position, date, "STOP", current_price)
-                continue
+        # Missing prices become NaN, which fails every exit comparison
+        prices = np.array([day_prices[p.symbol] for p in self.positions], dtype=np.float64)
+        reasons = scan_exits(
+            prices, self._pos_stop, self._pos_target, self._pos_entry,
+            np.datetime64(date, 'us'), self.max_hold_days
+        )
 
-            # Check profit target
-            if current_price >= position.profit_target:
-                logger.info(f"  🎯 {position.symbol}: Target hit at ${current_price:.2f} (target: ${position.profit_target:.2f})")
-                self._close_position(position, date, "TARGET", current_price)
+        # Close in position order; every close shifts the later positions down one
+        closed = 0
+        for i, (position, price, reason) in enumerate(zip(list(self.positions), prices.tolist(), reasons.tolist())):
+            if reason == EXIT_HOLD:
                 continue
 
-            # Check time stop
-            if position.hold_days(date) >= self.max_hold_days:
-                logger.info(f"  ⏰ {position.symbol}: Time stop at ${current_price:.2f} (held {self.max_hold_days} days)")
-                self._close_position(position, date, "TIME", current_price)
-                continue
+            if reason == EXIT_STOP:
+                logger.info("  🛑 %s: Stop hit at $%.2f (stop: $%.2f)", position.symbol, price, position.stop_loss)
+                self._close_position(position, date, "STOP", price, index=i - closed)
+            elif reason == EXIT_TARGET:
+                logger.info("  🎯 %s: Target hit at $%.2f (target: $%.2f)", position.symbol, price, position.profit_target)
+                self._close_position(position, date, "TARGET", price, index=i - closed)
+            elif reason == EXIT_TIME:
+                logger.info("  ⏰ %s: Time stop at $%.2f (held %s days)", position.symbol, price, self.max_hold_days)
+                self._close_position(position, date, "TIME", price, index=i - closed)
+            closed += 1
+
+    def _add_position(self, position: DailyPosition):
+        """Open a position, keeping the held-symbol set and exit-level arrays in step."""
+        self.positions.append(position)
+        self._held_symbols.add(position.symbol)
+        self._pos_stop = np.append(self._pos_stop, position.stop_loss)
+        self._pos_target = np.append(self._pos_target, position.profit_target)
+        self._pos_entry = np.append(self._pos_entry, np.datetime64(position.entry_date, 'us'))
+
+    def _remove_position(self, i: int):
+        """Drop the i-th open position from the list, held-symbol set and exit-level arrays."""
+        self._held_symbols.discard(self.positions[i].symbol)
+        del self.positions[i]
+        self._pos_stop = np.delete(self._pos_stop, i)
+        self._pos_target = np.delete(self._pos_target, i)
+        self._pos_entry = np.delete(self._pos_entry, i)
 
     def _scan_and_enter(self, date: datetime):
         """Scan for breakouts and enter new positions."""
         # Scan for candidates
-        candidates = self.scanner.scan(date)
+        candidates = self._scan(date)
 
         if not candidates:
             logger.info("  No breakout candidates found")
             return
 
-        # Filter out symbols we're already holding
-        held_symbols = {pos.symbol for pos in self.positions}
-        candidates = [c for c in candidates if c.symbol not in held_symbols]
+        # Take the best-scoring candidates we're not already holding. Ranked
+        # here rather than trusting the scanner's order; ties keep scanner order.
+        # Each candidate is scored once and the score kept for the log below
+        slots_available = self.max_positions - len(self.positions)
+        top_candidates = heapq.nlargest(
+            slots_available,
+            ((c.score(), c) for c in candidates if c.symbol not in self._held_symbols),
+            key=itemgetter(0)
+        )
 
-        if not candidates:
+        if not top_candidates:
             logger.info("  All candidates already held")
             return
 
-        # Take best candidates (sorted by score)
-        slots_available = self.max_positions - len(self.positions)
-        top_candidates = candidates[:slots_available]
+        # One history request for every new symbol we may enter
+        self._prefetch_bars([c.symbol for _, c in top_candidates])
 
-        for candidate in top_candidates:
+        for score, candidate in top_candidates:
             # Enter position
             entry_price = candidate.close  # Buy at close (or next open)
             position_value = self.capital * self.position_size_percent
             shares = int(position_value / entry_price)
 
             if shares == 0:
-                logger.info(f"  ⚠️  {candidate.symbol}: Insufficient capital for 1 share")
+                logger.info("  ⚠️  %s: Insufficient capital for 1 share", candidate.symbol)
                 continue
 
             # Create position
@@ -254,17 +371,30 @@ class DailyMomentumBacktester:
                 profit_target=entry_price * (1 + self.profit_target_percent)
             )
 
-            self.positions.append(position)
+            self._add_position(position)
 
             # Reduce available capital
             self.capital -= shares * entry_price
 
-            logger.info(f"  ✅ ENTER {candidate.symbol}: {shares} shares @ ${entry_price:.2f}")
-            logger.info(f"     Stop: ${position.stop_loss:.2f} | Target: ${position.profit_target:.2f}")
-            logger.info(f"     Score: {candidate.score():.1f}/10 | Risk: ${shares * entry_price * self.stop_loss_percent:,.0f}")
+            logger.info("  ✅ ENTER %s: %d shares @ $%.2f", candidate.symbol, shares, entry_price)
+            logger.info("     Stop: $%.2f | Target: $%.2f", position.stop_loss, position.profit_target)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"     Score: {score:.1f}/10 | Risk: ${shares * entry_price * self.stop_loss_percent:,.0f}")
+
+    def _close_position(
+        self,
+        position: DailyPosition,
+        date: datetime,
+        reason: str,
+        price: Optional[float] = None,
+        index: Optional[int] = None
+    ):
+        """
+        Close a position.
 
-    def _close_position(self, position: DailyPosition, date: datetime, reason: str, price: Optional[float] = None):
-        """Close a position."""
+        Callers that know the position's index in self.positions pass it,
+        which saves searching the open positions for it.
+        """
         exit_price = price or self._get_current_price(position.symbol, date)
 
         if exit_price is None:
@@ -275,108 +405,236 @@ class DailyMomentumBacktester:
         position.exit_price = exit_price
         position.exit_reason = reason
 
-        # Calculate P&L
-        pnl = position.realized_pnl()
-        pnl_pct = (pnl / (position.entry_price * position.shares)) * 100
-
         # Return capital
         self.capital += position.shares * exit_price
 
         # Move to closed trades
-        self.positions.remove(position)
+        self._remove_position(self.positions.index(position) if index is None else index)
         self.closed_trades.append(position)
 
-        emoji = "✅" if pnl > 0 else "❌"
-        logger.info(f"  {emoji} CLOSE {position.symbol}: ${exit_price:.2f} | P&L: {pnl:+,.0f} ({pnl_pct:+.1f}%) | {reason}")
+        if logger.isEnabledFor(logging.INFO):
+            pnl = position.realized_pnl()
+            pnl_pct = (pnl / (position.entry_price * position.shares)) * 100
+            emoji = "✅" if pnl > 0 else "❌"
+            logger.info(f"  {emoji} CLOSE {position.symbol}: ${exit_price:.2f} | P&L: {pnl:+,.0f} ({pnl_pct:+.1f}%) | {reason}")
 
-    def _get_current_price(self, symbol: str, date: datetime) -> Optional[float]:
-        """Get close price for symbol on given date."""
+    def _prefetch_bars(self, symbols: List[str]):
+        """
+        Fetch the whole backtest's daily bars for symbols not seen yet.
+
+        Prices for the rest of the backtest are then lookups instead of an
+        Alpaca call per symbol per day. Several new symbols are fetched
+        concurrently (the requests are I/O bound), one request per symbol so
+        a bad symbol doesn't lose the others.
+        """
+        missing = [s for s in dict.fromkeys(symbols) if s not in self._bar_cache]
+        if not missing:
+            return
+
+        if len(missing) == 1:
+            histories = [self._fetch_bar_history(missing[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(16, len(missing))) as executor:
+                histories = list(executor.map(self._fetch_bar_history, missing))
+
+        for symbol, history in zip(missing, histories):
+            if history is not None:
+                self._bar_cache[symbol] = history
+
+    def _history_start(self, start_date: datetime) -> datetime:
+        """Earliest bar time fetched for a backtest from start_date: room for the 5-day holiday lookback."""
+        return start_date - timedelta(days=10)
+
+    def _bar_rows(self) -> Dict[str, Tuple[List[float], List[float]]]:
+        """Stored bars per symbol as the (times, closes) rows _store_bars takes."""
+        return dict(self._bar_cache)
+
+    def _store_bars(self, symbol: str, times: np.ndarray, closes: np.ndarray):
+        """Keep a symbol's bar times and closes."""
+        self._bar_cache[symbol] = (times.tolist(), closes.tolist())
+
+    def _fetch_bar_history(self, symbol: str) -> Optional[Tuple[List[float], List[float]]]:
+        """
+        Daily bar (timestamps, closes) for the backtest range, or None on error.
+
+        Read from the symbol's parquet file when it covers the range. On a
+        miss, bars for the union of the cached and requested ranges are
+        downloaded so the file always holds one contiguous span.
+        """
+        range_start = _epoch(self._history_start(self._backtest_start))
+        range_end = _epoch(self._backtest_end)
+        start, end = range_start, range_end
+
+        cached = self._read_bar_file(symbol)
+        if cached is not None and cached[1] <= start and end <= cached[2]:
+            bars = cached[0]
+        else:
+            if cached is not None:
+                start, end = min(start, cached[1]), max(end, cached[2])
+            bars = self._download_bars(symbol, start, end)
+            if bars is None:
+                return None
+
+            # Only persist settled history - today's bar may still change
+            today = _epoch(datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0))
+            if end <= today:
+                self._write_bar_file(symbol, bars, start, end)
+
+        times = (bars['timestamp'] - pd.Timestamp(0, tz='UTC')) / pd.Timedelta(seconds=1)
+        in_range = ((times >= range_start) & (times <= range_end)).to_numpy()
+
+        return times[in_range].tolist(), bars['close'][in_range].tolist()
+
+    def _download_bars(self, symbol: str, start: float, end: float) -> Optional[pd.DataFrame]:
+        """Download daily bars between two epoch times (inclusive) from Alpaca."""
         try:
-            start = date - timedelta(days=5)  # Look back a few days in case of holidays
             request = StockBarsRequest(
                 symbol_or_symbols=[symbol],
                 timeframe=TimeFrame.Day,
-                start=start,
-                end=date
+                start=datetime.fromtimestamp(start, timezone.utc),
+                end=datetime.fromtimestamp(end, timezone.utc)
             )
             bars_response = self.data_client.get_stock_bars(request)
-
-            if symbol in bars_response.data and bars_response.data[symbol]:
-                bars = list(bars_response.data[symbol])
-                # Get most recent bar (should be scan_date)
-                return float(bars[-1].close)
         except Exception as e:
-            logger.warning(f"Error getting price for {symbol} on {date}: {e}")
+            logger.warning(f"Error getting bars for {symbol}: {e}")
+            return None
+
+        bars = list(bars_response.data[symbol]) if symbol in bars_response.data else []
+        return pd.DataFrame({
+            'timestamp': pd.to_datetime([bar.timestamp for bar in bars], utc=True),
+            'close': [float(bar.close) for bar in bars],
+        })
+
+    def _bar_file(self, symbol: str) -> Path:
+        """Parquet file holding a symbol's daily bars."""
+        return self.bar_cache_dir / f"{symbol}_1Day.parquet"
 
-        return None
+    def _read_bar_file(self, symbol: str) -> Optional[Tuple[pd.DataFrame, float, float]]:
+        """Cached bars plus the (start, end) epoch range they cover, or None."""
+        bar_file = self._bar_file(symbol)
+        if not bar_file.exists():
+            return None
 
-    def _calculate_current_equity(self, date: datetime) -> float:
-        """Calculate total equity (cash + positions)."""
+        try:
+            table = pq.read_table(bar_file)
+            metadata = table.schema.metadata
+            return (
+                table.to_pandas(),
+                float(metadata[b'covered_start']),
+                float(metadata[b'covered_end'])
+            )
+        except Exception:
+            # Cache corrupted, delete and re-download
+            bar_file.unlink(missing_ok=True)
+            return None
+
+    def _write_bar_file(self, symbol: str, bars: pd.DataFrame, start: float, end: float):
+        """Save bars with the range they cover (replaced atomically for parallel runs)."""
+        try:
+            self.bar_cache_dir.mkdir(parents=True, exist_ok=True)
+
+            table = pa.Table.from_pandas(bars, preserve_index=False)
+            table = table.replace_schema_metadata({
+                **(table.schema.metadata or {}),
+                b'covered_start': repr(start).encode(),
+                b'covered_end': repr(end).encode(),
+            })
+
+            bar_file = self._bar_file(symbol)
+            tmp_file = bar_file.with_name(f"{bar_file.name}.{os.getpid()}.tmp")
+            pq.write_table(table, tmp_file)
+            os.replace(tmp_file, bar_file)
+        except Exception:
+            # Failed to cache, but we still have the bars
+            pass
+
+    def _get_current_price(self, symbol: str, date: datetime) -> Optional[float]:
+        """
+        Get close price for symbol on given date.
+
+        Returns the close of the most recent bar at or before `date`, looking
+        back up to 5 days in case of holidays (the same window the old
+        per-day request used).
+        """
+        key = (symbol, date)
+        if key in self._price_cache:
+            return self._price_cache[key]
+
+        if symbol not in self._bar_cache:
+            self._prefetch_bars([symbol])
+            if symbol not in self._bar_cache:
+                # Fetch failed - don't cache, try again next time
+                return None
+
+        times, closes = self._bar_cache[symbol]
+
+        # Index of the last bar at or before `date`
+        i = bisect_right(times, _epoch(date)) - 1
+        if i < 0 or times[i] < _epoch(date - timedelta(days=5)):
+            price = None
+        else:
+            price = closes[i]
+
+        self._price_cache[key] = price
+        return price
+
+    def _calculate_current_equity(self, date: datetime, day_prices: Dict[str, Optional[float]]) -> float:
+        """Calculate total equity (cash + positions) at today's prices."""
         equity = self.capital
 
         for position in self.positions:
-            current_price = self._get_current_price(position.symbol, date)
+            current_price = day_prices[position.symbol]
             if current_price:
                 equity += position.position_value(current_price)
 
         return equity
 
     def _get_trading_days(self, start: datetime, end: datetime) -> List[datetime]:
-        """Get list of trading days (weekdays, no holidays for now)."""
-        days = []
-        current = start
+        """Get list of trading days (weekdays, excluding NYSE holidays)."""
+        return trading_days(start, end)
 
-        while current <= end:
-            if current.weekday() < 5:  # Monday-Friday
-                days.append(current)
-            current += timedelta(days=1)
-
-        return days
-
-    def _calculate_results(self) -> DailyBacktestResults:
-        """Calculate final backtest results."""
+    def _calculate_results(self, include_trade_list: bool = True) -> DailyBacktestResults:
+        """Calculate final backtest results (trade list left empty unless include_trade_list)."""
         ending_capital = self.capital
         total_return = ending_capital - self.starting_capital
         total_return_pct = (total_return / self.starting_capital) * 100
 
-        # Trade statistics
-        winners = [t for t in self.closed_trades if t.realized_pnl() > 0]
-        losers = [t for t in self.closed_trades if t.realized_pnl() < 0]
+        # Trade statistics - one P&L array, masks instead of a scan per statistic
+        pnls = np.fromiter((t.realized_pnl() for t in self.closed_trades), dtype=np.float64,
+                           count=len(self.closed_trades))
+        win_pnls = pnls[pnls > 0]
+        loss_pnls = pnls[pnls < 0]
 
-        win_rate = (len(winners) / len(self.closed_trades) * 100) if self.closed_trades else 0
-        avg_win = (sum(t.realized_pnl() for t in winners) / len(winners)) if winners else 0
-        avg_loss = (sum(t.realized_pnl() for t in losers) / len(losers)) if losers else 0
+        win_rate = (len(win_pnls) / len(pnls) * 100) if len(pnls) else 0
+        avg_win = win_pnls.mean() if len(win_pnls) else 0
+        avg_loss = loss_pnls.mean() if len(loss_pnls) else 0
 
         # Profit factor
-        total_wins = sum(t.realized_pnl() for t in winners)
-        total_losses = abs(sum(t.realized_pnl() for t in losers))
+        total_wins = win_pnls.sum()
+        total_losses = abs(loss_pnls.sum())
         profit_factor = (total_wins / total_losses) if total_losses > 0 else 0
 
-        # Max drawdown
-        peak = self.starting_capital
-        max_dd = 0
-        for equity in self.equity_curve:
-            if equity > peak:
-                peak = equity
-            dd = ((peak - equity) / peak) * 100
-            if dd > max_dd:
-                max_dd = dd
+        # Max drawdown (running peak starts at the starting capital)
+        equity = self.equity_curve
+        peaks = np.maximum(np.maximum.accumulate(equity), self.starting_capital)
+        max_dd = max(0.0, (((peaks - equity) / peaks) * 100).max())
 
         # Trade list
         trades = []
-        for t in self.closed_trades:
-            trades.append({
-                'symbol': t.symbol,
-                'entry_date': t.entry_date.strftime('%Y-%m-%d'),
-                'exit_date': t.exit_date.strftime('%Y-%m-%d') if t.exit_date else None,
-                'entry_price': float(t.entry_price),
-                'exit_price': float(t.exit_price) if t.exit_price else None,
-                'shares': t.shares,
-                'pnl': float(t.realized_pnl()),
-                'pnl_pct': float((t.realized_pnl() / (t.entry_price * t.shares)) * 100),
-                'hold_days': t.hold_days(t.exit_date) if t.exit_date else 0,
-                'exit_reason': t.exit_reason
-            })
+        if include_trade_list:
+            for t, pnl in zip(self.closed_trades, pnls):
+                trades.append({
+                    'symbol': t.symbol,
+                    'entry_date': t.entry_date.strftime('%Y-%m-%d'),
+                    'exit_date': t.exit_date.strftime('%Y-%m-%d') if t.exit_date else None,
+                    'entry_price': float(t.entry_price),
+                    'exit_price': float(t.exit_price) if t.exit_price else None,
+                    'shares': t.shares,
+                    'pnl': float(pnl),
+                    'pnl_pct': float((pnl / (t.entry_price * t.shares)) * 100),
+                    'hold_days': t.hold_days(t.exit_date) if t.exit_date else 0,
+                    'exit_reason': t.exit_reason
+                })
 
         return DailyBacktestResults(
             starting_capital=self.starting_capital,
@@ -384,15 +642,15 @@ class DailyMomentumBacktester:
             total_return=total_return,
             total_return_percent=total_return_pct,
             total_trades=len(self.closed_trades),
-            winning_trades=len(winners),
-            losing_trades=len(losers),
+            winning_trades=len(win_pnls),
+            losing_trades=len(loss_pnls),
             win_rate=win_rate,
             avg_win=avg_win,
             avg_loss=avg_loss,
             profit_factor=profit_factor,
             max_drawdown_percent=max_dd,
             trades=trades,
-            equity_curve=self.equity_curve
+            equity_curve=equity.tolist()
         )
 
 
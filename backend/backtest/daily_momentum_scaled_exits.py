@@ -16,25 +16,45 @@ This approach:
 Author: Claude AI + Tanam Bam Sinha
 """
 
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, field
 import logging
 import sys
 from pathlib import Path
 
+import numpy as np
+
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from scanner.long.daily_breakout_scanner import DailyBreakoutScanner
+from scanner.long.daily_breakout_scanner import DailyBreakoutScanner, DailyBreakoutCandidate
 from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame
 from data.cache import CachedDataClient
+from backtest._backtester import ParameterSweepMixin, ScanCacheMixin
+from backtest._calendar import calendar_span, epoch, trading_days
+from backtest._compat import with_slots
+from backtest._kernels import (
+    EXIT_MA_BREAK, EXIT_STOP, EXIT_TIME, EXIT_TRAIL,
+    average_true_range, rolling_mean, scaled_exit_signals
+)
 
 logger = logging.getLogger(__name__)
 
+# One record per (partial) exit of a ScaledPosition
+PARTIAL_EXIT_DTYPE = np.dtype([
+    ('date', 'datetime64[us]'),
+    ('price', np.float64),
+    ('shares', np.int64),
+    ('profit', np.float64),
+    ('reason', 'U32'),
+])
+
 
+@with_slots
 @dataclass
 class ScaledPosition:
     """Position with scaled exit tracking."""
@@ -50,8 +70,8 @@ class ScaledPosition:
     scaled_50_pct: bool = False  # Hit +15%
     scaled_75_pct: bool = False  # Hit +25%
 
-    # Partial exit tracking
-    partial_exits: List[Dict] = field(default_factory=list)
+    # Partial exit tracking (PARTIAL_EXIT_DTYPE records, in exit order)
+    exits: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=PARTIAL_EXIT_DTYPE))
 
     # Smart exit tracking (for final 25%) - close-based, no lookahead
     highest_close: float = 0.0  # Track highest CLOSE, not intraday high
@@ -70,18 +90,14 @@ class ScaledPosition:
         """Unrealized P&L on remaining shares."""
         return (current_price - self.entry_price) * self.current_shares
 
-    def realized_pnl(self) -> float:
-        """Total realized P&L from all exits."""
-        total = 0.0
-        for exit_info in self.partial_exits:
-            total += (exit_info['price'] - self.entry_price) * exit_info['shares']
-
-        # Add final exit if closed
-        if self.final_exit_price and self.current_shares == 0:
-            # Already included in partial_exits
-            pass
+    @property
+    def partial_exits(self) -> List[Dict]:
+        """Exits as dicts with date, price, shares, profit and reason keys."""
+        return [dict(zip(PARTIAL_EXIT_DTYPE.names, record)) for record in self.exits.tolist()]
 
-        return total
+    def realized_pnl(self) -> float:
+        """Total realized P&L from all exits (the final exit is one of them)."""
+        return float(self.exits['profit'].sum())
 
     def total_pnl(self, current_price: float) -> float:
         """Total P&L (realized + unrealized)."""
@@ -96,7 +112,7 @@ class ScaledPosition:
         return ((current_price - self.entry_price) / self.entry_price) * 100
 
 
-class ScaledExitBacktester:
+class ScaledExitBacktester(ScanCacheMixin, ParameterSweepMixin):
     """
     Backtester with scaled exits + trailing runner.
 
@@ -113,8 +129,10 @@ class ScaledExitBacktester:
     - Time stop: 20 days (longer than before since we scaled out)
     """
 
-    def __init__(self, api_key: str, secret_key: str, starting_capital: float = 100000, use_cache: bool = True, cache_dir: str = './cache_scaled_exits'):
+    def __init__(self, api_key: str, secret_key: str, starting_capital: float = 100000, use_cache: bool = True, cache_dir: str = './cache_scaled_exits',
+                 scan_cache_dir: str = './data/cache/scans'):
         self.scanner = DailyBreakoutScanner(api_key, secret_key)
+        self.scan_cache_dir = Path(scan_cache_dir)
 
         # Use cached client for fast iteration
         if use_cache:
@@ -131,30 +149,100 @@ class ScaledExitBacktester:
         self.stop_loss_percent = 0.08  # 8% hard stop
         self.max_positions = 3
         self.position_size_percent = 0.30
+        self.atr_period = 10  # Trailing stop ATR
 
         # Scaling levels
         self.scale_1_pct = 8.0   # First 25% out at +8%
         self.scale_2_pct = 15.0  # Second 25% out at +15%
         self.scale_3_pct = 25.0  # Third 25% out at +25%
 
+        # Time stop on remaining shares (longer than before since we scaled out)
+        self.time_stop_days = 20
+
         # Tracking
         self.positions: List[ScaledPosition] = []
         self.closed_trades: List[ScaledPosition] = []
-        self.equity_curve = [starting_capital]
+        # Today's close per open symbol, filled by the exit check for the equity update
+        self._todays_close: Dict[str, float] = {}
+
+        # Daily equity, written in place; sized for the trading days once run() knows them
+        self._equity_buf = np.full(1, starting_capital, dtype=np.float64)
+        self._equity_idx = 1
         self.peak_capital = starting_capital
 
+        # Exit-rule state of the open positions as arrays, one row per entry of
+        # self.positions (same order) so the daily check needs no attribute reads
+        self._pos_entry_price = np.empty(0, dtype=np.float64)
+        self._pos_hard_stop = np.empty(0, dtype=np.float64)
+        self._pos_highest = np.empty(0, dtype=np.float64)
+        self._pos_trailing = np.empty(0, dtype=np.float64)
+        self._pos_scaled = np.empty((0, 3), dtype=bool)
+        self._pos_entry_day = np.empty(0, dtype=np.int64)  # Entry date as a day number (date.toordinal())
+
+        # Daily bars per symbol for the whole backtest, fetched once per symbol:
+        # symbol -> bar timestamps as epoch seconds, sorted
+        self._bar_times: Dict[str, List[float]] = {}
+        # High, low and close of every bar as float64 arrays, aligned with the times
+        self._highs: Dict[str, np.ndarray] = {}
+        self._lows: Dict[str, np.ndarray] = {}
+        self._closes: Dict[str, np.ndarray] = {}
+        # ATR and 5-day average close ending at each bar, computed once per symbol
+        self._atr: Dict[str, np.ndarray] = {}
+        self._sma_5: Dict[str, np.ndarray] = {}
+        # Scanner results per day, date ordinal -> candidates (scans are deterministic per date)
+        self._scan_cache: Dict[int, List[DailyBreakoutCandidate]] = {}
+        self._scan_dir: Optional[Path] = None
+        self._backtest_start: Optional[datetime] = None
+        self._backtest_end: Optional[datetime] = None
+
+    # Settings a parameter sweep may override
+    TUNABLE_PARAMETERS = (
+        'stop_loss_percent',
+        'max_positions',
+        'position_size_percent',
+        'atr_period',
+        'scale_1_pct',
+        'scale_2_pct',
+        'scale_3_pct',
+        'time_stop_days',
+    )
+    # Market data shared by the backtests of a sweep worker, and the settings it depends on
+    SHARED_CACHES = ('_bar_times', '_highs', '_lows', '_closes', '_atr', '_sma_5', '_scan_cache')
+    SHARED_CACHE_KEY = ('atr_period',)
+
+    def _check_settings(self):
+        """Raise ValueError unless the scale-out levels are strictly ascending."""
+        if not self.scale_1_pct < self.scale_2_pct < self.scale_3_pct:
+            raise ValueError(
+                f"Scale-out levels must be strictly ascending, got "
+                f"{self.scale_1_pct}/{self.scale_2_pct}/{self.scale_3_pct}"
+            )
+
     def run(self, start_date: datetime, end_date: datetime):
         """Run backtest with scaled exits."""
+        self._check_settings()
+
         logger.info(f"Starting scaled exit backtest: {start_date.date()} to {end_date.date()}")
         logger.info(f"Scale out: 25% @ +{self.scale_1_pct}%, 25% @ +{self.scale_2_pct}%, 25% @ +{self.scale_3_pct}%, trail final 25%")
 
-        # Get trading days only (weekdays)
+        self._backtest_start = start_date
+        self._backtest_end = end_date
+
+        # Get trading days only (weekdays, excluding NYSE holidays)
         trading_days = self._get_trading_days(start_date, end_date)
         logger.info(f"Found {len(trading_days)} trading days to test")
 
+        # Starting capital plus one equity point per trading day
+        self._equity_buf = np.empty(len(trading_days) + 1, dtype=np.float64)
+        self._equity_buf[0] = self.starting_capital
+        self._equity_idx = 1
+
+        # Scans saved by earlier runs over the same days
+        self._load_scan_cache(trading_days)
+
         for current_date in trading_days:
             # Check for new signals
-            candidates = self.scanner.scan(current_date)
+            candidates = self._scan(current_date)
 
             # Enter new positions
             for candidate in candidates:
@@ -165,26 +253,32 @@ class ScaledExitBacktester:
             self._check_scaled_exits(current_date)
 
             # Update equity
-            equity = self._calculate_equity(current_date)
-            self.equity_curve.append(equity)
+            self._equity_buf[self._equity_idx] = self._calculate_equity(current_date)
+            self._equity_idx += 1
 
         # Close any remaining positions at end (use last valid trading date)
         last_valid_date = end_date
         for pos in list(self.positions):
             # Try to get the most recent price data
-            bars = self._get_recent_bars(pos.symbol, last_valid_date, lookback=5)
-            if bars and len(bars) > 0:
-                final_price = float(bars[-1].close)
-                actual_exit_date = bars[-1].timestamp.replace(tzinfo=None) if hasattr(bars[-1].timestamp, 'replace') else bars[-1].timestamp
+            lo, hi = self._bar_window(pos.symbol, last_valid_date, lookback=5)
+            if hi > lo:
+                final_price = float(self._closes[pos.symbol][hi - 1])
+                actual_exit_date = datetime.fromtimestamp(self._bar_times[pos.symbol][hi - 1], timezone.utc).replace(tzinfo=None)
             else:
                 logger.warning(f"⚠️  No price data for {pos.symbol} at backtest end, using entry price")
                 final_price = pos.entry_price
                 actual_exit_date = last_valid_date
 
-            self._close_final_position(pos, actual_exit_date, "END_OF_BACKTEST", final_price)
+            # Closing front to back, so this one is always first
+            self._close_final_position(pos, actual_exit_date, "END_OF_BACKTEST", final_price, index=0)
 
         return self._generate_results()
 
+    @property
+    def equity_curve(self) -> np.ndarray:
+        """Equity recorded so far (a view of the preallocated buffer)."""
+        return self._equity_buf[:self._equity_idx]
+
     def _enter_position(self, candidate, date: datetime):
         """Enter a new position."""
         position_value = self.capital * self.position_size_percent
@@ -206,105 +300,165 @@ class ScaledExitBacktester:
             highest_close=candidate.close  # Start with entry as highest close
         )
 
-        self.positions.append(position)
+        self._add_position(position)
         self.capital -= (shares * candidate.close)
 
-        logger.info(f"  🟢 ENTER {candidate.symbol}: {shares} shares @ ${candidate.close:.2f} (stop: ${hard_stop:.2f})")
+        logger.info("  🟢 ENTER %s: %d shares @ $%.2f (stop: $%.2f)", candidate.symbol, shares, candidate.close, hard_stop)
+
+    def _add_position(self, position: ScaledPosition):
+        """Open a position, keeping the exit-state arrays in step."""
+        self.positions.append(position)
+        self._pos_entry_price = np.append(self._pos_entry_price, position.entry_price)
+        self._pos_hard_stop = np.append(self._pos_hard_stop, position.hard_stop)
+        self._pos_highest = np.append(self._pos_highest, position.highest_close)
+        self._pos_trailing = np.append(self._pos_trailing, position.trailing_stop)
+        self._pos_scaled = np.append(
+            self._pos_scaled,
+            [[position.scaled_25_pct, position.scaled_50_pct, position.scaled_75_pct]],
+            axis=0
+        )
+        self._pos_entry_day = np.append(self._pos_entry_day, position.entry_date.toordinal())
+
+    def _remove_position(self, i: int):
+        """Drop the i-th open position from the list and the exit-state arrays."""
+        del self.positions[i]
+        self._pos_entry_price = np.delete(self._pos_entry_price, i)
+        self._pos_hard_stop = np.delete(self._pos_hard_stop, i)
+        self._pos_highest = np.delete(self._pos_highest, i)
+        self._pos_trailing = np.delete(self._pos_trailing, i)
+        self._pos_scaled = np.delete(self._pos_scaled, i, axis=0)
+        self._pos_entry_day = np.delete(self._pos_entry_day, i)
 
     def _check_scaled_exits(self, date: datetime):
         """Check for scaled exits and smart exits on remaining shares."""
-
-        for position in list(self.positions):
-            # Get price data
-            bars = self._get_recent_bars(position.symbol, date, lookback=10)
-            if not bars or len(bars) == 0:
-                logger.warning(f"⚠️  No bars for {position.symbol} on {date.strftime('%Y-%m-%d')}, skipping exit checks")
+        # One history request for positions entered since the last check
+        self._prefetch_bars([position.symbol for position in self.positions])
+
+        # Today's bar window for every open position, then all the rules at once
+        checked = []
+        for row, position in enumerate(self.positions):
+            lo, hi = self._exit_window(position.symbol, date)
+            if hi > lo:
+                checked.append((row, lo, hi))
+
+        # Closes to value the positions at today: only bars inside the
+        # valuation's 1-day lookback window, not the exit check's ATR one
+        value_cutoff = epoch(date - timedelta(days=1 + 5))
+        symbols = [self.positions[row].symbol for row, _, _ in checked]
+        self._todays_close = {
+            symbol: float(self._closes[symbol][hi - 1])
+            for symbol, (_, _, hi) in zip(symbols, checked)
+            if self._bar_times[symbol][hi - 1] >= value_cutoff
+        }
+
+        signals = self._scaled_exit_signals(date, checked) if checked else None
+        rows = {row: i for i, (row, _, _) in enumerate(checked)}
+
+        # Apply in position order; every close shifts the later positions down one
+        closed = 0
+        for row, position in enumerate(list(self.positions)):
+            i = rows.get(row)
+            if i is None:
+                logger.warning("⚠️  No bars for %s on %s, skipping exit checks", position.symbol, date.date())
                 continue
 
-            current_bar = bars[-1]
-            current_close = float(current_bar.close)  # Use close, not high
-            current_low = float(current_bar.low)  # Still use for hard stop
-
-            profit_pct = position.profit_pct(current_close)
-
-            # SCALED EXITS (take profits incrementally) - use CLOSE prices
-            #  These are profit targets so using close is realistic
-
-            # 1. First 25% at +8%
-            if not position.scaled_25_pct and profit_pct >= self.scale_1_pct:
-                shares_to_sell = position.initial_shares // 4
-                self._partial_exit(position, date, current_close, shares_to_sell, f"SCALE_1 (+{profit_pct:.1f}%)")
-                position.scaled_25_pct = True
+            hi = checked[i][2]
+            current_close = float(self._closes[position.symbol][hi - 1])  # Use close, not high
+            if self._apply_scaled_exit(position, row - closed, date, current_close, *(values[i] for values in signals)):
+                closed += 1
+
+    def _scaled_exit_signals(self, date: datetime, checked: list):
+        """
+        Evaluate today's scale-out and exit rules for (position row, lo, hi)
+        bar windows in one pass, updating the exit-state arrays.
+        """
+        idx = np.array([row for row, _, _ in checked])
+        symbols = [self.positions[row].symbol for row, _, _ in checked]
+        closes = np.array([self._closes[symbol][hi - 1] for symbol, (_, _, hi) in zip(symbols, checked)])  # Use close, not high
+        lows = np.array([self._lows[symbol][hi - 1] for symbol, (_, _, hi) in zip(symbols, checked)])  # Still use for hard stop
+
+        # ATR for trailing stop (needs period + 1 bars in the window) and the 5-day MA
+        atrs = np.array([
+            self._atr[symbol][hi - 1] if hi - lo >= self.atr_period + 1 else 0.0
+            for symbol, (_, lo, hi) in zip(symbols, checked)
+        ])
+        sma_5 = np.array([
+            self._sma_5[symbol][hi - 1] if hi - lo >= 5 else self._closes[symbol][hi - 1]
+            for symbol, (_, lo, hi) in zip(symbols, checked)
+        ])
 
-            # 2. Second 25% at +15%
-            if position.scaled_25_pct and not position.scaled_50_pct and profit_pct >= self.scale_2_pct:
-                shares_to_sell = position.initial_shares // 4
-                self._partial_exit(position, date, current_close, shares_to_sell, f"SCALE_2 (+{profit_pct:.1f}%)")
-                position.scaled_50_pct = True
+        profit_pct, sells, highest, trailing, reasons = scaled_exit_signals(
+            closes, lows, atrs, sma_5,
+            entry_price=self._pos_entry_price[idx],
+            hard_stop=self._pos_hard_stop[idx],
+            highest_close=self._pos_highest[idx],
+            trailing_stop=self._pos_trailing[idx],
+            scaled=self._pos_scaled[idx],
+            hold_days=date.toordinal() - self._pos_entry_day[idx],  # Calendar days; entries and checks share a time of day
+            scale_levels=(self.scale_1_pct, self.scale_2_pct, self.scale_3_pct),
+            max_hold=self.time_stop_days
+        )
 
-            # 3. Third 25% at +25%
-            if position.scaled_50_pct and not position.scaled_75_pct and profit_pct >= self.scale_3_pct:
+        # Carry the state into tomorrow (rows of positions closed today are dropped on close)
+        self._pos_scaled[idx] |= sells
+        self._pos_highest[idx] = highest
+        self._pos_trailing[idx] = trailing
+
+        return profit_pct.tolist(), sells.tolist(), highest.tolist(), trailing.tolist(), reasons.tolist()
+
+    def _apply_scaled_exit(self, position: ScaledPosition, index: int, date: datetime, current_close: float,
+                           profit_pct: float, sells: List[bool], highest_close: float,
+                           trailing_stop: float, reason: int) -> bool:
+        """
+        Carry out one position's scale-outs and exit for the day.
+
+        index is the position's place in self.positions. Returns True if the
+        position was closed.
+        """
+        # SCALED EXITS (take profits incrementally) - use CLOSE prices
+        #  These are profit targets so using close is realistic
+        for level, sell in enumerate(sells, 1):
+            if sell:
                 shares_to_sell = position.initial_shares // 4
-                self._partial_exit(position, date, current_close, shares_to_sell, f"SCALE_3 (+{profit_pct:.1f}%)")
-                position.scaled_75_pct = True
-
-            # If no shares left (shouldn't happen but defensive)
-            if position.current_shares == 0:
-                self._close_final_position(position, date, "FULLY_SCALED", current_close)
-                continue
-
-            # SMART EXITS on remaining shares (close-based, no lookahead)
-
-            # Calculate ATR for trailing stop
-            atr = self._calculate_atr(bars, period=10)
-
-            # Update highest CLOSE (not high)
-            if current_close > position.highest_close:
-                position.highest_close = current_close
-
-                # Hybrid trailing (tighter as profit grows)
-                if profit_pct >= 30:
-                    position.trailing_stop = position.highest_close * 0.95  # 5% trail
-                elif profit_pct >= 20:
-                    position.trailing_stop = position.highest_close - (atr * 1.0)  # 1x ATR
-                else:
-                    position.trailing_stop = position.highest_close - (atr * 2.0)  # 2x ATR
-
-            # Calculate 5-day MA
-            if len(bars) >= 5:
-                sma_5 = sum(float(b.close) for b in bars[-5:]) / 5
-            else:
-                sma_5 = current_close
-
-            # EXIT LOGIC (on remaining shares)
-
-            # 1. HARD STOP - use intraday low for hard stops (acceptable)
-            if current_low <= position.hard_stop:
-                logger.info(f"  🛑 {position.symbol}: Hard stop hit")
-                self._close_final_position(position, date, "HARD_STOP", position.hard_stop)
-                continue
-
-            # 2. TRAILING STOP (after scaling out at least once) - use CLOSE not low
-            if position.scaled_25_pct and position.highest_close > position.entry_price * 1.08:
-                if current_close < position.trailing_stop:  # Close breaks trail
-                    logger.info(f"  📉 {position.symbol}: Trailing stop - close ${current_close:.2f} < trail ${position.trailing_stop:.2f}")
-                    self._close_final_position(position, date, "TRAILING_STOP", current_close)
-                    continue
-
-            # 3. TREND BREAK (close below 5-day MA after scaling)
-            if position.scaled_25_pct and current_close < sma_5:
-                logger.info(f"  📊 {position.symbol}: MA break at ${current_close:.2f}")
-                self._close_final_position(position, date, "MA_BREAK", current_close)
-                continue
-
-            # 4. TIME STOP (20 days - longer since we scaled out)
-            if position.hold_days(date) >= 20:
-                logger.info(f"  ⏰ {position.symbol}: Time stop (20 days)")
-                self._close_final_position(position, date, "TIME", current_close)
-                continue
+                self._partial_exit(position, date, current_close, shares_to_sell, f"SCALE_{level} (+{profit_pct:.1f}%)")
+        position.scaled_25_pct, position.scaled_50_pct, position.scaled_75_pct = (
+            position.scaled_25_pct or sells[0],
+            position.scaled_50_pct or sells[1],
+            position.scaled_75_pct or sells[2],
+        )
 
+        # If no shares left (shouldn't happen but defensive)
+        if position.current_shares == 0:
+            self._close_final_position(position, date, "FULLY_SCALED", current_close, index=index)
+            return True
+
+        # SMART EXITS on remaining shares (close-based, no lookahead)
+        position.highest_close = highest_close
+        position.trailing_stop = trailing_stop
+
+        # EXIT LOGIC (on remaining shares)
+        if reason == EXIT_STOP:
+            # Hard stop uses the intraday low (acceptable)
+            logger.info("  🛑 %s: Hard stop hit", position.symbol)
+            self._close_final_position(position, date, "HARD_STOP", position.hard_stop, index=index)
+        elif reason == EXIT_TRAIL:
+            # Trailing stop (after scaling out at least once) - close breaks trail
+            logger.info("  📉 %s: Trailing stop - close $%.2f < trail $%.2f", position.symbol, current_close, position.trailing_stop)
+            self._close_final_position(position, date, "TRAILING_STOP", current_close, index=index)
+        elif reason == EXIT_MA_BREAK:
+            # Trend break (close below 5-day MA after scaling)
+            logger.info("  📊 %s: MA break at $%.2f", position.symbol, current_close)
+            self._close_final_position(position, date, "MA_BREAK", current_close, index=index)
+        elif reason == EXIT_TIME:
+            # Time stop (longer since we scaled out)
+            logger.info("  ⏰ %s: Time stop (%s days)", position.symbol, self.time_stop_days)
+            self._close_final_position(position, date, "TIME", current_close, index=index)
+        else:
             # Update for next day
             position.prev_close = current_close
+            return False
+
+        return True
 
     def _partial_exit(self, position: ScaledPosition, date: datetime, price: float, shares: int, reason: str):
         """Partially exit position (scale out)."""
@@ -315,22 +469,25 @@ class ScaledExitBacktester:
         self.capital += exit_value
 
         profit = (price - position.entry_price) * shares
-        profit_pct = ((price - position.entry_price) / position.entry_price) * 100
 
-        position.partial_exits.append({
-            'date': date,
-            'price': price,
-            'shares': shares,
-            'profit': profit,
-            'reason': reason
-        })
+        position.exits = np.append(
+            position.exits,
+            np.array([(date, price, shares, profit, reason)], dtype=PARTIAL_EXIT_DTYPE)
+        )
 
         position.current_shares -= shares
 
-        logger.info(f"    💰 {position.symbol}: Sold {shares} shares @ ${price:.2f} ({reason}, +${profit:,.0f})")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"    💰 {position.symbol}: Sold {shares} shares @ ${price:.2f} ({reason}, +${profit:,.0f})")
 
-    def _close_final_position(self, position: ScaledPosition, date: datetime, reason: str, price: float):
-        """Close remaining shares."""
+    def _close_final_position(self, position: ScaledPosition, date: datetime, reason: str, price: float,
+                              index: Optional[int] = None):
+        """
+        Close remaining shares.
+
+        Callers that know the position's index in self.positions pass it,
+        which saves searching the open positions for it.
+        """
         if position.current_shares > 0:
             self._partial_exit(position, date, price, position.current_shares, reason)
 
@@ -338,107 +495,137 @@ class ScaledExitBacktester:
         position.final_exit_price = price
         position.final_exit_reason = reason
 
-        total_profit = position.realized_pnl()
-        total_pct = (total_profit / (position.entry_price * position.initial_shares)) * 100
-
-        self.positions.remove(position)
+        self._remove_position(self.positions.index(position) if index is None else index)
         self.closed_trades.append(position)
 
-        logger.info(f"  🔴 CLOSE {position.symbol}: Total P&L: +${total_profit:,.0f} ({total_pct:+.1f}%) over {position.hold_days(date)} days")
-        logger.info(f"      Exits: {len(position.partial_exits)} ({', '.join([e['reason'] for e in position.partial_exits])})")
-
-    def _calculate_atr(self, bars: list, period: int = 10) -> float:
-        """Calculate Average True Range."""
-        if len(bars) < period + 1:
-            return 0.0
-
-        true_ranges = []
-        for i in range(1, len(bars)):
-            high = float(bars[i].high)
-            low = float(bars[i].low)
-            prev_close = float(bars[i-1].close)
-
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
-
-        return sum(true_ranges[-period:]) / period if true_ranges else 0.0
+        # The trade summary is only worked out when it will be logged
+        if logger.isEnabledFor(logging.INFO):
+            total_profit = position.realized_pnl()
+            total_pct = (total_profit / (position.entry_price * position.initial_shares)) * 100
+            logger.info(f"  🔴 CLOSE {position.symbol}: Total P&L: +${total_profit:,.0f} ({total_pct:+.1f}%) over {position.hold_days(date)} days")
+            logger.info(f"      Exits: {len(position.exits)} ({', '.join(position.exits['reason'].tolist())})")
+
+    def _prefetch_bars(self, symbols: List[str]):
+        """
+        Fetch the whole backtest's daily bars for symbols not seen yet.
+
+        All new symbols go in one request; after that every lookback window
+        is a slice of the stored bars instead of an API call per symbol per day.
+        """
+        missing = [s for s in dict.fromkeys(symbols) if s not in self._bar_times]
+        if not missing:
+            return
 
-    def _get_recent_bars(self, symbol: str, date: datetime, lookback: int = 10):
-        """Fetch recent bars for a symbol."""
         try:
             request = StockBarsRequest(
-                symbol_or_symbols=[symbol],
+                symbol_or_symbols=missing,
                 timeframe=TimeFrame.Day,
-                start=date - timedelta(days=lookback + 5),
-                end=date
+                start=self._history_start(self._backtest_start),
+                end=self._backtest_end
             )
             bars_dict = self.data_client.get_stock_bars(request)
-            # Handle both regular and cached client responses
-            if hasattr(bars_dict, 'data'):
-                return list(bars_dict.data[symbol]) if symbol in bars_dict.data else []
-            else:
-                return list(bars_dict[symbol]) if symbol in bars_dict else []
         except Exception as e:
-            logger.warning(f"Error fetching bars for {symbol}: {e}")
-            return []
+            logger.warning(f"Error fetching bars for {', '.join(missing)}: {e}")
+            return
 
-    def _get_current_price(self, symbol: str, date: datetime) -> float:
-        """Get current closing price."""
-        bars = self._get_recent_bars(symbol, date, lookback=1)
-        return float(bars[-1].close) if bars else 0.0
+        # Handle both regular and cached client responses
+        data = bars_dict.data if hasattr(bars_dict, 'data') else bars_dict
+        for symbol in missing:
+            bars = list(data[symbol]) if symbol in data else []
+            times, highs, lows, closes = np.array(
+                [(epoch(bar.timestamp), bar.high, bar.low, bar.close) for bar in bars], dtype=np.float64
+            ).reshape(-1, 4).T.copy()
+            self._store_bars(symbol, times, highs, lows, closes)
+
+    def _history_start(self, start_date: datetime) -> datetime:
+        """
+        Earliest bar time fetched for a backtest from start_date: room for the
+        10-day lookback, or for atr_period + 1 bars before the first day (with
+        slack for holidays) when the ATR is longer.
+        """
+        days = 15
+        if self.atr_period > 10:
+            days = max(days, calendar_span(self.atr_period + 1) + 10)
+        return start_date - timedelta(days=days)
+
+    def _bar_rows(self) -> Dict[str, Tuple[List[float], np.ndarray, np.ndarray, np.ndarray]]:
+        """Stored bars per symbol as the (times, highs, lows, closes) rows _store_bars takes."""
+        return {
+            symbol: (times, self._highs[symbol], self._lows[symbol], self._closes[symbol])
+            for symbol, times in self._bar_times.items()
+        }
+
+    def _store_bars(self, symbol: str, times: np.ndarray, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray):
+        """Keep a symbol's bar arrays and compute its indicators."""
+        self._bar_times[symbol] = times.tolist()
+        self._highs[symbol] = highs
+        self._lows[symbol] = lows
+        self._closes[symbol] = closes
+        self._atr[symbol] = average_true_range(highs, lows, closes, self.atr_period)
+        self._sma_5[symbol] = np.concatenate([np.full(min(4, len(closes)), np.nan), rolling_mean(closes, 5)])
+
+    def _exit_window(self, symbol: str, date: datetime) -> Tuple[int, int]:
+        """
+        Index range [lo, hi) of the exit check's bars: the 10-day lookback window,
+        reaching back atr_period + 1 bars when the ATR is longer than that window holds.
+        """
+        lo, hi = self._bar_window(symbol, date, lookback=10)
+        if self.atr_period > 10 and hi > lo:
+            lo = min(lo, max(0, hi - (self.atr_period + 1)))
+        return lo, hi
+
+    def _bar_window(self, symbol: str, date: datetime, lookback: int = 10) -> Tuple[int, int]:
+        """Index range [lo, hi) of a symbol's bars from lookback + 5 days before date up to date."""
+        if symbol not in self._bar_times:
+            self._prefetch_bars([symbol])
+            if symbol not in self._bar_times:
+                return 0, 0
+
+        times = self._bar_times[symbol]
+        lo = bisect_left(times, epoch(date - timedelta(days=lookback + 5)))
+        hi = bisect_right(times, epoch(date))
+        return lo, hi
 
     def _calculate_equity(self, date: datetime) -> float:
-        """Calculate current equity (cash + positions)."""
+        """Calculate current equity (cash + positions) at the closes found by today's exit check."""
         equity = self.capital
         for pos in self.positions:
-            current_price = self._get_current_price(pos.symbol, date)
+            current_price = self._todays_close.get(pos.symbol, 0.0)
             if current_price:
                 equity += pos.position_value(current_price)
         return equity
 
     def _get_trading_days(self, start: datetime, end: datetime) -> List[datetime]:
-        """Get trading days (weekdays only)."""
-        days = []
-        current = start
-        while current <= end:
-            if current.weekday() < 5:  # Monday=0, Friday=4
-                days.append(current)
-            current += timedelta(days=1)
-        return days
+        """Get list of trading days (weekdays, excluding NYSE holidays)."""
+        return trading_days(start, end)
 
     def _generate_results(self):
         """Generate backtest results."""
         from collections import namedtuple
 
+        # Trade statistics - one P&L array, masks instead of a scan per statistic
         total_trades = len(self.closed_trades)
-        winning_trades = [t for t in self.closed_trades if t.realized_pnl() > 0]
-        losing_trades = [t for t in self.closed_trades if t.realized_pnl() < 0]
+        pnls = np.fromiter((t.realized_pnl() for t in self.closed_trades), dtype=np.float64, count=total_trades)
+        win_pnls = pnls[pnls > 0]
+        loss_pnls = pnls[pnls < 0]
 
-        win_rate = (len(winning_trades) / total_trades * 100) if total_trades > 0 else 0
+        win_rate = (len(win_pnls) / total_trades * 100) if total_trades > 0 else 0
 
-        total_wins = sum(t.realized_pnl() for t in winning_trades) if winning_trades else 0
-        total_losses = sum(abs(t.realized_pnl()) for t in losing_trades) if losing_trades else 1
+        total_wins = float(win_pnls.sum())
+        total_losses = float(-loss_pnls.sum()) if len(loss_pnls) else 1
         profit_factor = total_wins / total_losses if total_losses > 0 else 0
 
-        avg_win = total_wins / len(winning_trades) if winning_trades else 0
-        avg_loss = -sum(t.realized_pnl() for t in losing_trades) / len(losing_trades) if losing_trades else 0
+        avg_win = total_wins / len(win_pnls) if len(win_pnls) else 0
+        avg_loss = float(-loss_pnls.mean()) if len(loss_pnls) else 0
 
-        final_capital = self.equity_curve[-1] if self.equity_curve else self.starting_capital
+        final_capital = float(self.equity_curve[-1])
         total_return = final_capital - self.starting_capital
         total_return_pct = (total_return / self.starting_capital) * 100
 
-        # Max drawdown
-        peak = self.starting_capital
-        max_dd = 0
-        for equity in self.equity_curve:
-            if equity > peak:
-                peak = equity
-            dd = (peak - equity) / peak * 100
-            max_dd = max(max_dd, dd)
+        # Max drawdown from the running peak (never below starting capital)
+        equity = self.equity_curve
+        peaks = np.maximum(np.maximum.accumulate(equity), self.starting_capital)
+        max_dd = max(0.0, float((((peaks - equity) / peaks) * 100).max()))
 
         Results = namedtuple('Results', [
             'total_return', 'total_return_percent', 'total_trades',
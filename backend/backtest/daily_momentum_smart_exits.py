@@ -12,24 +12,45 @@ This is how professionals actually exit trades.
 Author: Claude AI + Tanam Bam Sinha
 """
 
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass
 import logging
 import sys
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from scanner.long.daily_breakout_scanner import DailyBreakoutScanner
+from scanner.long.daily_breakout_scanner import DailyBreakoutScanner, DailyBreakoutCandidate
 from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame
+from backtest._backtester import ParameterSweepMixin, ScanCacheMixin
+from backtest._calendar import calendar_span, epoch, trading_days
+from backtest._compat import with_slots
+from backtest._kernels import (
+    EXIT_HOLD, EXIT_LOWER_CLOSE, EXIT_MA_BREAK, EXIT_STOP, EXIT_TIME, EXIT_TRAIL,
+    average_true_range, kaufman_adaptive_mean, rolling_mean, smart_exit_signals
+)
 
 logger = logging.getLogger(__name__)
 
+# Trade exit reason recorded for each EXIT_* code from smart_exit_signals
+EXIT_REASONS = {
+    EXIT_STOP: 'HARD_STOP',
+    EXIT_TRAIL: 'TRAILING_STOP',
+    EXIT_MA_BREAK: 'MA_BREAK',
+    EXIT_LOWER_CLOSE: 'LOWER_HIGH',
+    EXIT_TIME: 'TIME',
+}
+
 
+@with_slots
 @dataclass
 class SmartPosition:
     """Position with smart exit tracking."""
@@ -43,7 +64,6 @@ class SmartPosition:
     highest_close: float = 0.0  # Track highest CLOSE, not intraday high
     trailing_stop: float = 0.0
     prev_close: float = 0.0  # For momentum detection
-    sma_5: List[float] = field(default_factory=list)
 
     # Exit info
     exit_date: Optional[datetime] = None
@@ -66,7 +86,7 @@ class SmartPosition:
         return (end_date - self.entry_date).days
 
 
-class SmartExitBacktester:
+class SmartExitBacktester(ScanCacheMixin, ParameterSweepMixin):
     """
     Backtester with smart exits based on price action.
 
@@ -77,8 +97,23 @@ class SmartExitBacktester:
     4. Hard stop at -8% - risk management
     """
 
-    def __init__(self, api_key: str, secret_key: str, starting_capital: float = 100000):
+    # Settings a parameter sweep may vary (see run_parameter_grid)
+    TUNABLE_PARAMETERS = (
+        'stop_loss_percent',
+        'trailing_atr_multiplier',
+        'atr_period',
+        'max_positions',
+        'position_size_percent',
+        'trend_ma',
+    )
+    # Market data shared by the backtests of a sweep worker, and the settings it depends on
+    SHARED_CACHES = ('_bar_times', '_highs', '_lows', '_closes', '_atr', '_sma_5', '_kama_5', '_scan_cache')
+    SHARED_CACHE_KEY = ('atr_period',)
+
+    def __init__(self, api_key: str, secret_key: str, starting_capital: float = 100000,
+                 scan_cache_dir: str = './data/cache/scans'):
         self.scanner = DailyBreakoutScanner(api_key, secret_key)
+        self.scan_cache_dir = Path(scan_cache_dir)
         self.data_client = StockHistoricalDataClient(api_key, secret_key)
 
         self.starting_capital = starting_capital
@@ -86,9 +121,13 @@ class SmartExitBacktester:
 
         # Risk management
         self.stop_loss_percent = 0.08  # 8% hard stop
-        self.trailing_atr_multiplier = 2.0  # Trail 2x ATR below high
+        self.trailing_atr_multiplier = 2.0  # Trail 2x ATR below high (until +10%)
+        self.atr_period = 10
         self.max_positions = 3
         self.position_size_percent = 0.30
+        # Trend-break average: 'sma' (5-day simple) or 'kama' (5-day Kaufman adaptive,
+        # tighter in trends and smoother in chop)
+        self.trend_ma = 'sma'
 
         # Tracking
         self.positions: List[SmartPosition] = []
@@ -96,6 +135,39 @@ class SmartExitBacktester:
         self.equity_curve = [starting_capital]
         self.peak_capital = starting_capital
 
+        # Today's close per open symbol, recorded by the exit check and at entry (for equity)
+        self._todays_close: Dict[str, float] = {}
+
+        # Exit-rule state of the open positions as arrays, one row per entry of
+        # self.positions (same order) so the daily check needs no attribute reads
+        self._pos_entry_price = np.empty(0, dtype=np.float64)
+        self._pos_hard_stop = np.empty(0, dtype=np.float64)
+        self._pos_highest = np.empty(0, dtype=np.float64)
+        self._pos_trailing = np.empty(0, dtype=np.float64)
+        self._pos_prev_close = np.empty(0, dtype=np.float64)
+        self._pos_entry_day = np.empty(0, dtype=np.int64)  # Entry date as a day number (date.toordinal())
+
+        # Daily bars per symbol for the whole backtest, fetched once per symbol:
+        # symbol -> bar timestamps as epoch seconds, sorted
+        self._bar_times: Dict[str, List[float]] = {}
+        # High/low/close per symbol as contiguous float64 arrays, aligned with the times
+        self._highs: Dict[str, np.ndarray] = {}
+        self._lows: Dict[str, np.ndarray] = {}
+        self._closes: Dict[str, np.ndarray] = {}
+        # ATR and 5-day simple and adaptive average close ending at each bar, computed once per symbol
+        self._atr: Dict[str, np.ndarray] = {}
+        self._sma_5: Dict[str, np.ndarray] = {}
+        self._kama_5: Dict[str, np.ndarray] = {}
+        # Scanner results per day, date ordinal -> candidates (scans are deterministic per date)
+        self._scan_cache: Dict[int, List[DailyBreakoutCandidate]] = {}
+        self._scan_dir: Optional[Path] = None
+        self._backtest_start: Optional[datetime] = None
+        self._backtest_end: Optional[datetime] = None
+
+    def _sweep_symbols(self, trading_days: List[datetime]) -> List[str]:
+        """Symbols a sweep over these days may need bars for: the universe and everything scanned."""
+        return list(self.scanner.watchlist) + super()._sweep_symbols(trading_days)
+
     def run(self, start_date: datetime, end_date: datetime):
         """Run backtest with smart exits."""
 
@@ -107,26 +179,40 @@ class SmartExitBacktester:
         logger.info(f"Exit Strategy: Price action based (trailing stops, MA breaks, momentum)")
         logger.info(f"{'='*80}\n")
 
+        self._backtest_start = start_date
+        self._backtest_end = end_date
+
+        # The whole universe's history in one request, before the day loop
+        self._prefetch_bars(self.scanner.watchlist)
+
         trading_days = self._get_trading_days(start_date, end_date)
         logger.info(f"Found {len(trading_days)} trading days to test\n")
 
+        self._load_scan_cache(trading_days)
+
         for current_date in trading_days:
             self._process_trading_day(current_date)
 
         # Close remaining positions
         if self.positions:
             logger.info(f"\nClosing {len(self.positions)} remaining positions...")
-            for pos in list(self.positions):
-                self._close_position(pos, end_date, "END_OF_TEST")
+            # Closing front to back: each close leaves the next one first,
+            # unless it had no price and stayed open
+            kept = 0
+            for pos in self.positions[:]:
+                if not self._close_position(pos, end_date, "END_OF_TEST", index=kept):
+                    kept += 1
 
         return self._calculate_results()
 
     def _process_trading_day(self, date: datetime):
         """Process a single trading day with smart exits."""
-        logger.info(f"\n{'='*80}")
-        logger.info(f"DAY: {date.strftime('%Y-%m-%d (%A)')}")
-        logger.info(f"Capital: ${self.capital:,.2f} | Positions: {len(self.positions)}")
-        logger.info(f"{'='*80}")
+        log_day = logger.isEnabledFor(logging.INFO)
+        if log_day:
+            logger.info(f"\n{'='*80}")
+            logger.info(f"DAY: {date.strftime('%Y-%m-%d (%A)')}")
+            logger.info(f"Capital: ${self.capital:,.2f} | Positions: {len(self.positions)}")
+            logger.info(f"{'='*80}")
 
         # 1. Check exits for existing positions (SMART LOGIC)
         self._check_smart_exits(date)
@@ -139,143 +225,218 @@ class SmartExitBacktester:
         current_equity = self._calculate_current_equity(date)
         self.equity_curve.append(current_equity)
 
-        # 4. Log summary
+        # 4. Log summary (only worked out when it will be logged)
+        if not log_day:
+            return
+
         day_pnl = current_equity - self.equity_curve[-2] if len(self.equity_curve) > 1 else 0
         logger.info(f"\nDay Summary:")
         logger.info(f"  Equity: ${current_equity:,.2f} ({day_pnl:+,.2f})")
         logger.info(f"  Positions: {len(self.positions)}")
 
-        if self.positions:
-            for pos in self.positions:
-                current_price = self._get_current_price(pos.symbol, date)
-                if current_price:
-                    unrealized = pos.unrealized_pnl(current_price)
-                    pct = (unrealized / (pos.entry_price * pos.shares)) * 100
-                    logger.info(f"    {pos.symbol}: ${pos.entry_price:.2f} → ${current_price:.2f} ({pct:+.1f}%, {pos.hold_days(date)} days)")
+        for pos in self.positions:
+            current_price = self._todays_close.get(pos.symbol, 0.0)
+            if current_price:
+                unrealized = pos.unrealized_pnl(current_price)
+                pct = (unrealized / (pos.entry_price * pos.shares)) * 100
+                logger.info(f"    {pos.symbol}: ${pos.entry_price:.2f} → ${current_price:.2f} ({pct:+.1f}%, {pos.hold_days(date)} days)")
 
     def _check_smart_exits(self, date: datetime):
-        """Check all positions for smart exit signals."""
-
-        for position in list(self.positions):
-            # Get price data
-            bars = self._get_recent_bars(position.symbol, date, lookback=10)
-            if not bars or len(bars) == 0:
-                continue
-
-            current_bar = bars[-1]
-            current_close = float(current_bar.close)
-            current_low = float(current_bar.low)  # Still use for hard stop check
-
-            # Calculate ATR (Average True Range) for trailing stop
-            atr = self._calculate_atr(bars, period=10)
-
-            # Update highest CLOSE (not high - no lookahead bias)
-            if current_close > position.highest_close:
-                position.highest_close = current_close
+        """Check all positions for smart exit signals (all positions' rules in one pass)."""
+        # Price data window [lo, hi) for every position (by row) that has some
+        checked = []
+        for row, position in enumerate(self.positions):
+            lo, hi = self._exit_window(position.symbol, date)
+            if hi > lo:
+                checked.append((row, lo, hi))
+
+        positions = [self.positions[row] for row, _, _ in checked]
+        symbols = [p.symbol for p in positions]
+
+        # Closes to value the positions at today: only bars inside the
+        # valuation's 3-day lookback window, not the exit check's ATR one
+        value_cutoff = epoch(date - timedelta(days=3 + 5))
+        self._todays_close = {
+            symbol: float(self._closes[symbol][hi - 1])
+            for symbol, (_, _, hi) in zip(symbols, checked)
+            if self._bar_times[symbol][hi - 1] >= value_cutoff
+        }
+
+        if not checked:
+            return
 
-                # HYBRID TRAILING: Tighten stop as profit increases
-                profit_pct = ((position.highest_close - position.entry_price) / position.entry_price) * 100
+        idx = np.array([row for row, _, _ in checked])
+        closes = np.array([self._closes[symbol][hi - 1] for symbol, (_, _, hi) in zip(symbols, checked)])
+        lows = np.array([self._lows[symbol][hi - 1] for symbol, (_, _, hi) in zip(symbols, checked)])  # Still use for hard stop check
+
+        # ATR (Average True Range) for trailing stop, and the 5-day MA (kept per symbol)
+        atrs = np.array([self._calculate_atr(symbol, lo, hi) for symbol, (_, lo, hi) in zip(symbols, checked)])
+        trend_ma = self._kama_5 if self.trend_ma == 'kama' else self._sma_5
+        sma_5 = np.array([
+            trend_ma[symbol][hi - 1] if hi - lo >= 5 else self._closes[symbol][hi - 1]
+            for symbol, (_, lo, hi) in zip(symbols, checked)
+        ])
+
+        # Highest CLOSE, not high - no lookahead bias. HYBRID TRAILING tightens as profit grows
+        highest, trailing, reasons = smart_exit_signals(
+            closes, lows, atrs, sma_5,
+            entry_price=self._pos_entry_price[idx],
+            hard_stop=self._pos_hard_stop[idx],
+            highest_close=self._pos_highest[idx],
+            trailing_stop=self._pos_trailing[idx],
+            prev_close=self._pos_prev_close[idx],
+            hold_days=date.toordinal() - self._pos_entry_day[idx],  # Calendar days; entries and checks share a time of day
+            atr_multiplier=self.trailing_atr_multiplier,
+            max_hold=17
+        )
 
-                if profit_pct >= 15:
-                    # +15%+: Very tight trail (5% from peak close)
-                    position.trailing_stop = position.highest_close * 0.95
-                elif profit_pct >= 10:
-                    # +10-15%: Tighter trail (1x ATR)
-                    position.trailing_stop = position.highest_close - (atr * 1.0)
-                else:
-                    # 0-10%: Normal trail (2x ATR)
-                    position.trailing_stop = position.highest_close - (atr * 2.0)
+        # Carry the state into tomorrow (rows of positions closed today are dropped on close)
+        self._pos_highest[idx] = highest
+        self._pos_trailing[idx] = trailing
+        holding = reasons == EXIT_HOLD
+        self._pos_prev_close[idx[holding]] = closes[holding]
+
+        # EXIT LOGIC (in priority order), applied in position order;
+        # every close shifts the later positions down one
+        log_exits = logger.isEnabledFor(logging.INFO)
+        closed = 0
+        for (row, _, _), position, current_close, current_low, ma, highest_close, trailing_stop, reason in zip(
+            checked, positions, closes.tolist(), lows.tolist(), sma_5.tolist(),
+            highest.tolist(), trailing.tolist(), reasons.tolist()
+        ):
+            position.highest_close = highest_close
+            position.trailing_stop = trailing_stop
+
+            if reason == EXIT_HOLD:
+                # Update for next day
+                position.prev_close = current_close
+                continue
 
-            # Calculate 5-day MA
-            if len(bars) >= 5:
-                sma_5 = sum(float(b.close) for b in bars[-5:]) / 5
-            else:
-                sma_5 = current_close
+            if log_exits:
+                self._log_exit(position, reason, current_close, current_low, ma)
 
-            # EXIT LOGIC (in priority order)
+            # Hard stops fill at the stop (intraday low hit it); every other exit is at the close
+            exit_price = position.hard_stop if reason == EXIT_STOP else current_close
+            self._close_position(position, date, EXIT_REASONS[reason], exit_price, index=row - closed)
+            closed += 1
 
+    def _log_exit(self, position: SmartPosition, reason: int, current_close: float, current_low: float, ma: float):
+        """Log why a position is being closed (exit reason code from smart_exit_signals)."""
+        if reason == EXIT_STOP:
             # 1. HARD STOP (always active) - use intraday low for hard stops
-            if current_low <= position.hard_stop:
-                logger.info(f"  🛑 {position.symbol}: Hard stop at ${current_low:.2f} (stop: ${position.hard_stop:.2f})")
-                self._close_position(position, date, "HARD_STOP", position.hard_stop)
-                continue
-
-            # 2. TRAILING STOP (after we've established profit) - use CLOSE not low
-            if position.highest_close > position.entry_price * 1.05:  # At least 5% up
-                if current_close < position.trailing_stop:  # Close breaks trail, not intraday low
-                    logger.info(f"  📉 {position.symbol}: Trailing stop - close ${current_close:.2f} < trail ${position.trailing_stop:.2f}")
-                    self._close_position(position, date, "TRAILING_STOP", current_close)  # Exit at close
-                    continue
-
+            logger.info(f"  🛑 {position.symbol}: Hard stop at ${current_low:.2f} (stop: ${position.hard_stop:.2f})")
+        elif reason == EXIT_TRAIL:
+            # 2. TRAILING STOP (after we've established profit) - close breaks trail, not intraday low
+            logger.info(f"  📉 {position.symbol}: Trailing stop - close ${current_close:.2f} < trail ${position.trailing_stop:.2f}")
+        elif reason == EXIT_MA_BREAK:
             # 3. TREND BREAK (close below 5-day MA - but only if current profit < 3%)
             # Logic: If we're up 3%+ NOW, let trailing stop handle it
             # Only use MA break to cut small losses/gains before they become bigger losses
             current_profit_pct = ((current_close - position.entry_price) / position.entry_price) * 100
-            if current_profit_pct < 3.0:  # Less than +3% profit right now
-                if current_close < sma_5:
-                    logger.info(f"  📊 {position.symbol}: Broke 5-day MA at ${current_close:.2f} (MA: ${sma_5:.2f}, +{current_profit_pct:.1f}%)")
-                    self._close_position(position, date, "MA_BREAK", current_close)
-                    continue
-
+            logger.info(f"  📊 {position.symbol}: Broke 5-day MA at ${current_close:.2f} (MA: ${ma:.2f}, +{current_profit_pct:.1f}%)")
+        elif reason == EXIT_LOWER_CLOSE:
             # 4. LOWER CLOSE (momentum weakening after 5%+ gain)
-            if position.highest_close > position.entry_price * 1.05:  # At least 5% up
-                if position.prev_close > 0 and current_close < position.prev_close:
-                    # Stock made a lower close - momentum fading
-                    logger.info(f"  ⚠️  {position.symbol}: Lower close at ${current_close:.2f} (prev: ${position.prev_close:.2f})")
-                    self._close_position(position, date, "LOWER_HIGH", current_close)
-                    continue
-
+            logger.info(f"  ⚠️  {position.symbol}: Lower close at ${current_close:.2f} (prev: ${position.prev_close:.2f})")
+        elif reason == EXIT_TIME:
             # 5. TIME STOP (backup, 17 days max)
-            if position.hold_days(date) >= 17:
-                logger.info(f"  ⏰ {position.symbol}: Time stop at ${current_close:.2f} (held 17 days)")
-                self._close_position(position, date, "TIME", current_close)
-                continue
+            logger.info(f"  ⏰ {position.symbol}: Time stop at ${current_close:.2f} (held 17 days)")
 
-            # Update for next day
-            position.prev_close = current_close
+    def _calculate_atr(self, symbol: str, lo: int, hi: int) -> float:
+        """
+        Average True Range at the last bar of [lo, hi) (mean true range of the
+        last atr_period bars), looked up in the symbol's precomputed series.
 
-    def _calculate_atr(self, bars: list, period: int = 10) -> float:
-        """Calculate Average True Range."""
-        if len(bars) < period + 1:
+        0.0 unless the window holds atr_period + 1 bars.
+        """
+        if hi - lo < self.atr_period + 1:
             return 0.0
+        return float(self._atr[symbol][hi - 1])
 
-        true_ranges = []
-        for i in range(1, len(bars)):
-            high = float(bars[i].high)
-            low = float(bars[i].low)
-            prev_close = float(bars[i-1].close)
-
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
+    def _prefetch_bars(self, symbols: List[str]):
+        """
+        Fetch the whole backtest's daily bars for symbols not seen yet.
 
-        return sum(true_ranges[-period:]) / period if true_ranges else 0.0
+        All new symbols go in one request; after that every lookback window
+        is a slice of the stored bars instead of an API call per symbol per day.
+        """
+        missing = [s for s in dict.fromkeys(symbols) if s not in self._bar_times]
+        if not missing:
+            return
 
-    def _get_recent_bars(self, symbol: str, date: datetime, lookback: int = 10):
-        """Get recent bars for a symbol."""
         try:
-            start = date - timedelta(days=lookback + 5)
             request = StockBarsRequest(
-                symbol_or_symbols=[symbol],
+                symbol_or_symbols=missing,
                 timeframe=TimeFrame.Day,
-                start=start,
-                end=date
+                start=self._history_start(self._backtest_start),
+                end=self._backtest_end
             )
             response = self.data_client.get_stock_bars(request)
-
-            if symbol in response.data and response.data[symbol]:
-                return list(response.data[symbol])
         except Exception as e:
-            logger.warning(f"Error getting bars for {symbol}: {e}")
+            logger.warning(f"Error getting bars for {', '.join(missing)}: {e}")
+            return
 
-        return []
+        # One pass over each symbol's Bar objects into float64 arrays; nothing
+        # downstream reads Bar attributes
+        for symbol in missing:
+            bars = response.data.get(symbol, [])
+            times, highs, lows, closes = np.array(
+                [(epoch(bar.timestamp), bar.high, bar.low, bar.close) for bar in bars], dtype=np.float64
+            ).reshape(-1, 4).T.copy()
+            self._store_bars(symbol, times, highs, lows, closes)
+
+    def _history_start(self, start_date: datetime) -> datetime:
+        """
+        Earliest bar time fetched for a backtest from start_date: room for the
+        10-day lookback, or for atr_period + 1 bars before the first day (with
+        slack for holidays) when the ATR is longer.
+        """
+        days = 15
+        if self.atr_period > 10:
+            days = max(days, calendar_span(self.atr_period + 1) + 10)
+        return start_date - timedelta(days=days)
+
+    def _bar_rows(self) -> Dict[str, Tuple[List[float], np.ndarray, np.ndarray, np.ndarray]]:
+        """Stored bars per symbol as the (times, highs, lows, closes) rows _store_bars takes."""
+        return {
+            symbol: (times, self._highs[symbol], self._lows[symbol], self._closes[symbol])
+            for symbol, times in self._bar_times.items()
+        }
+
+    def _store_bars(self, symbol: str, times: np.ndarray, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray):
+        """Keep a symbol's bar arrays and compute its indicators."""
+        self._bar_times[symbol] = times.tolist()
+        self._highs[symbol] = highs
+        self._lows[symbol] = lows
+        self._closes[symbol] = closes
+        self._atr[symbol] = average_true_range(highs, lows, closes, self.atr_period)
+        self._sma_5[symbol] = np.concatenate([np.full(min(4, len(closes)), np.nan), rolling_mean(closes, 5)])
+        self._kama_5[symbol] = kaufman_adaptive_mean(closes, 5)
+
+    def _exit_window(self, symbol: str, date: datetime) -> Tuple[int, int]:
+        """
+        Index range [lo, hi) of the exit check's bars: the 10-day lookback window,
+        reaching back atr_period + 1 bars when the ATR is longer than that window holds.
+        """
+        lo, hi = self._bar_window(symbol, date, lookback=10)
+        if self.atr_period > 10 and hi > lo:
+            lo = min(lo, max(0, hi - (self.atr_period + 1)))
+        return lo, hi
+
+    def _bar_window(self, symbol: str, date: datetime, lookback: int = 10) -> Tuple[int, int]:
+        """Index range [lo, hi) of a symbol's bars from lookback + 5 days before date up to date."""
+        if symbol not in self._bar_times:
+            self._prefetch_bars([symbol])
+            if symbol not in self._bar_times:
+                return 0, 0
+
+        times = self._bar_times[symbol]
+        lo = bisect_left(times, epoch(date - timedelta(days=lookback + 5)))
+        hi = bisect_right(times, epoch(date))
+        return lo, hi
 
     def _scan_and_enter(self, date: datetime):
         """Scan and enter new positions."""
-        candidates = self.scanner.scan(date)
+        candidates = self._scan(date)
 
         if not candidates:
             logger.info("  No breakout candidates found")
@@ -289,6 +450,10 @@ class SmartExitBacktester:
             return
 
         slots_available = self.max_positions - len(self.positions)
+
+        # One history request for every new symbol we may enter
+        self._prefetch_bars([c.symbol for c in candidates[:slots_available]])
+
         for candidate in candidates[:slots_available]:
             entry_price = candidate.close
             position_value = self.capital * self.position_size_percent
@@ -309,41 +474,74 @@ class SmartExitBacktester:
                 prev_close=entry_price
             )
 
-            self.positions.append(position)
+            self._add_position(position)
             self.capital -= shares * entry_price
 
+            current_price = self._get_current_price(candidate.symbol, date)
+            if current_price:
+                self._todays_close[candidate.symbol] = current_price
+
             logger.info(f"  ✅ ENTER {candidate.symbol}: {shares} shares @ ${entry_price:.2f}")
             logger.info(f"     Hard Stop: ${position.hard_stop:.2f}")
             logger.info(f"     Score: {candidate.score():.1f}/10")
 
-    def _close_position(self, position: SmartPosition, date: datetime, reason: str, price: Optional[float] = None):
-        """Close a position."""
+    def _add_position(self, position: SmartPosition):
+        """Open a position, keeping the exit-state arrays in step."""
+        self.positions.append(position)
+        self._pos_entry_price = np.append(self._pos_entry_price, position.entry_price)
+        self._pos_hard_stop = np.append(self._pos_hard_stop, position.hard_stop)
+        self._pos_highest = np.append(self._pos_highest, position.highest_close)
+        self._pos_trailing = np.append(self._pos_trailing, position.trailing_stop)
+        self._pos_prev_close = np.append(self._pos_prev_close, position.prev_close)
+        self._pos_entry_day = np.append(self._pos_entry_day, position.entry_date.toordinal())
+
+    def _remove_position(self, i: int):
+        """Drop the i-th open position from the list and the exit-state arrays."""
+        del self.positions[i]
+        self._pos_entry_price = np.delete(self._pos_entry_price, i)
+        self._pos_hard_stop = np.delete(self._pos_hard_stop, i)
+        self._pos_highest = np.delete(self._pos_highest, i)
+        self._pos_trailing = np.delete(self._pos_trailing, i)
+        self._pos_prev_close = np.delete(self._pos_prev_close, i)
+        self._pos_entry_day = np.delete(self._pos_entry_day, i)
+
+    def _close_position(self, position: SmartPosition, date: datetime, reason: str, price: Optional[float] = None,
+                        index: Optional[int] = None) -> bool:
+        """
+        Close a position.
+
+        Callers that know the position's index in self.positions pass it,
+        which saves searching the open positions for it. Returns False if
+        there was no price to close at.
+        """
         exit_price = price or self._get_current_price(position.symbol, date)
 
         if exit_price is None:
             logger.warning(f"  ⚠️  Cannot close {position.symbol}: No price data")
-            return
+            return False
 
         position.exit_date = date
         position.exit_price = exit_price
         position.exit_reason = reason
 
-        pnl = position.realized_pnl()
-        pnl_pct = (pnl / (position.entry_price * position.shares)) * 100
-
         self.capital += position.shares * exit_price
 
-        self.positions.remove(position)
+        self._remove_position(self.positions.index(position) if index is None else index)
         self.closed_trades.append(position)
 
-        emoji = "✅" if pnl > 0 else "❌"
-        logger.info(f"  {emoji} CLOSE {position.symbol}: ${exit_price:.2f} | P&L: {pnl:+,.0f} ({pnl_pct:+.1f}%) | {reason}")
+        if logger.isEnabledFor(logging.INFO):
+            pnl = position.realized_pnl()
+            pnl_pct = (pnl / (position.entry_price * position.shares)) * 100
+            emoji = "✅" if pnl > 0 else "❌"
+            logger.info(f"  {emoji} CLOSE {position.symbol}: ${exit_price:.2f} | P&L: {pnl:+,.0f} ({pnl_pct:+.1f}%) | {reason}")
+
+        return True
 
     def _get_current_price(self, symbol: str, date: datetime) -> Optional[float]:
         """Get close price for symbol."""
-        bars = self._get_recent_bars(symbol, date, lookback=3)
-        if bars:
-            return float(bars[-1].close)
+        lo, hi = self._bar_window(symbol, date, lookback=3)
+        if hi > lo:
+            return float(self._closes[symbol][hi - 1])
         return None
 
     def _calculate_current_equity(self, date: datetime) -> float:
@@ -351,23 +549,15 @@ class SmartExitBacktester:
         equity = self.capital
 
         for position in self.positions:
-            current_price = self._get_current_price(position.symbol, date)
+            current_price = self._todays_close.get(position.symbol, 0.0)
             if current_price:
                 equity += position.position_value(current_price)
 
         return equity
 
     def _get_trading_days(self, start: datetime, end: datetime) -> List[datetime]:
-        """Get trading days."""
-        days = []
-        current = start
-
-        while current <= end:
-            if current.weekday() < 5:
-                days.append(current)
-            current += timedelta(days=1)
-
-        return days
+        """Get trading days (weekdays, excluding NYSE holidays)."""
+        return trading_days(start, end)
 
     def _calculate_results(self):
         """Calculate backtest results."""
@@ -375,40 +565,43 @@ class SmartExitBacktester:
         total_return = ending_capital - self.starting_capital
         total_return_pct = (total_return / self.starting_capital) * 100
 
-        winners = [t for t in self.closed_trades if t.realized_pnl() > 0]
-        losers = [t for t in self.closed_trades if t.realized_pnl() < 0]
+        # Trade statistics - one P&L array, masks instead of a scan per statistic
+        closed = self.closed_trades
+        pnls = np.fromiter((t.realized_pnl() for t in closed), dtype=np.float64, count=len(closed))
+        win_pnls = pnls[pnls > 0]
+        loss_pnls = pnls[pnls < 0]
 
-        win_rate = (len(winners) / len(self.closed_trades) * 100) if self.closed_trades else 0
-        avg_win = (sum(t.realized_pnl() for t in winners) / len(winners)) if winners else 0
-        avg_loss = (sum(t.realized_pnl() for t in losers) / len(losers)) if losers else 0
+        win_rate = (len(win_pnls) / len(closed) * 100) if closed else 0
+        avg_win = float(win_pnls.mean()) if len(win_pnls) else 0
+        avg_loss = float(loss_pnls.mean()) if len(loss_pnls) else 0
 
-        total_wins = sum(t.realized_pnl() for t in winners)
-        total_losses = abs(sum(t.realized_pnl() for t in losers))
+        total_wins = float(win_pnls.sum())
+        total_losses = float(-loss_pnls.sum())
         profit_factor = (total_wins / total_losses) if total_losses > 0 else 0
 
-        peak = self.starting_capital
-        max_dd = 0
-        for equity in self.equity_curve:
-            if equity > peak:
-                peak = equity
-            dd = ((peak - equity) / peak) * 100
-            if dd > max_dd:
-                max_dd = dd
-
-        trades = []
-        for t in self.closed_trades:
-            trades.append({
-                'symbol': t.symbol,
-                'entry_date': t.entry_date.strftime('%Y-%m-%d'),
-                'exit_date': t.exit_date.strftime('%Y-%m-%d') if t.exit_date else None,
-                'entry_price': float(t.entry_price),
-                'exit_price': float(t.exit_price) if t.exit_price else None,
-                'shares': t.shares,
-                'pnl': float(t.realized_pnl()),
-                'pnl_pct': float((t.realized_pnl() / (t.entry_price * t.shares)) * 100),
-                'hold_days': t.hold_days(t.exit_date) if t.exit_date else 0,
-                'exit_reason': t.exit_reason
-            })
+        # Max drawdown from the running peak (never below starting capital)
+        equity = np.asarray(self.equity_curve, dtype=np.float64)
+        peaks = np.maximum(np.maximum.accumulate(equity), self.starting_capital)
+        max_dd = max(0.0, float((((peaks - equity) / peaks) * 100).max()))
+
+        # Trade table built column by column (one list per field)
+        entry_values = np.array([t.entry_price * t.shares for t in closed], dtype=np.float64)
+        columns = {
+            'symbol': [t.symbol for t in closed],
+            'entry_date': [t.entry_date.strftime('%Y-%m-%d') for t in closed],
+            'exit_date': [t.exit_date.strftime('%Y-%m-%d') if t.exit_date else None for t in closed],
+            'entry_price': [float(t.entry_price) for t in closed],
+            'exit_price': [float(t.exit_price) if t.exit_price else None for t in closed],
+            'shares': [t.shares for t in closed],
+            'pnl': pnls.tolist(),
+            'pnl_pct': (pnls / entry_values * 100).tolist(),
+            'hold_days': [t.hold_days(t.exit_date) if t.exit_date else 0 for t in closed],
+            'exit_reason': [t.exit_reason for t in closed],
+        }
+        trades_frame = pd.DataFrame(columns)
+
+        # Row dicts are kept for JSON export and existing consumers
+        trades = [dict(zip(columns, row)) for row in zip(*columns.values())]
 
         from backtest.daily_momentum_backtest import DailyBacktestResults
         return DailyBacktestResults(
@@ -416,14 +609,15 @@ class SmartExitBacktester:
             ending_capital=ending_capital,
             total_return=total_return,
             total_return_percent=total_return_pct,
-            total_trades=len(self.closed_trades),
-            winning_trades=len(winners),
-            losing_trades=len(losers),
+            total_trades=len(closed),
+            winning_trades=len(win_pnls),
+            losing_trades=len(loss_pnls),
             win_rate=win_rate,
             avg_win=avg_win,
             avg_loss=avg_loss,
             profit_factor=profit_factor,
             max_drawdown_percent=max_dd,
             trades=trades,
-            equity_curve=self.equity_curve
+            equity_curve=self.equity_curve,
+            trades_frame=trades_frame
         )
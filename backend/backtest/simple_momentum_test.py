@@ -20,6 +20,8 @@ import json
 import sys
 from pathlib import Path
 
+import numpy as np
+
 # Add backend directory to path
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
@@ -29,6 +31,9 @@ from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame
 
 from scanner.long.market_scanner import MomentumScanner, MomentumCandidate
+from data.cache import CachedDataClient
+from backtest._calendar import epoch
+from backtest._kernels import rolling_mean
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -63,7 +68,9 @@ class SimpleMomentumBacktester:
         self,
         api_key: str,
         secret_key: str,
-        starting_capital: float = 100000
+        starting_capital: float = 100000,
+        use_cache: bool = True,
+        cache_dir: str = './cache_simple_momentum'
     ):
         """
         Initialize simple momentum backtester.
@@ -72,8 +79,13 @@ class SimpleMomentumBacktester:
             api_key: Alpaca API key
             secret_key: Alpaca secret key
             starting_capital: Starting account value
+            use_cache: Keep fetched bars in parquet files so re-runs skip the API
+            cache_dir: Directory for the parquet files
         """
-        self.data_client = StockHistoricalDataClient(api_key, secret_key)
+        if use_cache:
+            self.data_client = CachedDataClient(api_key, secret_key, cache_dir=cache_dir)
+        else:
+            self.data_client = StockHistoricalDataClient(api_key, secret_key)
         self.scanner = MomentumScanner(api_key, secret_key)
 
         self.starting_capital = starting_capital
@@ -91,6 +103,17 @@ class SimpleMomentumBacktester:
         self.min_scanner_score = 2.0  # Accept scanner score 2+
         self.min_relative_volume = 2.0  # Accept 2x+ volume
 
+        # Fetched bars per symbol as parallel arrays, built once per fetch:
+        # bar timestamps as epoch seconds (sorted), opens, closes and volumes
+        self._bar_times: Dict[str, np.ndarray] = {}
+        self._opens: Dict[str, np.ndarray] = {}
+        self._closes: Dict[str, np.ndarray] = {}
+        self._volumes: Dict[str, np.ndarray] = {}
+        # Breakout metrics of every bar, computed with the arrays: volume over the
+        # previous 19 bars' average, and % change from the session open
+        self._relative_volume: Dict[str, np.ndarray] = {}
+        self._percent_change: Dict[str, np.ndarray] = {}
+
         logger.info(f"Simple Momentum Backtester initialized (${starting_capital:,.0f})")
         logger.info(f"Rules: Score {self.min_scanner_score}+, Volume {self.min_relative_volume}x+")
 
@@ -122,6 +145,28 @@ class SimpleMomentumBacktester:
             logger.error(f"Error fetching intraday bars: {e}")
             return {}
 
+    def _store_bars(self, symbol: str, bars: List):
+        """
+        Keep a symbol's bars as arrays and precompute its breakout metrics,
+        so each scan is a binary search and two lookups.
+        """
+        self._bar_times[symbol] = np.array([epoch(b.timestamp) for b in bars], dtype=np.float64)
+        self._opens[symbol] = opens = np.array([float(b.open) for b in bars], dtype=np.float64)
+        self._closes[symbol] = closes = np.array([float(b.close) for b in bars], dtype=np.float64)
+        self._volumes[symbol] = volumes = np.array([float(b.volume) for b in bars], dtype=np.float64)
+
+        # Bar j against the average of bars j-19 .. j-1 (NaN for the first 19 bars)
+        relative_volume = np.full(len(volumes), np.nan)
+        if len(volumes) > 19:
+            avg_volume = rolling_mean(volumes[:-1], 19)
+            relative_volume[19:] = np.divide(
+                volumes[19:], avg_volume, out=np.zeros_like(avg_volume), where=avg_volume > 0
+            )
+        self._relative_volume[symbol] = relative_volume
+
+        session_open = opens[0] if len(opens) else np.nan
+        self._percent_change[symbol] = ((closes - session_open) / session_open) * 100
+
     def scan_for_breakouts(
         self,
         current_time: datetime,
@@ -130,41 +175,42 @@ class SimpleMomentumBacktester:
         """Scan for momentum breakouts using completed bars only."""
         candidates = []
         next_bar_prices = {}
+        now = epoch(current_time)
 
         for symbol, bars in bars_cache.items():
-            # Only use completed bars
-            completed_bars = [b for b in bars if b.timestamp < current_time]
-            if len(completed_bars) < 20:
-                continue
+            if symbol not in self._bar_times:
+                self._store_bars(symbol, bars)
+            times = self._bar_times[symbol]
 
-            last_completed_bar = completed_bars[-1]
-            recent_bars = completed_bars[-20:]
+            # Only use completed bars: the first i bars closed before current_time
+            i = int(np.searchsorted(times, now, side='left'))
+            if i < 20:
+                continue
 
-            # Find next bar for entry
-            next_bars = [b for b in bars if b.timestamp >= current_time]
-            if not next_bars:
+            # Next bar (index i) for entry
+            if i >= len(times):
                 continue
-            next_bar = next_bars[0]
-            entry_price = float(next_bar.open)
+            entry_price = float(self._opens[symbol][i])
 
-            # Calculate metrics
-            avg_volume = sum(b.volume for b in recent_bars[:-1]) / (len(recent_bars) - 1)
-            relative_volume = last_completed_bar.volume / avg_volume if avg_volume > 0 else 0
+            # Metrics of the last completed bar, precomputed per symbol
+            relative_volume = float(self._relative_volume[symbol][i - 1])
 
             if relative_volume < 2.0:
                 continue
 
-            session_open = completed_bars[0].open if completed_bars else last_completed_bar.open
-            percent_change = ((last_completed_bar.close - session_open) / session_open) * 100
+            percent_change = float(self._percent_change[symbol][i - 1])
 
             if abs(percent_change) < 3.0:
                 continue
 
+            last_close = float(self._closes[symbol][i - 1])
+            last_volume = float(self._volumes[symbol][i - 1])
+
             # Create candidate
             candidate = MomentumCandidate(
                 symbol=symbol,
-                current_price=float(last_completed_bar.close),
-                volume=int(last_completed_bar.volume),
+                current_price=last_close,
+                volume=int(last_volume),
                 relative_volume=relative_volume,
                 percent_change=percent_change,
                 gap_percent=0.0,
@@ -178,7 +224,7 @@ class SimpleMomentumBacktester:
             candidates.append(candidate)
             next_bar_prices[symbol] = entry_price
 
-            logger.info(f"🔥 Breakout: {symbol} @ ${last_completed_bar.close:.2f}")
+            logger.info(f"🔥 Breakout: {symbol} @ ${last_close:.2f}")
             logger.info(f"   Score: {candidate.score():.1f}, Vol: {relative_volume:.1f}x, Change: {percent_change:+.1f}%")
 
         return candidates, next_bar_prices
@@ -243,6 +289,8 @@ class SimpleMomentumBacktester:
         # Fetch intraday bars
         logger.info("Fetching intraday bars...")
         bars_cache = self.get_intraday_bars(test_symbols, test_start, test_end)
+        for symbol, bars in bars_cache.items():
+            self._store_bars(symbol, bars)
         logger.info(f"Fetched bars for {len(bars_cache)} symbols")
         logger.info("")
 
@@ -251,6 +299,8 @@ class SimpleMomentumBacktester:
         scan_interval = timedelta(minutes=2)
 
         while current_time <= test_end:
+            now = epoch(current_time)
+
             # Scan for breakouts
             candidates, next_bar_prices = self.scan_for_breakouts(current_time, bars_cache)
 
@@ -293,13 +343,15 @@ class SimpleMomentumBacktester:
             for symbol in list(self.positions.keys()):
                 trade = self.positions[symbol]
 
-                # Get current bar
-                symbol_bars = [b for b in bars_cache.get(symbol, []) if b.timestamp == current_time]
-                if not symbol_bars:
+                # Get current bar (the one stamped exactly current_time), by binary search
+                times = self._bar_times.get(symbol)
+                if times is None:
+                    continue
+                i = int(np.searchsorted(times, now, side='left'))
+                if i >= len(times) or times[i] != now:
                     continue
 
-                current_bar = symbol_bars[0]
-                current_price = float(current_bar.close)
+                current_price = float(self._closes[symbol][i])
 
                 # Check stop loss
                 if current_price <= trade.stop_loss:
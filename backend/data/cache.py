@@ -4,6 +4,10 @@ Data caching layer for Alpaca market data.
 Caches downloaded data to local parquet files for fast iteration.
 Cache key: {symbol}_{start_date}_{end_date}.parquet
 
+Bars loaded in a process are also kept in memory in front of the parquet
+files, so re-runs and parameter sweeps in the same process skip re-reading
+them.
+
 Usage:
     from data.cache import CachedDataClient
 
@@ -11,6 +15,7 @@ Usage:
     bars = client.get_stock_bars(request)  # Auto-caches
 """
 
+from collections import OrderedDict
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
@@ -23,6 +28,18 @@ from alpaca.data.models import BarSet, Bar
 
 logger = logging.getLogger(__name__)
 
+# Bars loaded by any client in this process: cache file -> bars (least recently used first)
+_memory_cache: "OrderedDict[Path, list]" = OrderedDict()
+MEMORY_CACHE_SIZE = 1024
+
+
+def _remember(cache_file: Path, bars: list):
+    """Keep bars in the in-memory tier, evicting the least recently used."""
+    _memory_cache[cache_file] = bars
+    _memory_cache.move_to_end(cache_file)
+    if len(_memory_cache) > MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
 
 class CachedDataClient:
     """Wrapper around Alpaca client that caches data to disk."""
@@ -33,6 +50,7 @@ class CachedDataClient:
         self.cache_dir.mkdir(exist_ok=True)
 
         # Stats
+        self.memory_hits = 0
         self.cache_hits = 0
         self.cache_misses = 0
 
@@ -52,11 +70,18 @@ class CachedDataClient:
         timeframe = str(request.timeframe)
 
         result_data = {}
+        misses = {}
 
         for symbol in symbols:
             cache_file = self.cache_dir / f"{symbol}_{start_str}_{end_str}_{timeframe}.parquet"
 
-            if cache_file.exists():
+            if cache_file in _memory_cache:
+                # Already loaded in this process
+                self.memory_hits += 1
+                _memory_cache.move_to_end(cache_file)
+                result_data[symbol] = list(_memory_cache[cache_file])
+
+            elif cache_file.exists():
                 # Load from cache
                 self.cache_hits += 1
                 logger.debug(f"Cache HIT: {symbol} {start_str}-{end_str}")
@@ -82,22 +107,26 @@ class CachedDataClient:
                     bars.append(bar)
 
                 result_data[symbol] = bars
+                _remember(cache_file, list(bars))
 
             else:
-                # Fetch from API
                 self.cache_misses += 1
-                logger.debug(f"Cache MISS: {symbol} {start_str}-{end_str} - Downloading...")
+                misses[symbol] = cache_file
+
+        if misses:
+            # Fetch every missing symbol from the API in one request
+            logger.debug(f"Cache MISS: {', '.join(misses)} {start_str}-{end_str} - Downloading...")
 
-                # Fetch just this symbol
-                single_request = StockBarsRequest(
-                    symbol_or_symbols=[symbol],
-                    timeframe=request.timeframe,
-                    start=request.start,
-                    end=request.end
-                )
+            batch_request = StockBarsRequest(
+                symbol_or_symbols=list(misses),
+                timeframe=request.timeframe,
+                start=request.start,
+                end=request.end
+            )
 
-                response = self.client.get_stock_bars(single_request)
+            response = self.client.get_stock_bars(batch_request)
 
+            for symbol, cache_file in misses.items():
                 if symbol in response.data:
                     bars = list(response.data[symbol])
                     result_data[symbol] = bars
@@ -115,8 +144,12 @@ class CachedDataClient:
                     } for bar in bars])
 
                     df.to_parquet(cache_file, index=False)
+                    _remember(cache_file, list(bars))
                     logger.debug(f"Cached: {symbol} ({len(bars)} bars)")
 
+        # Keep the requested symbol order
+        result_data = {symbol: result_data[symbol] for symbol in symbols if symbol in result_data}
+
         # Return a simple object with .data attribute to match Alpaca API
         class CachedBarSet:
             def __init__(self, data):
@@ -126,10 +159,11 @@ class CachedDataClient:
 
     def print_stats(self):
         """Print cache statistics."""
-        total = self.cache_hits + self.cache_misses
+        total = self.memory_hits + self.cache_hits + self.cache_misses
         if total > 0:
-            hit_rate = (self.cache_hits / total) * 100
+            hit_rate = ((self.memory_hits + self.cache_hits) / total) * 100
             print(f"\n📊 Cache Stats:")
+            print(f"   Memory Hits: {self.memory_hits}")
             print(f"   Hits: {self.cache_hits}")
             print(f"   Misses: {self.cache_misses}")
             print(f"   Hit Rate: {hit_rate:.1f}%")
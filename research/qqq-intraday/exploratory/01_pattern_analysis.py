@@ -4,8 +4,11 @@ Analyze QQQ market data to find better trading opportunities.
 Instead of forcing DP20 strategy, let's see what the data tells us.
 """
 
+import io
 import os
-from datetime import date, time
+import sys
+from pathlib import Path
+from datetime import date
 from dotenv import load_dotenv
 import pandas as pd
 import numpy as np
@@ -13,165 +16,153 @@ import numpy as np
 from trading_playbook.adapters.alpaca_fetcher import AlpacaDataFetcher
 from trading_playbook.adapters.cached_fetcher import CachedDataFetcher
 from trading_playbook.models.market_data import TimeFrame
-from trading_playbook.core.indicators import calculate_ema, calculate_sma, calculate_atr
+from trading_playbook.core.indicators import calculate_session_ema
 
 
-def analyze_intraday_patterns(fetcher, symbol, start_date, end_date):
+def load_intraday_frame(fetcher, symbol, start_date, end_date):
     """
-    Analyze intraday patterns to find profitable setups.
+    Load 2-min bars for every trading day in the range into a single DataFrame.
+
+    Reads the cached fetcher's month shards in one call rather than one
+    fetch per day. The frame is indexed by bar timestamp and carries a
+    `session_date` column (midnight of the trading day) so callers can
+    group by session.
     """
-    print("\n" + "="*80)
-    print("ANALYZING INTRADAY PATTERNS")
-    print("="*80)
+    df = fetcher.fetch_intraday_bars_range(symbol, start_date, end_date, TimeFrame.MINUTE_2)
+    df = df[['open', 'high', 'low', 'close', 'volume']].copy()
+    df['session_date'] = df.index.normalize()
+    return df
+
+
+def compute_intraday_moves(intraday):
+    """
+    Compute each session's morning low -> afternoon high move.
+
+    Returns one row per session, sorted by date.
+    """
+    # Reduce all sessions with one groupby each
+    df = intraday
+    sessions = df.groupby('session_date')
+    
+    # Morning low (9:30-11:00): one argmin per session gives the bar label,
+    # the low itself is read back from that bar
+    morning_low_times = df.between_time('09:30', '11:00').groupby('session_date')['low'].idxmin()
+    morning_lows = pd.Series(df.loc[morning_low_times, 'low'].to_numpy(), index=morning_low_times.index)
+    
+    # Afternoon high (11:00-4:00)
+    afternoon_high_times = df.between_time('11:00', '16:00').groupby('session_date')['high'].idxmax()
+    afternoon_highs = pd.Series(df.loc[afternoon_high_times, 'high'].to_numpy(), index=afternoon_high_times.index)
+    
+    # Days missing either window are dropped by the inner join
+    moves_df = pd.concat(
+        {
+            'morning_low': morning_lows,
+            'morning_low_time': morning_low_times,
+            'afternoon_high': afternoon_highs,
+            'afternoon_high_time': afternoon_high_times,
+            'day_open': sessions['open'].first(),
+            'day_close': sessions['close'].last(),
+        },
+        axis=1,
+        join='inner'
+    )
+    
+    # Calculate move from morning low to afternoon high
+    moves_df['move_points'] = moves_df['afternoon_high'] - moves_df['morning_low']
+    moves_df['move_percent'] = (moves_df['move_points'] / moves_df['morning_low']) * 100
+    moves_df.insert(0, 'date', moves_df.index.date)
+    moves_df = moves_df.reset_index(drop=True)
     
-    # Get trading days
-    daily_df = fetcher.fetch_daily_bars(symbol, start_date, end_date)
-    trading_days = [d.date() for d in daily_df.index]
+    return moves_df
+
+
+def analyze_intraday_patterns(moves_df):
+    """
+    Analyze intraday patterns to find profitable setups.
+
+    Args:
+        moves_df: Per-session moves (see compute_intraday_moves)
+
+    The report is built in a buffer and written to stdout once at the end.
+    """
+    report = io.StringIO()
+    print("\n" + "="*80, file=report)
+    print("ANALYZING INTRADAY PATTERNS", file=report)
+    print("="*80, file=report)
     
-    all_moves = []
+    print(f"\nAnalyzed {len(moves_df)} trading days\n", file=report)
     
-    for trade_date in trading_days:
-        # Fetch 2-min bars
-        bars = fetcher.fetch_intraday_bars(symbol, trade_date, TimeFrame.MINUTE_2)
-        if not bars:
-            continue
-            
-        df = pd.DataFrame([
-            {
-                'timestamp': bar.timestamp,
-                'open': bar.open,
-                'high': bar.high,
-                'low': bar.low,
-                'close': bar.close,
-                'volume': bar.volume
-            }
-            for bar in bars
-        ])
-        
-        # Calculate indicators
-        df['ema20'] = calculate_ema(df['close'], period=20)
-        df['time'] = df['timestamp'].dt.time
-        
-        # Find morning low (9:30-11:00)
-        morning_window = df[(df['time'] >= time(9, 30)) & (df['time'] <= time(11, 0))]
-        if morning_window.empty:
-            continue
-            
-        morning_low = morning_window['low'].min()
-        morning_low_time = morning_window[morning_window['low'] == morning_low].iloc[0]['timestamp']
-        
-        # Find afternoon high (11:00-4:00)
-        afternoon_window = df[df['time'] >= time(11, 0)]
-        if afternoon_window.empty:
-            continue
-            
-        afternoon_high = afternoon_window['high'].max()
-        afternoon_high_time = afternoon_window[afternoon_window['high'] == afternoon_high].iloc[0]['timestamp']
-        
-        # Calculate move from morning low to afternoon high
-        move_points = afternoon_high - morning_low
-        move_percent = (move_points / morning_low) * 100
-        
-        all_moves.append({
-            'date': trade_date,
-            'morning_low': morning_low,
-            'morning_low_time': morning_low_time,
-            'afternoon_high': afternoon_high,
-            'afternoon_high_time': afternoon_high_time,
-            'move_points': move_points,
-            'move_percent': move_percent,
-            'day_open': df.iloc[0]['open'],
-            'day_close': df.iloc[-1]['close']
-        })
-    
-    moves_df = pd.DataFrame(all_moves)
-    
-    print(f"\nAnalyzed {len(moves_df)} trading days\n")
-    
-    print("MORNING LOW → AFTERNOON HIGH MOVES:")
-    print(f"  Average move:    ${moves_df['move_points'].mean():.2f} ({moves_df['move_percent'].mean():.2f}%)")
-    print(f"  Median move:     ${moves_df['move_points'].median():.2f} ({moves_df['move_percent'].median():.2f}%)")
-    print(f"  Best move:       ${moves_df['move_points'].max():.2f} ({moves_df['move_percent'].max():.2f}%)")
-    print(f"  Worst move:      ${moves_df['move_points'].min():.2f} ({moves_df['move_percent'].min():.2f}%)")
+    print("MORNING LOW → AFTERNOON HIGH MOVES:", file=report)
+    print(f"  Average move:    ${moves_df['move_points'].mean():.2f} ({moves_df['move_percent'].mean():.2f}%)", file=report)
+    print(f"  Median move:     ${moves_df['move_points'].median():.2f} ({moves_df['move_percent'].median():.2f}%)", file=report)
+    print(f"  Best move:       ${moves_df['move_points'].max():.2f} ({moves_df['move_percent'].max():.2f}%)", file=report)
+    print(f"  Worst move:      ${moves_df['move_points'].min():.2f} ({moves_df['move_percent'].min():.2f}%)", file=report)
     
     # What if we just bought morning low and sold afternoon high?
-    print(f"\n\nSIMPLE STRATEGY: Buy morning low, Sell afternoon high")
-    print("="*80)
+    print(f"\n\nSIMPLE STRATEGY: Buy morning low, Sell afternoon high", file=report)
+    print("="*80, file=report)
     trades_simulated = len(moves_df)
     total_pnl = moves_df['move_points'].sum() * 100  # 100 shares
     avg_pnl = total_pnl / trades_simulated
     
-    print(f"Trades:          {trades_simulated}")
-    print(f"Total P&L:       ${total_pnl:,.2f} (100 shares per trade)")
-    print(f"Avg P&L/trade:   ${avg_pnl:.2f}")
-    print(f"Win rate:        100% (always positive move)")
+    print(f"Trades:          {trades_simulated}", file=report)
+    print(f"Total P&L:       ${total_pnl:,.2f} (100 shares per trade)", file=report)
+    print(f"Avg P&L/trade:   ${avg_pnl:.2f}", file=report)
+    print(f"Win rate:        100% (always positive move)", file=report)
     
     # Show best opportunities
-    print("\n\nBEST OPPORTUNITIES (biggest moves):")
-    print("="*80)
+    print("\n\nBEST OPPORTUNITIES (biggest moves):", file=report)
+    print("="*80, file=report)
     top_moves = moves_df.nlargest(10, 'move_points')
     for _, row in top_moves.iterrows():
         print(f"{row['date']}: ${row['move_points']:.2f} ({row['move_percent']:.2f}%) - "
-              f"Low @ {row['morning_low_time'].time()}, High @ {row['afternoon_high_time'].time()}")
+              f"Low @ {row['morning_low_time'].time()}, High @ {row['afternoon_high_time'].time()}", file=report)
     
+    sys.stdout.write(report.getvalue())
     return moves_df
 
 
-def analyze_ema_crosses(fetcher, symbol, start_date, end_date):
+def compute_ema_crosses(intraday):
     """
-    Analyze EMA20 crossing patterns.
+    Find each session's first morning bullish EMA20 cross, held to the close.
+
+    Returns one row per session with a cross, sorted by date.
     """
-    print("\n\n" + "="*80)
-    print("ANALYZING EMA20 CROSSING PATTERNS")
-    print("="*80)
-    
-    daily_df = fetcher.fetch_daily_bars(symbol, start_date, end_date)
-    trading_days = [d.date() for d in daily_df.index]
+    # One EMA20 pass over every session, restarting each morning
+    intraday = intraday.assign(
+        ema20=calculate_session_ema(intraday['close'], intraday['session_date'], period=20)
+    )
     
     cross_results = []
     
-    for trade_date in trading_days:
-        bars = fetcher.fetch_intraday_bars(symbol, trade_date, TimeFrame.MINUTE_2)
-        if not bars:
-            continue
-            
-        df = pd.DataFrame([
-            {
-                'timestamp': bar.timestamp,
-                'open': bar.open,
-                'high': bar.high,
-                'low': bar.low,
-                'close': bar.close,
-            }
-            for bar in bars
-        ])
+    for session_date, df in intraday.groupby('session_date'):
+        trade_date = session_date.date()
         
-        df['ema20'] = calculate_ema(df['close'], period=20)
-        df['time'] = df['timestamp'].dt.time
+        # Work on numpy views of the session; no per-day frame copies
+        close = df['close'].to_numpy()
+        ema20 = df['ema20'].to_numpy()
         
         # Look for crosses in morning (9:30-12:00)
-        morning = df[(df['time'] >= time(9, 30)) & (df['time'] <= time(12, 0))].copy()
+        morning = df.index.indexer_between_time('09:30', '12:00')
         if len(morning) < 2:
             continue
         
-        # Find bullish crosses (close moves above EMA20)
-        morning['prev_close'] = morning['close'].shift(1)
-        morning['prev_ema20'] = morning['ema20'].shift(1)
-        
+        # Find bullish crosses (close moves above EMA20): the sign of
+        # close - EMA20 flips from negative on one bar to positive on the next
+        diff = close[morning] - ema20[morning]
         bullish_cross = (
-            (morning['prev_close'] < morning['prev_ema20']) &  # Was below
-            (morning['close'] > morning['ema20'])              # Now above
+            (diff[:-1] < 0) &   # Was below
+            (diff[1:] > 0)      # Now above
         )
         
         if bullish_cross.any():
-            cross_bar = morning[bullish_cross].iloc[0]
-            cross_time = cross_bar['timestamp']
-            entry_price = cross_bar['close']
+            cross_pos = morning[np.argmax(bullish_cross) + 1]
+            cross_time = df.index[cross_pos]
+            entry_price = close[cross_pos]
             
             # What happened rest of day?
-            after_cross = df[df['timestamp'] > cross_time]
-            if not after_cross.empty:
-                eod_price = after_cross.iloc[-1]['close']
+            if cross_pos < len(df) - 1:
+                eod_price = close[-1]
                 pnl = (eod_price - entry_price) * 100
                 
                 cross_results.append({
@@ -182,20 +173,37 @@ def analyze_ema_crosses(fetcher, symbol, start_date, end_date):
                     'pnl': pnl
                 })
     
-    if cross_results:
-        results_df = pd.DataFrame(cross_results)
-        
+    return pd.DataFrame(
+        cross_results, columns=['date', 'cross_time', 'entry_price', 'eod_price', 'pnl']
+    )
+
+
+def analyze_ema_crosses(results_df):
+    """
+    Analyze EMA20 crossing patterns.
+
+    Args:
+        results_df: Per-session crosses (see compute_ema_crosses)
+    """
+    report = io.StringIO()
+    print("\n\n" + "="*80, file=report)
+    print("ANALYZING EMA20 CROSSING PATTERNS", file=report)
+    print("="*80, file=report)
+    
+    if not results_df.empty:
         winners = results_df[results_df['pnl'] > 0]
         losers = results_df[results_df['pnl'] <= 0]
         
-        print(f"\nBULLISH EMA20 CROSS STRATEGY (Buy cross, Hold to EOD):")
-        print(f"  Total trades:    {len(results_df)}")
-        print(f"  Winners:         {len(winners)} ({len(winners)/len(results_df)*100:.1f}%)")
-        print(f"  Losers:          {len(losers)}")
-        print(f"  Total P&L:       ${results_df['pnl'].sum():,.2f}")
-        print(f"  Avg P&L/trade:   ${results_df['pnl'].mean():.2f}")
-        print(f"  Avg win:         ${winners['pnl'].mean():.2f}" if len(winners) > 0 else "  Avg win:         N/A")
-        print(f"  Avg loss:        ${losers['pnl'].mean():.2f}" if len(losers) > 0 else "  Avg loss:        N/A")
+        print(f"\nBULLISH EMA20 CROSS STRATEGY (Buy cross, Hold to EOD):", file=report)
+        print(f"  Total trades:    {len(results_df)}", file=report)
+        print(f"  Winners:         {len(winners)} ({len(winners)/len(results_df)*100:.1f}%)", file=report)
+        print(f"  Losers:          {len(losers)}", file=report)
+        print(f"  Total P&L:       ${results_df['pnl'].sum():,.2f}", file=report)
+        print(f"  Avg P&L/trade:   ${results_df['pnl'].mean():.2f}", file=report)
+        print(f"  Avg win:         ${winners['pnl'].mean():.2f}" if len(winners) > 0 else "  Avg win:         N/A", file=report)
+        print(f"  Avg loss:        ${losers['pnl'].mean():.2f}" if len(losers) > 0 else "  Avg loss:        N/A", file=report)
+    
+    sys.stdout.write(report.getvalue())
 
 
 def main():
@@ -213,9 +221,24 @@ def main():
     
     print(f"\nAnalyzing {symbol} from {start_date} to {end_date}")
     
+    # Per-session results are cached per (symbol, start, end); the bars are
+    # only loaded (once, shared across analyses) when one of them is missing
+    moves_cache = Path("./data/cache") / f"moves_{symbol}_{start_date}_{end_date}.parquet"
+    crosses_cache = Path("./data/cache") / f"ema_crosses_{symbol}_{start_date}_{end_date}.parquet"
+    
+    if moves_cache.exists() and crosses_cache.exists():
+        moves_df = pd.read_parquet(moves_cache)
+        crosses_df = pd.read_parquet(crosses_cache)
+    else:
+        intraday = load_intraday_frame(cached_fetcher, symbol, start_date, end_date)
+        moves_df = compute_intraday_moves(intraday)
+        crosses_df = compute_ema_crosses(intraday)
+        moves_df.to_parquet(moves_cache, engine='pyarrow', compression='snappy')
+        crosses_df.to_parquet(crosses_cache, engine='pyarrow', compression='snappy')
+    
     # Analyze different patterns
-    moves_df = analyze_intraday_patterns(cached_fetcher, symbol, start_date, end_date)
-    analyze_ema_crosses(cached_fetcher, symbol, start_date, end_date)
+    analyze_intraday_patterns(moves_df)
+    analyze_ema_crosses(crosses_df)
     
     print("\n\n" + "="*80)
     print("KEY INSIGHTS")
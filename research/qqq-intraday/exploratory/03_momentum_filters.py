@@ -8,8 +8,10 @@ Goal: Find what separates the BIG winners from the BIG losers.
 What momentum indicators were present on winners vs losers?
 """
 
+import io
 import os
-from datetime import date, time
+import sys
+from datetime import date
 from dotenv import load_dotenv
 import pandas as pd
 import numpy as np
@@ -17,20 +19,43 @@ import numpy as np
 from trading_playbook.adapters.alpaca_fetcher import AlpacaDataFetcher
 from trading_playbook.adapters.cached_fetcher import CachedDataFetcher
 from trading_playbook.models.market_data import TimeFrame
-from trading_playbook.core.indicators import calculate_ema, calculate_sma
+from trading_playbook.core.indicators import calculate_ema, calculate_session_ema, calculate_sma
+
+
+# Session times as offsets from midnight of the trading day
+MARKET_OPEN = pd.Timedelta(hours=9, minutes=30)
+ENTRY_TIME = pd.Timedelta(hours=11)
+EXIT_TIME = pd.Timedelta(hours=15, minutes=55)
+
+
+def load_intraday_frame(fetcher, symbol, start_date, end_date):
+    """
+    Load 2-min bars for every trading day in the range into a single DataFrame.
+
+    Reads the cached fetcher's month shards in one call rather than one
+    fetch per day. The frame is indexed by bar timestamp and carries a
+    `session_date` column (midnight of the trading day) so callers can
+    group by session.
+    """
+    df = fetcher.fetch_intraday_bars_range(symbol, start_date, end_date, TimeFrame.MINUTE_2)
+    df = df[['open', 'high', 'low', 'close', 'volume']].copy()
+    df['session_date'] = df.index.normalize()
+    return df
 
 
 def analyze_momentum_conditions(fetcher, symbol, start_date, end_date):
     """
     Analyze momentum indicators on Wed/Tue to find what predicts winners.
+
+    The report is built in a buffer and written to stdout once at the end.
     """
-    print("\n" + "="*80)
-    print("MOMENTUM ANALYSIS: Wed/Tue 11 AM Trades")
-    print("="*80)
+    report = io.StringIO()
+    print("\n" + "="*80, file=report)
+    print("MOMENTUM ANALYSIS: Wed/Tue 11 AM Trades", file=report)
+    print("="*80, file=report)
 
     # Get daily data for longer-term trend
     daily_df = fetcher.fetch_daily_bars(symbol, start_date, end_date)
-    trading_days = [d.date() for d in daily_df.index]
 
     # Calculate daily EMAs
     daily_df['ema9'] = calculate_ema(daily_df['close'], period=9)
@@ -38,65 +63,49 @@ def analyze_momentum_conditions(fetcher, symbol, start_date, end_date):
     daily_df['ema50'] = calculate_ema(daily_df['close'], period=50)
     daily_df['sma200'] = calculate_sma(daily_df['close'], period=200)
 
-    trades = []
+    # Index by midnight so each session looks up its row by label
+    daily_df = daily_df.set_index(daily_df.index.normalize())
 
-    for trade_date in trading_days:
-        day_of_week = trade_date.strftime('%A')
+    # Only analyze Wed/Tue
+    intraday = load_intraday_frame(fetcher, symbol, start_date, end_date)
+    intraday = intraday[intraday.index.dayofweek.isin([1, 2])].copy()
 
-        # Only analyze Wed/Tue
-        if day_of_week not in ['Wednesday', 'Tuesday']:
-            continue
+    # Intraday EMAs for all sessions in one pass, restarting each morning.
+    # Missing EMA values (and the open's distance to them) are recorded as 0.
+    for period in (20, 50):
+        ema = calculate_session_ema(intraday['close'], intraday['session_date'], period=period)
+        intraday[f'ema{period}'] = ema.fillna(0)
+        intraday[f'open_vs_ema{period}'] = (intraday['open'] - ema).fillna(0)
 
-        # Get intraday bars
-        bars = fetcher.fetch_intraday_bars(symbol, trade_date, TimeFrame.MINUTE_2)
-        if not bars:
-            continue
+    trades = []
+
+    for session_date, df in intraday.groupby('session_date'):
+        trade_date = session_date.date()
+        day_of_week = trade_date.strftime('%A')
 
-        df = pd.DataFrame([
-            {
-                'timestamp': bar.timestamp,
-                'open': bar.open,
-                'high': bar.high,
-                'low': bar.low,
-                'close': bar.close,
-                'volume': bar.volume
-            }
-            for bar in bars
-        ])
-
-        # Calculate intraday EMAs
-        df['ema20'] = calculate_ema(df['close'], period=20)
-        df['ema50'] = calculate_ema(df['close'], period=50)
-        df['time'] = df['timestamp'].dt.time
+        # Bar timestamps are sorted, so entry/exit bars are binary searches
+        ts_ns = df.index.asi8
 
         # Get 11 AM entry
-        entry_bars = df[df['time'] >= time(11, 0)]
-        if entry_bars.empty:
+        entry_idx = np.searchsorted(ts_ns, (session_date + ENTRY_TIME).value, side='left')
+        if entry_idx == len(df):
             continue
 
-        entry_bar = entry_bars.iloc[0]
-        entry_time = entry_bar['timestamp']
+        entry_bar = df.iloc[entry_idx]
         entry_price = entry_bar['open']
 
-        # Get EOD exit
-        exit_target_time = time(15, 55)
-        after_entry = df[df['timestamp'] >= entry_time]
-        eod_bars = after_entry[after_entry['time'] >= exit_target_time]
-
-        if eod_bars.empty:
-            exit_bar = after_entry.iloc[-1]
-        else:
-            exit_bar = eod_bars.iloc[0]
+        # Get EOD exit (first bar at or after 3:55 PM, else the last bar)
+        exit_idx = np.searchsorted(ts_ns, (session_date + EXIT_TIME).value, side='left')
+        exit_bar = df.iloc[min(exit_idx, len(df) - 1)]
 
         exit_price = exit_bar['close']
         pnl = (exit_price - entry_price) * 100
 
         # Get daily trend indicators for this date
-        daily_row = daily_df[daily_df.index.date == trade_date]
-        if daily_row.empty:
+        if session_date not in daily_df.index:
             continue
 
-        daily_row = daily_row.iloc[0]
+        daily_row = daily_df.loc[session_date]
 
         # Momentum indicators at entry
         momentum_indicators = {
@@ -118,21 +127,22 @@ def analyze_momentum_conditions(fetcher, symbol, start_date, end_date):
             'above_sma200': 1 if entry_price > daily_row['sma200'] else 0,
 
             # Intraday momentum at 11 AM
-            'intraday_ema20': entry_bar['ema20'] if pd.notna(entry_bar['ema20']) else 0,
-            'intraday_ema50': entry_bar['ema50'] if pd.notna(entry_bar['ema50']) else 0,
-            'price_vs_intraday_ema20': entry_price - entry_bar['ema20'] if pd.notna(entry_bar['ema20']) else 0,
-            'price_vs_intraday_ema50': entry_price - entry_bar['ema50'] if pd.notna(entry_bar['ema50']) else 0,
+            'intraday_ema20': entry_bar['ema20'],
+            'intraday_ema50': entry_bar['ema50'],
+            'price_vs_intraday_ema20': entry_bar['open_vs_ema20'],
+            'price_vs_intraday_ema50': entry_bar['open_vs_ema50'],
 
-            # Morning behavior (9:30-11:00)
-            'morning_bars': df[(df['time'] >= time(9, 30)) & (df['time'] < time(11, 0))],
         }
 
-        # Calculate morning momentum
-        morning = momentum_indicators['morning_bars']
-        if not morning.empty:
+        # Morning behavior (9:30-11:00), reduced straight from numpy arrays
+        morning_mask = (
+            (ts_ns >= (session_date + MARKET_OPEN).value) &
+            (ts_ns < (session_date + ENTRY_TIME).value)
+        )
+        if morning_mask.any():
             open_price = df.iloc[0]['open']
-            morning_low = morning['low'].min()
-            morning_high = morning['high'].max()
+            morning_low = df['low'].to_numpy()[morning_mask].min()
+            morning_high = df['high'].to_numpy()[morning_mask].max()
             price_at_11am = entry_price
 
             momentum_indicators['morning_range'] = morning_high - morning_low
@@ -142,47 +152,51 @@ def analyze_momentum_conditions(fetcher, symbol, start_date, end_date):
             momentum_indicators['bounce_from_low_pct'] = (price_at_11am - morning_low) / morning_low * 100
             momentum_indicators['distance_from_high'] = morning_high - price_at_11am
 
-        # Remove the DataFrame from dict before storing
-        del momentum_indicators['morning_bars']
-
         trades.append(momentum_indicators)
 
     # Analyze
     trades_df = pd.DataFrame(trades)
 
-    print(f"\nAnalyzed {len(trades_df)} Wed/Tue 11 AM trades\n")
-
-    # Split winners vs losers
-    big_winners = trades_df[trades_df['pnl'] > 200].sort_values('pnl', ascending=False)
-    big_losers = trades_df[trades_df['pnl'] < -200].sort_values('pnl')
-    small_trades = trades_df[(trades_df['pnl'] >= -200) & (trades_df['pnl'] <= 200)]
+    print(f"\nAnalyzed {len(trades_df)} Wed/Tue 11 AM trades\n", file=report)
 
-    print("="*80)
-    print("BIG WINNERS (P&L > $200)")
-    print("="*80)
-    print(f"Count: {len(big_winners)}")
-    print(f"Avg P&L: ${big_winners['pnl'].mean():.2f}")
-    print(f"\nTop 5:")
-    for _, row in big_winners.head(5).iterrows():
-        print(f"  {row['date']} ({row['day_of_week'][:3]}): ${row['pnl']:+.2f}")
-
-    print("\n" + "="*80)
-    print("BIG LOSERS (P&L < -$200)")
-    print("="*80)
-    print(f"Count: {len(big_losers)}")
-    print(f"Avg P&L: ${big_losers['pnl'].mean():.2f}")
-    print(f"\nWorst 5:")
-    for _, row in big_losers.head(5).iterrows():
-        print(f"  {row['date']} ({row['day_of_week'][:3]}): ${row['pnl']:+.2f}")
+    # Tag each trade once, then get every bucket's count and averages in one groupby
+    pnl = trades_df['pnl']
+    bucket = pd.Series(
+        np.select([pnl > 200, pnl < -200], ['winner', 'loser'], default='small'),
+        index=trades_df.index
+    )
+    bucket_counts = bucket.value_counts()
+    bucket_means = trades_df.groupby(bucket).mean(numeric_only=True)
+
+    def bucket_avg(name, column):
+        return bucket_means[column].get(name, np.nan)
+
+    print("="*80, file=report)
+    print("BIG WINNERS (P&L > $200)", file=report)
+    print("="*80, file=report)
+    print(f"Count: {bucket_counts.get('winner', 0)}", file=report)
+    print(f"Avg P&L: ${bucket_avg('winner', 'pnl'):.2f}", file=report)
+    print(f"\nTop 5:", file=report)
+    for _, row in trades_df[bucket == 'winner'].nlargest(5, 'pnl').iterrows():
+        print(f"  {row['date']} ({row['day_of_week'][:3]}): ${row['pnl']:+.2f}", file=report)
+
+    print("\n" + "="*80, file=report)
+    print("BIG LOSERS (P&L < -$200)", file=report)
+    print("="*80, file=report)
+    print(f"Count: {bucket_counts.get('loser', 0)}", file=report)
+    print(f"Avg P&L: ${bucket_avg('loser', 'pnl'):.2f}", file=report)
+    print(f"\nWorst 5:", file=report)
+    for _, row in trades_df[bucket == 'loser'].nsmallest(5, 'pnl').iterrows():
+        print(f"  {row['date']} ({row['day_of_week'][:3]}): ${row['pnl']:+.2f}", file=report)
 
     # Compare momentum conditions
-    print("\n" + "="*80)
-    print("MOMENTUM CONDITIONS COMPARISON")
-    print("="*80)
+    print("\n" + "="*80, file=report)
+    print("MOMENTUM CONDITIONS COMPARISON", file=report)
+    print("="*80, file=report)
 
-    if len(big_winners) > 0 and len(big_losers) > 0:
-        print(f"\n{'Indicator':<30} {'Big Winners':>15} {'Big Losers':>15} {'Difference':>15}")
-        print("-"*80)
+    if 'winner' in bucket_counts and 'loser' in bucket_counts:
+        print(f"\n{'Indicator':<30} {'Big Winners':>15} {'Big Losers':>15} {'Difference':>15}", file=report)
+        print("-"*80, file=report)
 
         indicators = [
             'above_sma200',
@@ -196,58 +210,69 @@ def analyze_momentum_conditions(fetcher, symbol, start_date, end_date):
         ]
 
         for indicator in indicators:
-            if indicator in big_winners.columns:
-                winner_avg = big_winners[indicator].mean()
-                loser_avg = big_losers[indicator].mean()
+            if indicator in bucket_means.columns:
+                winner_avg = bucket_avg('winner', indicator)
+                loser_avg = bucket_avg('loser', indicator)
                 diff = winner_avg - loser_avg
 
                 if indicator.endswith('_pct'):
-                    print(f"{indicator:<30} {winner_avg:>14.2f}% {loser_avg:>14.2f}% {diff:>14.2f}%")
+                    print(f"{indicator:<30} {winner_avg:>14.2f}% {loser_avg:>14.2f}% {diff:>14.2f}%", file=report)
                 elif indicator.startswith('above') or indicator.endswith('above_ema20') or indicator.endswith('above_ema50'):
                     # Convert to percentage
                     winner_pct = winner_avg * 100
                     loser_pct = loser_avg * 100
                     diff_pct = diff * 100
-                    print(f"{indicator:<30} {winner_pct:>14.1f}% {loser_pct:>14.1f}% {diff_pct:>14.1f}%")
+                    print(f"{indicator:<30} {winner_pct:>14.1f}% {loser_pct:>14.1f}% {diff_pct:>14.1f}%", file=report)
                 else:
-                    print(f"{indicator:<30} ${winner_avg:>13.2f} ${loser_avg:>13.2f} ${diff:>13.2f}")
+                    print(f"{indicator:<30} ${winner_avg:>13.2f} ${loser_avg:>13.2f} ${diff:>13.2f}", file=report)
 
     # Find best filter
-    print("\n" + "="*80)
-    print("TESTING MOMENTUM FILTERS")
-    print("="*80)
+    print("\n" + "="*80, file=report)
+    print("TESTING MOMENTUM FILTERS", file=report)
+    print("="*80, file=report)
+
+    above_sma200 = trades_df['above_sma200'] == 1
+    ema9_above_ema20 = trades_df['ema9_above_ema20'] == 1
+    ema20_above_ema50 = trades_df['ema20_above_ema50'] == 1
+    morning_up = trades_df['morning_move_pct'] > 0.1
 
     filters = [
-        ('Above SMA200', lambda row: row['above_sma200'] == 1),
-        ('EMA9 > EMA20', lambda row: row['ema9_above_ema20'] == 1),
-        ('EMA20 > EMA50', lambda row: row['ema20_above_ema50'] == 1),
-        ('All EMAs aligned', lambda row: row['ema9_above_ema20'] == 1 and row['ema20_above_ema50'] == 1 and row['above_sma200'] == 1),
-        ('Morning up > 0.1%', lambda row: row['morning_move_pct'] > 0.1),
-        ('Morning up > 0.2%', lambda row: row['morning_move_pct'] > 0.2),
-        ('Bounce > 0.3%', lambda row: row['bounce_from_low_pct'] > 0.3),
-        ('Above SMA200 + Morning up', lambda row: row['above_sma200'] == 1 and row['morning_move_pct'] > 0.1),
+        ('Above SMA200', above_sma200),
+        ('EMA9 > EMA20', ema9_above_ema20),
+        ('EMA20 > EMA50', ema20_above_ema50),
+        ('All EMAs aligned', ema9_above_ema20 & ema20_above_ema50 & above_sma200),
+        ('Morning up > 0.1%', morning_up),
+        ('Morning up > 0.2%', trades_df['morning_move_pct'] > 0.2),
+        ('Bounce > 0.3%', trades_df['bounce_from_low_pct'] > 0.3),
+        ('Above SMA200 + Morning up', above_sma200 & morning_up),
     ]
 
-    print(f"\n{'Filter':<30} {'Trades':>8} {'Win Rate':>10} {'Avg P&L':>12} {'Total P&L':>12}")
-    print("-"*80)
-
-    for filter_name, filter_func in filters:
-        filtered = trades_df[trades_df.apply(filter_func, axis=1)]
+    # Score every filter in one pass: rows are trades, columns are filters
+    masks = pd.DataFrame(dict(filters))
+    pnl = trades_df['pnl']
+    filter_stats = pd.DataFrame({
+        'trades': masks.sum(),
+        'wins': masks[pnl > 0].sum(),
+        'total_pnl': masks.mul(pnl, axis=0).sum(),
+    })
+    filter_stats = filter_stats[filter_stats['trades'] > 0]
+    filter_stats['win_rate'] = filter_stats['wins'] / filter_stats['trades'] * 100
+    filter_stats['avg_pnl'] = filter_stats['total_pnl'] / filter_stats['trades']
 
-        if len(filtered) > 0:
-            win_rate = (filtered['pnl'] > 0).sum() / len(filtered) * 100
-            avg_pnl = filtered['pnl'].mean()
-            total_pnl = filtered['pnl'].sum()
+    print(f"\n{'Filter':<30} {'Trades':>8} {'Win Rate':>10} {'Avg P&L':>12} {'Total P&L':>12}", file=report)
+    print("-"*80, file=report)
 
-            print(f"{filter_name:<30} {len(filtered):>8} {win_rate:>9.1f}% ${avg_pnl:>10.2f} ${total_pnl:>10.2f}")
+    for filter_name, row in filter_stats.iterrows():
+        print(f"{filter_name:<30} {int(row['trades']):>8} {row['win_rate']:>9.1f}% ${row['avg_pnl']:>10.2f} ${row['total_pnl']:>10.2f}", file=report)
 
     # Baseline (no filter)
     win_rate_all = (trades_df['pnl'] > 0).sum() / len(trades_df) * 100
     avg_pnl_all = trades_df['pnl'].mean()
     total_pnl_all = trades_df['pnl'].sum()
-    print("-"*80)
-    print(f"{'NO FILTER (baseline)':<30} {len(trades_df):>8} {win_rate_all:>9.1f}% ${avg_pnl_all:>10.2f} ${total_pnl_all:>10.2f}")
+    print("-"*80, file=report)
+    print(f"{'NO FILTER (baseline)':<30} {len(trades_df):>8} {win_rate_all:>9.1f}% ${avg_pnl_all:>10.2f} ${total_pnl_all:>10.2f}", file=report)
 
+    sys.stdout.write(report.getvalue())
     return trades_df
 
 
@@ -7,11 +7,14 @@ Uses parquet format for efficient storage and fast loading.
 This minimizes API calls and costs - once data is fetched, it's cached locally.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 from typing import List
+import numpy as np
 import pandas as pd
 
+from trading_playbook.adapters.calendar_cache import TradingCalendarCache
 from trading_playbook.core.data_fetcher import DataFetcher, DataFetchError
 from trading_playbook.models.market_data import Bar, TimeFrame
 
@@ -28,6 +31,7 @@ class CachedDataFetcher(DataFetcher):
             intraday/
                 QQQ_2024-11-01_2Min.parquet
                 QQQ_2024-11-02_2Min.parquet
+                QQQ_2024-10_2Min.parquet        (month shard, see fetch_intraday_bars_range)
             daily/
                 QQQ_2024-01-01_2024-03-31.parquet
 
@@ -133,25 +137,126 @@ class CachedDataFetcher(DataFetcher):
 
         return df
 
-    def _bars_to_dataframe(self, bars: List[Bar]) -> pd.DataFrame:
-        """Convert list of Bar objects to DataFrame for caching."""
-        data = []
-        for bar in bars:
-            data.append({
-                'timestamp': bar.timestamp,
-                'open': bar.open,
-                'high': bar.high,
-                'low': bar.low,
-                'close': bar.close,
-                'volume': bar.volume,
-                'vwap': bar.vwap,
-                'trade_count': bar.trade_count
-            })
-
-        df = pd.DataFrame(data)
-        df.set_index('timestamp', inplace=True)
+    def fetch_intraday_bars_range(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        timeframe: TimeFrame
+    ) -> pd.DataFrame:
+        """
+        Fetch intraday bars for every trading day in a date range.
+
+        Returns one DataFrame (indexed by timestamp) instead of a list of
+        Bar objects per day, so analyses can load a whole range with a
+        handful of file reads and split it by day with a groupby.
+
+        Bars are cached as one parquet shard per calendar month. A missing
+        shard is built from the per-day cache/source for that month's
+        trading days; shards are only written once the month is over.
+
+        Example:
+            >>> df = cached_fetcher.fetch_intraday_bars_range(
+            ...     "QQQ", date(2024, 9, 1), date(2024, 11, 1), TimeFrame.MINUTE_2
+            ... )
+            >>> for session, day_df in df.groupby(df.index.normalize()):
+            ...     ...
+        """
+        month_starts = pd.date_range(start_date.replace(day=1), end_date, freq='MS')
+        shards = [
+            self._load_month_shard(symbol, month_start.date(), start_date, end_date, timeframe)
+            for month_start in month_starts
+        ]
+
+        df = pd.concat(shards) if shards else self._bars_to_dataframe([])
+
+        # Trim the first and last month to the requested days
+        start = pd.Timestamp(start_date)
+        end = pd.Timestamp(end_date) + pd.Timedelta(days=1)
+        return df[(df.index >= start) & (df.index < end)]
+
+    def _load_month_shard(
+        self,
+        symbol: str,
+        month_start: date,
+        start_date: date,
+        end_date: date,
+        timeframe: TimeFrame
+    ) -> pd.DataFrame:
+        """
+        Load one month of intraday bars from its shard, building it on a miss.
+
+        A month that is not over yet is never written as a shard, so only its
+        days inside [start_date, end_date] are fetched.
+        """
+        # Example: QQQ_2024-11_2Min.parquet
+        cache_file = (
+            self.intraday_cache_dir /
+            f"{symbol}_{month_start.strftime('%Y-%m')}_{timeframe.value}.parquet"
+        )
+
+        # Try to load from cache
+        if cache_file.exists():
+            try:
+                return pd.read_parquet(cache_file)
+            except Exception:
+                # Cache corrupted, delete and rebuild
+                cache_file.unlink()
+
+        month_end = (pd.Timestamp(month_start) + pd.offsets.MonthEnd(0)).date()
+        is_complete = month_end < date.today()
+
+        first_day, last_day = month_start, month_end
+        if not is_complete:
+            first_day, last_day = max(month_start, start_date), min(month_end, end_date)
+
+        trading_days = TradingCalendarCache(self, cache_dir=str(self.cache_dir)).get_trading_days(
+            symbol, first_day, last_day
+        )
+
+        # Days are independent I/O (cache reads or API calls), fetch them concurrently
+        def fetch_day(trade_date):
+            return self.fetch_intraday_bars(symbol, trade_date, timeframe)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            all_bars = [bar for bars in executor.map(fetch_day, trading_days) for bar in bars]
+
+        df = self._bars_to_dataframe(all_bars)
+
+        # Only cache complete months - the current month is still growing
+        if is_complete:
+            try:
+                df.to_parquet(cache_file)
+            except Exception:
+                # Failed to cache, but we still have the data
+                pass
+
         return df
 
+    def _bars_to_dataframe(self, bars: List[Bar]) -> pd.DataFrame:
+        """
+        Convert list of Bar objects to DataFrame for caching.
+
+        Each column is filled into a pre-sized numpy array, avoiding a dict
+        per bar and pandas' row-wise type inference.
+        """
+        n = len(bars)
+        data = {
+            'open': np.fromiter((b.open for b in bars), dtype=np.float64, count=n),
+            'high': np.fromiter((b.high for b in bars), dtype=np.float64, count=n),
+            'low': np.fromiter((b.low for b in bars), dtype=np.float64, count=n),
+            'close': np.fromiter((b.close for b in bars), dtype=np.float64, count=n),
+            'volume': np.fromiter((b.volume for b in bars), dtype=np.int64, count=n),
+            'vwap': [b.vwap for b in bars],
+            'trade_count': [b.trade_count for b in bars],
+        }
+        index = pd.DatetimeIndex(
+            np.fromiter((b.timestamp for b in bars), dtype='datetime64[ns]', count=n),
+            name='timestamp'
+        )
+
+        return pd.DataFrame(data, index=index, copy=False)
+
     def _dataframe_to_bars(self, df: pd.DataFrame) -> List[Bar]:
         """Convert cached DataFrame back to list of Bar objects."""
         bars = []
@@ -0,0 +1,116 @@
+"""
+Trading calendar cache.
+
+Research scripts only need the list of trading days in a range, but used to
+fetch a full daily-bar DataFrame to derive it on every run. This keeps a
+small per-symbol calendar on disk and only asks the DataFetcher about the
+days it has never seen.
+"""
+
+from datetime import date
+from pathlib import Path
+from typing import List
+import pandas as pd
+
+from trading_playbook.core.data_fetcher import DataFetcher
+
+
+class TradingCalendarCache:
+    """
+    File-backed cache of which calendar days were trading days.
+
+    The calendar is stored per symbol as one row per calendar day with an
+    `is_trading_day` flag, so weekends and holidays are remembered too and
+    never trigger a re-fetch. When a request covers days not in the file,
+    daily bars are fetched for just that gap and merged in.
+
+    Days from today onwards are never persisted - their bars may not exist yet.
+
+    Cache structure:
+        cache_dir/
+            calendar_QQQ.parquet
+
+    Args:
+        fetcher: DataFetcher used to fill gaps (usually a CachedDataFetcher)
+        cache_dir: Directory to store calendar files (default: ./data/cache)
+
+    Example:
+        >>> calendar = TradingCalendarCache(cached_fetcher, cache_dir="./data/cache")
+        >>> days = calendar.get_trading_days("QQQ", date(2024, 9, 1), date(2024, 11, 1))
+        >>> days[0]
+        datetime.date(2024, 9, 3)
+    """
+
+    def __init__(self, fetcher: DataFetcher, cache_dir: str = "./data/cache"):
+        """Initialize the calendar cache."""
+        self.fetcher = fetcher
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get_trading_days(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date
+    ) -> List[date]:
+        """
+        Return the trading days between start_date and end_date (inclusive).
+
+        Only the days missing from the cached calendar are fetched.
+        """
+        calendar = self._load(symbol)
+
+        requested = pd.date_range(start_date, end_date, freq='D')
+        missing = requested.difference(calendar.index)
+
+        if len(missing) > 0:
+            calendar = self._fill_gap(symbol, calendar, missing.min(), missing.max())
+
+        window = calendar.loc[requested.min():requested.max(), 'is_trading_day']
+        return [ts.date() for ts in window.index[window.to_numpy()]]
+
+    def _fill_gap(
+        self,
+        symbol: str,
+        calendar: pd.DataFrame,
+        gap_start: pd.Timestamp,
+        gap_end: pd.Timestamp
+    ) -> pd.DataFrame:
+        """Fetch daily bars for one gap, merge it into the calendar and save."""
+        daily_df = self.fetcher.fetch_daily_bars(symbol, gap_start.date(), gap_end.date())
+        sessions = pd.DatetimeIndex(daily_df.index).normalize()
+
+        gap_days = pd.date_range(gap_start, gap_end, freq='D', name='date')
+        gap = pd.DataFrame({'is_trading_day': gap_days.isin(sessions)}, index=gap_days)
+
+        calendar = pd.concat([calendar[~calendar.index.isin(gap_days)], gap]).sort_index()
+
+        # Persist only settled days; today and later get re-checked next time
+        settled = calendar[calendar.index < pd.Timestamp(date.today())]
+        try:
+            settled.to_parquet(self._cache_file(symbol))
+        except Exception:
+            # Failed to cache, but we still have the calendar
+            pass
+
+        return calendar
+
+    def _load(self, symbol: str) -> pd.DataFrame:
+        """Load the cached calendar for a symbol, or an empty one."""
+        cache_file = self._cache_file(symbol)
+
+        if cache_file.exists():
+            try:
+                return pd.read_parquet(cache_file)
+            except Exception:
+                # Cache corrupted, delete and rebuild
+                cache_file.unlink()
+
+        return pd.DataFrame(
+            {'is_trading_day': pd.Series(dtype=bool)},
+            index=pd.DatetimeIndex([], name='date')
+        )
+
+    def _cache_file(self, symbol: str) -> Path:
+        """Calendar file for a symbol, e.g. calendar_QQQ.parquet."""
+        return self.cache_dir / f"calendar_{symbol}.parquet"
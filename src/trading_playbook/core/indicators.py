@@ -51,6 +51,46 @@ def calculate_ema(prices: pd.Series, period: int) -> pd.Series:
     return ema
 
 
+def calculate_session_ema(prices: pd.Series, sessions, period: int) -> pd.Series:
+    """
+    Calculate an EMA that restarts at the start of every session.
+
+    Gives the same values as calling calculate_ema() on each session's
+    prices separately (e.g. one trading day of intraday bars), but runs
+    as a single grouped ewm() pass over all sessions instead of one
+    pandas call per session.
+
+    Args:
+        prices: Series of prices spanning one or more sessions
+        sessions: Session label for each price, same length as prices
+                  (e.g. the trading date of each intraday bar)
+        period: Number of periods for EMA calculation (e.g., 20 for EMA20)
+
+    Returns:
+        Series of EMA values with the same index as input prices
+
+    Example:
+        >>> prices = pd.Series([10, 11, 12, 20, 21, 22])
+        >>> days = pd.Series(['mon', 'mon', 'mon', 'tue', 'tue', 'tue'])
+        >>> ema = calculate_session_ema(prices, days, period=3)
+        >>> # ema[3] == 20 - Tuesday's EMA is seeded from Tuesday's first price
+    """
+    if prices.empty:
+        return pd.Series(dtype=float)
+
+    if period <= 0:
+        raise ValueError(f"Period must be positive, got {period}")
+
+    # Group on position so duplicate or non-sorted price indexes are safe
+    positional = pd.Series(prices.to_numpy(), dtype=float)
+    keys = np.asarray(sessions)
+
+    ema = positional.groupby(keys, sort=False).ewm(span=period, adjust=False).mean()
+    ema = ema.droplevel(0).sort_index()
+
+    return pd.Series(ema.to_numpy(), index=prices.index)
+
+
 def calculate_sma(prices: pd.Series, period: int) -> pd.Series:
     """
     Calculate Simple Moving Average (SMA).
@@ -0,0 +1,74 @@
+"""
+Rolling-window helpers on numpy arrays.
+
+pandas' rolling().apply() calls a Python function once per window. These
+helpers build a single strided view of all windows with
+sliding_window_view (no data is copied) and reduce it along the last axis
+in one vectorized numpy call. Use them for any new rolling statistic
+(e.g. a daily ATR or range feature) instead of rolling().apply().
+
+Author: Tanam Bam Sinha
+"""
+
+from typing import Callable
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def rolling_reduce(
+    values: np.ndarray,
+    window: int,
+    reducer: Callable[..., np.ndarray]
+) -> np.ndarray:
+    """
+    Apply a numpy reduction over every trailing window.
+
+    Args:
+        values: 1-D array of values (e.g. closing prices or true ranges)
+        window: Number of values in each window
+        reducer: numpy reduction that accepts axis=-1 (np.mean, np.sum, np.max, ...)
+
+    Returns:
+        Float array, same length as values. Entry i holds the reduction of
+        values[i-window+1 : i+1]; the first (window-1) entries are NaN.
+
+    Example:
+        >>> rolling_reduce(np.array([1.0, 5.0, 3.0, 2.0]), window=2, reducer=np.max)
+        array([nan,  5.,  5.,  3.])
+
+    Raises:
+        ValueError: If window is not positive
+    """
+    if window <= 0:
+        raise ValueError(f"Window must be positive, got {window}")
+
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape[0], np.nan)
+
+    if values.shape[0] < window:
+        return out
+
+    out[window - 1:] = reducer(sliding_window_view(values, window), axis=-1)
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling mean over trailing windows (same values as pandas rolling().mean()).
+
+    Example:
+        >>> rolling_mean(np.array([10.0, 20.0, 30.0, 40.0]), window=3)
+        array([nan, nan, 20., 30.])
+    """
+    return rolling_reduce(values, window, np.mean)
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling sum over trailing windows (same values as pandas rolling().sum()).
+
+    Example:
+        >>> rolling_sum(np.array([1.0, 2.0, 3.0]), window=2)
+        array([nan,  3.,  5.])
+    """
+    return rolling_reduce(values, window, np.sum)
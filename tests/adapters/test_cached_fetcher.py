@@ -5,7 +5,7 @@ These tests verify the caching behavior without hitting real APIs.
 We use a mock fetcher to simulate API responses.
 """
 
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
 import tempfile
 import pytest
@@ -97,6 +97,36 @@ class MockDataFetcher(DataFetcher):
         return df
 
 
+class MockCalendarFetcher(DataFetcher):
+    """
+    Mock DataFetcher whose data follows the requested dates.
+
+    Every weekday is a trading day with two 2-min bars at its open, so
+    range fetches spanning several days/months can be checked.
+    """
+
+    def __init__(self):
+        self.intraday_call_count = 0
+        self.daily_call_count = 0
+
+    def fetch_intraday_bars(self, symbol: str, date: date, timeframe: TimeFrame):
+        """Return two bars on the requested day."""
+        self.intraday_call_count += 1
+        open_time = datetime(date.year, date.month, date.day, 9, 30)
+        return [
+            Bar(timestamp=open_time, open=450.0, high=451.0, low=449.5,
+                close=450.5, volume=1000000),
+            Bar(timestamp=open_time + timedelta(minutes=2), open=450.5, high=451.5,
+                low=450.0, close=451.0, volume=1100000),
+        ]
+
+    def fetch_daily_bars(self, symbol: str, start_date: date, end_date: date):
+        """Return one bar per weekday in the range."""
+        self.daily_call_count += 1
+        days = pd.bdate_range(start_date, end_date, name='timestamp')
+        return pd.DataFrame({'close': [450.0] * len(days)}, index=days)
+
+
 class TestCachedDataFetcher:
     """Test cases for CachedDataFetcher."""
 
@@ -255,4 +285,91 @@ class TestCachedDataFetcher:
         assert len(list((cache_dir / "daily").iterdir())) == 0
 
 
+class TestCachedDataFetcherRange:
+    """Test cases for CachedDataFetcher.fetch_intraday_bars_range."""
+
+    @pytest.fixture
+    def temp_cache_dir(self):
+        """Create a temporary directory for cache testing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield tmpdir
+
+    @pytest.fixture
+    def mock_fetcher(self):
+        """Create a mock fetcher."""
+        return MockCalendarFetcher()
+
+    @pytest.fixture
+    def cached_fetcher(self, mock_fetcher, temp_cache_dir):
+        """Create a cached fetcher with mock underlying fetcher."""
+        return CachedDataFetcher(mock_fetcher, cache_dir=temp_cache_dir)
+
+    def test_range_returns_requested_trading_days(self, cached_fetcher):
+        """Test that the range spans months and is trimmed to the requested days."""
+        # Act: Thu Oct 31 - Tue Nov 5, 2024
+        df = cached_fetcher.fetch_intraday_bars_range(
+            "QQQ", date(2024, 10, 31), date(2024, 11, 5), TimeFrame.MINUTE_2
+        )
+
+        # Assert: 4 trading days x 2 bars, sorted by timestamp
+        sessions = sorted(set(df.index.date))
+        assert sessions == [
+            date(2024, 10, 31), date(2024, 11, 1), date(2024, 11, 4), date(2024, 11, 5)
+        ]
+        assert len(df) == 8
+        assert df.index.is_monotonic_increasing
+        assert list(df.columns[:5]) == ['open', 'high', 'low', 'close', 'volume']
+
+    def test_range_second_call_uses_month_shards(self, cached_fetcher, mock_fetcher):
+        """Test that a repeated range is served from the month shards."""
+        # Arrange
+        cached_fetcher.fetch_intraday_bars_range(
+            "QQQ", date(2024, 11, 1), date(2024, 11, 8), TimeFrame.MINUTE_2
+        )
+        calls_after_first = mock_fetcher.intraday_call_count
+
+        # Act: Different range inside the same month
+        df = cached_fetcher.fetch_intraday_bars_range(
+            "QQQ", date(2024, 11, 12), date(2024, 11, 14), TimeFrame.MINUTE_2
+        )
+
+        # Assert
+        assert len(df) == 6
+        assert mock_fetcher.intraday_call_count == calls_after_first
+
+    def test_range_month_shard_file_created(self, cached_fetcher, temp_cache_dir):
+        """Test that completed months are written as one shard file."""
+        # Act
+        cached_fetcher.fetch_intraday_bars_range(
+            "QQQ", date(2024, 11, 1), date(2024, 11, 5), TimeFrame.MINUTE_2
+        )
+
+        # Assert
+        cache_file = Path(temp_cache_dir) / "intraday" / "QQQ_2024-11_2Min.parquet"
+        assert cache_file.exists()
+
+    def test_range_in_unfinished_month_fetches_only_requested_days(
+        self, cached_fetcher, mock_fetcher, temp_cache_dir
+    ):
+        """Test that a month without a shard is not fetched beyond the range."""
+        # Act: Mon Jan 5 - Tue Jan 6, 2099 (month not over, so no shard)
+        df = cached_fetcher.fetch_intraday_bars_range(
+            "QQQ", date(2099, 1, 5), date(2099, 1, 6), TimeFrame.MINUTE_2
+        )
+
+        # Assert
+        assert len(df) == 4
+        assert mock_fetcher.intraday_call_count == 2
+        cache_file = Path(temp_cache_dir) / "intraday" / "QQQ_2099-01_2Min.parquet"
+        assert not cache_file.exists()
+
+    def test_range_with_no_trading_days(self, cached_fetcher):
+        """Test that a weekend-only range returns an empty frame."""
+        df = cached_fetcher.fetch_intraday_bars_range(
+            "QQQ", date(2024, 11, 2), date(2024, 11, 3), TimeFrame.MINUTE_2
+        )
+
+        assert df.empty
+        assert 'close' in df.columns
+
 # Run tests with: poetry run pytest tests/adapters/test_cached_fetcher.py -v
@@ -0,0 +1,129 @@
+"""
+Unit tests for TradingCalendarCache.
+
+These tests verify which days are reported as trading days and that the
+underlying fetcher is only asked about days missing from the cache.
+"""
+
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import tempfile
+import pytest
+import pandas as pd
+
+from trading_playbook.core.data_fetcher import DataFetcher
+from trading_playbook.adapters.calendar_cache import TradingCalendarCache
+
+
+class MockDailyFetcher(DataFetcher):
+    """
+    Mock DataFetcher that returns a daily bar for every weekday.
+
+    Records the (start, end) of each daily request so tests can check
+    that only gaps are fetched.
+    """
+
+    def __init__(self):
+        self.daily_requests = []
+
+    def fetch_intraday_bars(self, symbol, date, timeframe):
+        """Not used by the calendar cache."""
+        return []
+
+    def fetch_daily_bars(self, symbol, start_date, end_date):
+        """Return one bar per weekday in the range."""
+        self.daily_requests.append((start_date, end_date))
+
+        timestamps = []
+        day = start_date
+        while day <= end_date:
+            if day.weekday() < 5:
+                timestamps.append(datetime.combine(day, datetime.min.time()))
+            day += timedelta(days=1)
+
+        return pd.DataFrame(
+            {'close': [450.0] * len(timestamps)},
+            index=pd.DatetimeIndex(timestamps, name='timestamp')
+        )
+
+
+class TestTradingCalendarCache:
+    """Test cases for TradingCalendarCache."""
+
+    @pytest.fixture
+    def temp_cache_dir(self):
+        """Create a temporary directory for cache testing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield tmpdir
+
+    @pytest.fixture
+    def mock_fetcher(self):
+        """Create a mock fetcher."""
+        return MockDailyFetcher()
+
+    @pytest.fixture
+    def calendar(self, mock_fetcher, temp_cache_dir):
+        """Create a calendar cache with mock underlying fetcher."""
+        return TradingCalendarCache(mock_fetcher, cache_dir=temp_cache_dir)
+
+    def test_returns_trading_days_only(self, calendar):
+        """Test that weekends are excluded."""
+        # Act: Fri Nov 1 - Tue Nov 5, 2024
+        days = calendar.get_trading_days("QQQ", date(2024, 11, 1), date(2024, 11, 5))
+
+        # Assert
+        assert days == [date(2024, 11, 1), date(2024, 11, 4), date(2024, 11, 5)]
+
+    def test_second_call_uses_cache(self, calendar, mock_fetcher):
+        """Test that a covered range doesn't hit the fetcher again."""
+        # Arrange
+        calendar.get_trading_days("QQQ", date(2024, 11, 1), date(2024, 11, 8))
+
+        # Act: Sub-range, including a weekend
+        days = calendar.get_trading_days("QQQ", date(2024, 11, 2), date(2024, 11, 4))
+
+        # Assert
+        assert days == [date(2024, 11, 4)]
+        assert len(mock_fetcher.daily_requests) == 1
+
+    def test_extended_range_fetches_only_gap(self, calendar, mock_fetcher):
+        """Test that extending the range only fetches the new days."""
+        # Arrange
+        calendar.get_trading_days("QQQ", date(2024, 11, 1), date(2024, 11, 5))
+
+        # Act
+        days = calendar.get_trading_days("QQQ", date(2024, 11, 1), date(2024, 11, 8))
+
+        # Assert
+        assert mock_fetcher.daily_requests[-1] == (date(2024, 11, 6), date(2024, 11, 8))
+        assert days[-1] == date(2024, 11, 8)
+        assert len(days) == 6
+
+    def test_cache_persists_across_instances(self, mock_fetcher, temp_cache_dir):
+        """Test that the calendar file is reused by a new instance."""
+        # Arrange
+        TradingCalendarCache(mock_fetcher, cache_dir=temp_cache_dir).get_trading_days(
+            "QQQ", date(2024, 11, 1), date(2024, 11, 5)
+        )
+
+        # Act
+        days = TradingCalendarCache(mock_fetcher, cache_dir=temp_cache_dir).get_trading_days(
+            "QQQ", date(2024, 11, 1), date(2024, 11, 5)
+        )
+
+        # Assert
+        assert len(days) == 3
+        assert len(mock_fetcher.daily_requests) == 1
+        assert (Path(temp_cache_dir) / "calendar_QQQ.parquet").exists()
+
+    def test_different_symbols_use_separate_calendars(self, calendar, mock_fetcher):
+        """Test that each symbol has its own calendar."""
+        # Act
+        calendar.get_trading_days("QQQ", date(2024, 11, 1), date(2024, 11, 5))
+        calendar.get_trading_days("SPY", date(2024, 11, 1), date(2024, 11, 5))
+
+        # Assert
+        assert len(mock_fetcher.daily_requests) == 2
+
+
+# Run tests with: poetry run pytest tests/adapters/test_calendar_cache.py -v
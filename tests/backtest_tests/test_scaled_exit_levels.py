@@ -0,0 +1,49 @@
+"""
+Unit tests for the scaled-exit backtester's scale-out levels.
+
+The exit kernel finds the levels a profit has reached by binary search,
+so the levels must be strictly ascending. Unsorted levels are rejected
+rather than scaled out in the wrong order.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_dir))
+
+from backtest.daily_momentum_scaled_exits import ScaledExitBacktester
+
+
+class TestScaledExitLevels:
+    """Test cases for scale-out level validation."""
+
+    def test_default_levels_are_accepted(self):
+        """Test that the default 8/15/25 levels pass the check."""
+        backtester = ScaledExitBacktester("key", "secret", use_cache=False)
+
+        backtester._check_settings()
+
+    @pytest.mark.parametrize("levels", [(10.0, 8.0, 25.0), (8.0, 25.0, 15.0), (8.0, 8.0, 25.0)])
+    def test_run_rejects_unsorted_levels(self, levels):
+        """Test that run() raises before backtesting unsorted or repeated levels."""
+        # Arrange
+        backtester = ScaledExitBacktester("key", "secret", use_cache=False)
+        backtester.scale_1_pct, backtester.scale_2_pct, backtester.scale_3_pct = levels
+
+        # Act / Assert
+        with pytest.raises(ValueError, match="strictly ascending"):
+            backtester.run(datetime(2024, 1, 2), datetime(2024, 1, 31))
+
+    def test_grid_rejects_unsorted_combination(self):
+        """Test that a sweep raises before starting workers if any combination is unsorted."""
+        grid = {'scale_1_pct': [6.0, 10.0], 'scale_2_pct': [8.0]}
+
+        with pytest.raises(ValueError, match="strictly ascending"):
+            ScaledExitBacktester.run_parameter_grid(
+                "key", "secret", grid, datetime(2024, 1, 2), datetime(2024, 1, 31)
+            )
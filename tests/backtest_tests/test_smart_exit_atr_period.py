@@ -0,0 +1,138 @@
+"""
+Unit tests for the smart-exit backtester's ATR window.
+
+The exit check's bar window and the bar prefetch must both reach far
+enough back to hold atr_period + 1 daily bars, or the trailing stop's
+ATR silently drops to 0.0 for longer periods. Bars are stamped at
+05:00 UTC like Alpaca's daily bars, so a day's own bar falls after its
+midnight backtest date.
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_dir))
+
+from backtest._calendar import epoch, trading_days
+from backtest.daily_momentum_smart_exits import SmartExitBacktester
+
+
+def make_bars(start: datetime, end: datetime):
+    """Daily bars for every NYSE trading day in the range, stamped 05:00 UTC."""
+    days = trading_days(start, end)
+    np.random.seed(42)
+    closes = 100.0 + np.cumsum(np.random.randn(len(days)))
+    highs = closes + np.random.rand(len(days)) * 2
+    lows = closes - np.random.rand(len(days)) * 2
+    times = np.array([epoch(day + timedelta(hours=5)) for day in days])
+    return times, highs, lows, closes
+
+
+class Bar:
+    """Minimal stand-in for an Alpaca daily bar."""
+
+    def __init__(self, timestamp, high, low, close):
+        self.timestamp = timestamp
+        self.high = high
+        self.low = low
+        self.close = close
+
+
+class BarClient:
+    """Stands in for the Alpaca data client, serving make_bars() for the requested range."""
+
+    def __init__(self):
+        self.requests = []
+
+    def get_stock_bars(self, request):
+        self.requests.append(request)
+        times, highs, lows, closes = make_bars(datetime(2023, 1, 1), datetime(2025, 1, 1))
+        start, end = epoch(request.start), epoch(request.end)
+        bars = [
+            Bar(datetime.fromtimestamp(t, timezone.utc).replace(tzinfo=None), h, lo, c)
+            for t, h, lo, c in zip(times, highs, lows, closes)
+            if start <= t <= end
+        ]
+        return type('Response', (), {'data': {symbol: bars for symbol in request.symbol_or_symbols}})()
+
+
+class TestSmartExitATRPeriod:
+    """Test cases for the ATR window of SmartExitBacktester."""
+
+    def test_default_period_keeps_ten_day_window(self):
+        """Test that the default ATR period keeps the 10-day window and 15-day prefetch."""
+        # Arrange
+        backtester = SmartExitBacktester("key", "secret")
+        backtester._store_bars("TEST", *make_bars(datetime(2024, 5, 1), datetime(2024, 7, 31)))
+        date = datetime(2024, 7, 1)
+
+        # Act
+        window = backtester._exit_window("TEST", date)
+
+        # Assert
+        assert backtester.atr_period == 10
+        assert window == backtester._bar_window("TEST", date, lookback=10)
+        assert backtester._history_start(date) == date - timedelta(days=15)
+
+    @pytest.mark.parametrize("atr_period", [12, 14, 20])
+    def test_atr_above_ten_is_computed_every_day(self, atr_period):
+        """Test that a longer ATR is found on every 2024 trading day, holidays included."""
+        # Arrange
+        backtester = SmartExitBacktester("key", "secret")
+        backtester.atr_period = atr_period
+        backtester._backtest_start = datetime(2024, 1, 2)
+        backtester._backtest_end = datetime(2024, 12, 31)
+        backtester.data_client = BarClient()
+        backtester._prefetch_bars(["TEST"])
+
+        # Act / Assert
+        for date in trading_days(datetime(2024, 1, 2), datetime(2024, 12, 31)):
+            lo, hi = backtester._exit_window("TEST", date)
+            assert hi - lo >= atr_period + 1, date
+            assert backtester._calculate_atr("TEST", lo, hi) > 0.0, date
+
+    def test_window_over_holiday_matches_true_range(self):
+        """Test the 14-bar ATR on a day whose window holds Juneteenth and July 4th."""
+        # Arrange
+        times, highs, lows, closes = make_bars(datetime(2024, 5, 1), datetime(2024, 7, 31))
+        backtester = SmartExitBacktester("key", "secret")
+        backtester.atr_period = 14
+        backtester._store_bars("TEST", times, highs, lows, closes)
+        date = datetime(2024, 7, 8)
+
+        # Act
+        lo, hi = backtester._exit_window("TEST", date)
+        atr = backtester._calculate_atr("TEST", lo, hi)
+
+        # Assert: the window ends on the last bar before the day's own 05:00 bar
+        true_range = np.maximum(
+            np.maximum(highs[1:] - lows[1:], np.abs(highs[1:] - closes[:-1])),
+            np.abs(lows[1:] - closes[:-1])
+        )
+        assert times[hi - 1] < epoch(date) < times[hi]
+        assert hi - lo >= 15
+        assert atr == pytest.approx(true_range[hi - 1 - 14:hi - 1].mean())
+
+    def test_prefetch_covers_atr_window(self):
+        """Test that the bar prefetch reaches back atr_period + 1 trading days."""
+        # Arrange
+        backtester = SmartExitBacktester("key", "secret")
+        backtester.atr_period = 14
+        client = BarClient()
+        backtester.data_client = client
+        backtester._backtest_start = datetime(2024, 7, 1)
+        backtester._backtest_end = datetime(2024, 9, 30)
+
+        # Act
+        backtester._prefetch_bars(["TEST"])
+
+        # Assert: Juneteenth falls inside the prefetched history
+        request_start = client.requests[0].start.replace(tzinfo=None)
+        prior_days = trading_days(request_start, datetime(2024, 6, 30))
+        assert len(prior_days) >= backtester.atr_period + 1
@@ -12,6 +12,7 @@ import numpy as np
 import pytest
 from trading_playbook.core.indicators import (
     calculate_ema,
+    calculate_session_ema,
     calculate_sma,
     calculate_atr,
     validate_price_data
@@ -115,6 +116,71 @@ class TestEMA:
             calculate_ema(prices, period=0)
 
 
+class TestSessionEMA:
+    """Test cases for per-session Exponential Moving Average."""
+
+    def test_session_ema_matches_per_session_ema(self):
+        """Test each session's EMA equals calculate_ema on that session alone."""
+        # Arrange: two sessions with different price levels
+        prices = pd.Series([22.0, 24, 23, 25, 24, 100, 102, 101, 103])
+        sessions = pd.Series(['mon'] * 5 + ['tue'] * 4)
+
+        # Act
+        ema = calculate_session_ema(prices, sessions, period=3)
+
+        # Assert: no carry-over from Monday into Tuesday
+        expected = pd.concat([
+            calculate_ema(prices.iloc[:5], period=3),
+            calculate_ema(prices.iloc[5:], period=3),
+        ])
+        pd.testing.assert_series_equal(ema, expected)
+        assert ema.iloc[5] == 100.0
+
+    def test_session_ema_matches_recursive_formula(self):
+        """Test each session is seeded with its first price, then y = a*x + (1-a)*y_prev."""
+        # Arrange
+        np.random.seed(7)
+        prices = pd.Series(450.0 + np.cumsum(np.random.randn(30)))
+        sessions = pd.Series([1] * 15 + [2] * 15)
+        alpha = 2.0 / (20 + 1)
+
+        # Act
+        ema = calculate_session_ema(prices, sessions, period=20)
+
+        # Assert: plain recursion, restarted per session
+        expected = []
+        for session_prices in (prices.iloc[:15], prices.iloc[15:]):
+            prev = session_prices.iloc[0]
+            for price in session_prices:
+                prev = alpha * price + (1 - alpha) * prev
+                expected.append(prev)
+
+        np.testing.assert_allclose(ema.to_numpy(), expected)
+
+    def test_session_ema_keeps_input_index(self):
+        """Test result is aligned with a timestamp index."""
+        index = pd.date_range('2024-11-01 09:30', periods=4, freq='2min')
+        prices = pd.Series([450.0, 451, 452, 453], index=index)
+
+        ema = calculate_session_ema(prices, index.normalize(), period=2)
+
+        assert ema.index.equals(index)
+        pd.testing.assert_series_equal(ema, calculate_ema(prices, period=2))
+
+    def test_session_ema_empty_input(self):
+        """Test session EMA handles empty Series."""
+        prices = pd.Series(dtype=float)
+        ema = calculate_session_ema(prices, [], period=10)
+        assert ema.empty
+
+    def test_session_ema_invalid_period(self):
+        """Test session EMA raises error for invalid period."""
+        prices = pd.Series([10, 20, 30])
+
+        with pytest.raises(ValueError):
+            calculate_session_ema(prices, [1, 1, 1], period=0)
+
+
 class TestATR:
     """Test cases for Average True Range."""
 
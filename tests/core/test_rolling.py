@@ -0,0 +1,73 @@
+"""
+Unit tests for rolling-window helpers.
+
+Results are checked against known values and against pandas rolling(),
+which these helpers replace.
+"""
+
+import pandas as pd
+import numpy as np
+import pytest
+from trading_playbook.core.rolling import rolling_reduce, rolling_mean, rolling_sum
+
+
+class TestRollingMean:
+    """Test cases for rolling_mean."""
+
+    def test_rolling_mean_basic_calculation(self):
+        """Test rolling mean with simple known values."""
+        values = np.array([10.0, 20.0, 30.0, 40.0, 50.0])
+
+        result = rolling_mean(values, window=3)
+
+        assert np.isnan(result[0])
+        assert np.isnan(result[1])
+        assert result[2] == 20.0
+        assert result[3] == 30.0
+        assert result[4] == 40.0
+
+    def test_rolling_mean_matches_pandas(self):
+        """Test rolling mean equals pandas rolling().mean()."""
+        np.random.seed(42)
+        values = 450.0 + np.cumsum(np.random.randn(100))
+
+        result = rolling_mean(values, window=10)
+        expected = pd.Series(values).rolling(window=10).mean().to_numpy()
+
+        np.testing.assert_allclose(result, expected)
+
+    def test_rolling_mean_window_longer_than_data(self):
+        """Test all values are NaN when window exceeds data length."""
+        result = rolling_mean(np.array([1.0, 2.0]), window=5)
+
+        assert len(result) == 2
+        assert np.isnan(result).all()
+
+    def test_rolling_mean_invalid_window(self):
+        """Test rolling mean raises error for invalid window."""
+        with pytest.raises(ValueError):
+            rolling_mean(np.array([1.0, 2.0]), window=0)
+
+
+class TestRollingReduce:
+    """Test cases for rolling_reduce and rolling_sum."""
+
+    def test_rolling_sum(self):
+        """Test rolling sum with integer input."""
+        result = rolling_sum(np.array([1, 2, 3, 4]), window=2)
+
+        np.testing.assert_array_equal(result[1:], [3.0, 5.0, 7.0])
+        assert result.dtype == np.float64
+
+    def test_rolling_max(self):
+        """Test a custom numpy reduction."""
+        result = rolling_reduce(np.array([1.0, 5.0, 3.0, 2.0]), window=2, reducer=np.max)
+
+        np.testing.assert_array_equal(result[1:], [5.0, 5.0, 3.0])
+
+    def test_empty_input(self):
+        """Test empty input gives empty output."""
+        assert rolling_mean(np.array([]), window=3).size == 0
+
+
+# Run tests with: poetry run pytest tests/core/test_rolling.py -v